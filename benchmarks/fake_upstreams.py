@@ -0,0 +1,170 @@
+"""Local stand-ins for the Groq and Tavily APIs used by the benchmark harness.
+
+Serves recorded fixture payloads with configurable latency, jitter and error
+rates so the service can be load tested without spending API credits:
+
+    python -m benchmarks.fake_upstreams --port 9100 --tavily-latency-ms 600 --groq-error-rate 0.02
+
+Point the app at it with TAVILY_BASE_URL=http://127.0.0.1:9100/tavily and
+GROQ_BASE_URL=http://127.0.0.1:9100/groq.
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import re
+import time
+from dataclasses import dataclass
+
+import uvicorn
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse, StreamingResponse
+
+FIXTURES_DIR = os.path.join(os.path.dirname(__file__), "fixtures")
+
+
+@dataclass
+class UpstreamProfile:
+    """Latency / error distribution for one fake upstream"""
+    latency_ms: float
+    jitter_ms: float
+    error_rate: float
+    rate_limit_rate: float = 0.0
+
+    def sample_latency(self) -> float:
+        # Gaussian jitter around the mean, clamped at zero
+        return max(0.0, random.gauss(self.latency_ms, self.jitter_ms)) / 1000
+
+    def sample_error(self):
+        """Return an error response to send, or None for success"""
+        roll = random.random()
+        if roll < self.rate_limit_rate:
+            return JSONResponse({"error": {"message": "Rate limit reached"}}, status_code=429)
+        if roll < self.rate_limit_rate + self.error_rate:
+            return JSONResponse({"error": {"message": "Upstream failure"}}, status_code=500)
+        return None
+
+
+def _load_fixture(name: str) -> str:
+    with open(os.path.join(FIXTURES_DIR, name), encoding="utf-8") as fixture:
+        return fixture.read()
+
+
+def _render(template: str, query: str) -> str:
+    slug = re.sub(r'[^a-z0-9]+', '_', query.lower()).strip('_') or "topic"
+    # Fixtures are JSON/markdown, so escape the query before substitution
+    safe_query = json.dumps(query)[1:-1]
+    return template.replace("{query}", safe_query).replace("{slug}", slug)
+
+
+def create_app(tavily: UpstreamProfile, groq: UpstreamProfile, token_delay_ms: float) -> FastAPI:
+    app = FastAPI(title="Fake upstreams")
+
+    tavily_template = _load_fixture("tavily_search.json")
+    analysis_template = _load_fixture("groq_analysis.json")
+    synthesis_template = _load_fixture("groq_synthesis.md")
+
+    @app.post("/tavily/search")
+    async def tavily_search(request: Request):
+        payload = await request.json()
+        await asyncio.sleep(tavily.sample_latency())
+
+        error = tavily.sample_error()
+        if error is not None:
+            return error
+
+        result = json.loads(_render(tavily_template, payload.get("query", "")))
+        result["results"] = result["results"][:payload.get("max_results", 3)]
+        return result
+
+    @app.post("/groq/openai/v1/chat/completions")
+    async def groq_completion(request: Request):
+        payload = await request.json()
+        await asyncio.sleep(groq.sample_latency())
+
+        error = groq.sample_error()
+        if error is not None:
+            return error
+
+        prompt = payload["messages"][-1]["content"]
+        match = re.search(r'Query(?:\*\*)?: "(.+?)"', prompt)
+        query = match.group(1) if match else "the topic"
+
+        is_analysis = "JSON" in payload["messages"][0]["content"]
+        text = _render(analysis_template if is_analysis else synthesis_template, query)
+
+        if not payload.get("stream"):
+            return _completion_body(payload["model"], text)
+
+        async def token_stream():
+            for token in re.findall(r'\S+\s*', text):
+                await asyncio.sleep(token_delay_ms / 1000)
+                yield f"data: {json.dumps(_chunk_body(payload['model'], token))}\n\n"
+            yield "data: [DONE]\n\n"
+
+        return StreamingResponse(token_stream(), media_type="text/event-stream")
+
+    return app
+
+
+def _completion_body(model: str, text: str) -> dict:
+    return {
+        "id": "chatcmpl-fake",
+        "object": "chat.completion",
+        "created": int(time.time()),
+        "model": model,
+        "choices": [{
+            "index": 0,
+            "message": {"role": "assistant", "content": text},
+            "finish_reason": "stop"
+        }],
+        "usage": {"prompt_tokens": 0, "completion_tokens": len(text.split()), "total_tokens": len(text.split())}
+    }
+
+
+def _chunk_body(model: str, token: str) -> dict:
+    return {
+        "id": "chatcmpl-fake",
+        "object": "chat.completion.chunk",
+        "created": int(time.time()),
+        "model": model,
+        "choices": [{"index": 0, "delta": {"content": token}, "finish_reason": None}]
+    }
+
+
+def add_profile_arguments(parser: argparse.ArgumentParser):
+    """Latency/error flags shared with the load test driver"""
+    parser.add_argument("--tavily-latency-ms", type=float, default=800)
+    parser.add_argument("--tavily-jitter-ms", type=float, default=250)
+    parser.add_argument("--tavily-error-rate", type=float, default=0.0)
+    parser.add_argument("--groq-latency-ms", type=float, default=400)
+    parser.add_argument("--groq-jitter-ms", type=float, default=150)
+    parser.add_argument("--groq-error-rate", type=float, default=0.0)
+    parser.add_argument("--groq-rate-limit-rate", type=float, default=0.0)
+    parser.add_argument("--groq-token-delay-ms", type=float, default=5)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=9100)
+    parser.add_argument("--seed", type=int, default=None)
+    add_profile_arguments(parser)
+    args = parser.parse_args()
+
+    if args.seed is not None:
+        random.seed(args.seed)
+
+    app = create_app(
+        tavily=UpstreamProfile(args.tavily_latency_ms, args.tavily_jitter_ms, args.tavily_error_rate),
+        groq=UpstreamProfile(args.groq_latency_ms, args.groq_jitter_ms, args.groq_error_rate,
+                             rate_limit_rate=args.groq_rate_limit_rate),
+        token_delay_ms=args.groq_token_delay_ms
+    )
+    uvicorn.run(app, host=args.host, port=args.port, log_level="warning")
+
+
+if __name__ == "__main__":
+    main()
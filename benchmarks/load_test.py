@@ -0,0 +1,255 @@
+"""Offline load benchmark for the search API.
+
+Starts the fake Groq/Tavily upstreams and the FastAPI app from main.py as
+subprocesses, drives concurrent /search (or /search/stream) traffic at it and
+reports client-side latency percentiles, throughput and the per-stage
+breakdown scraped from /metrics. Run from the repository root:
+
+    python -m benchmarks.load_test --requests 200 --concurrency 20
+    python -m benchmarks.load_test --endpoint /search/stream --tavily-latency-ms 1200 --json bench.json
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Dict, List, Optional
+
+import httpx
+from prometheus_client.parser import text_string_to_metric_families
+
+from benchmarks.fake_upstreams import add_profile_arguments
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+DEFAULT_QUERIES = [
+    "what is quantum computing",
+    "python vs java for backend development",
+    "how to train a neural network from scratch",
+    "history of the roman empire",
+    "benefits of intermittent fasting",
+    "how does the stock market work",
+    "difference between tcp and udp",
+    "causes of climate change",
+    "best practices for rest api design",
+    "who invented the telephone",
+    "explain the theory of relativity in simple terms",
+    "how do vaccines work",
+    "rust ownership model explained",
+    "impact of social media on teenagers",
+    "how to make sourdough bread",
+]
+
+
+def percentile(values: List[float], pct: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def _start_process(args: List[str], env: Dict[str, str]) -> subprocess.Popen:
+    return subprocess.Popen(
+        [sys.executable, *args],
+        cwd=ROOT_DIR,
+        env=env,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL
+    )
+
+
+async def _wait_until_ready(url: str, timeout: float = 30.0):
+    deadline = time.monotonic() + timeout
+    async with httpx.AsyncClient() as client:
+        while time.monotonic() < deadline:
+            try:
+                response = await client.get(url)
+                if response.status_code < 500:
+                    return
+            except httpx.HTTPError:
+                pass
+            await asyncio.sleep(0.2)
+    raise RuntimeError(f"Timed out waiting for {url}")
+
+
+async def _scrape_stages(client: httpx.AsyncClient, base_url: str) -> Dict[str, Dict[str, float]]:
+    """Return {series: {"sum": s, "count": c}} for the app's latency histograms"""
+
+    response = await client.get(f"{base_url}/metrics")
+    stages: Dict[str, Dict[str, float]] = {}
+
+    for family in text_string_to_metric_families(response.text):
+        if family.type != "histogram":
+            continue
+        for sample in family.samples:
+            if not sample.name.endswith(("_sum", "_count")):
+                continue
+            labels = ",".join(f"{k}={v}" for k, v in sorted(sample.labels.items()))
+            series = f"{family.name}{{{labels}}}" if labels else family.name
+            field = "sum" if sample.name.endswith("_sum") else "count"
+            stages.setdefault(series, {"sum": 0.0, "count": 0.0})[field] = sample.value
+
+    return stages
+
+
+async def _one_request(client: httpx.AsyncClient, url: str, query: str) -> Dict[str, float]:
+    started = time.perf_counter()
+    first_byte: Optional[float] = None
+
+    try:
+        async with client.stream("POST", url, json={"query": query}) as response:
+            async for _ in response.aiter_raw():
+                if first_byte is None:
+                    first_byte = time.perf_counter() - started
+            ok = response.status_code == 200
+    except httpx.HTTPError:
+        ok = False
+
+    return {
+        "latency": time.perf_counter() - started,
+        "ttfb": first_byte if first_byte is not None else time.perf_counter() - started,
+        "ok": ok
+    }
+
+
+async def run_load(base_url: str, endpoint: str, queries: List[str], total: int,
+                   concurrency: int, unique: bool, tag: str = "variant") -> Dict[str, object]:
+    url = f"{base_url}{endpoint}"
+    semaphore = asyncio.Semaphore(concurrency)
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+
+    async with httpx.AsyncClient(timeout=120, limits=limits) as client:
+        before = await _scrape_stages(client, base_url)
+
+        async def worker(i: int):
+            query = queries[i % len(queries)]
+            if unique:
+                # Distinct text per request (and per run, via the tag) so the caches don't short-circuit the pipeline
+                query = f"{query} {tag} {i}"
+            async with semaphore:
+                return await _one_request(client, url, query)
+
+        started = time.perf_counter()
+        samples = await asyncio.gather(*(worker(i) for i in range(total)))
+        elapsed = time.perf_counter() - started
+
+        after = await _scrape_stages(client, base_url)
+
+    latencies = [sample["latency"] for sample in samples]
+    ttfbs = [sample["ttfb"] for sample in samples]
+    errors = sum(1 for sample in samples if not sample["ok"])
+
+    stages = {}
+    for series, totals in after.items():
+        count = totals["count"] - before.get(series, {}).get("count", 0.0)
+        if count <= 0:
+            continue
+        duration = totals["sum"] - before.get(series, {}).get("sum", 0.0)
+        stages[series] = {"count": int(count), "mean_ms": duration / count * 1000}
+
+    return {
+        "endpoint": endpoint,
+        "requests": total,
+        "concurrency": concurrency,
+        "errors": errors,
+        "elapsed_s": elapsed,
+        "requests_per_sec": total / elapsed if elapsed else 0.0,
+        "latency_ms": {p: percentile(latencies, p) * 1000 for p in (50, 95, 99)},
+        "ttfb_ms": {p: percentile(ttfbs, p) * 1000 for p in (50, 95, 99)},
+        "stages": stages
+    }
+
+
+def print_report(report: Dict[str, object]):
+    print(f"\n{report['endpoint']}: {report['requests']} requests @ concurrency {report['concurrency']}")
+    print(f"  throughput : {report['requests_per_sec']:.2f} req/s over {report['elapsed_s']:.2f}s")
+    print(f"  errors     : {report['errors']}")
+    for name in ("latency_ms", "ttfb_ms"):
+        values = report[name]
+        print(f"  {name:<11}: p50={values[50]:.1f}  p95={values[95]:.1f}  p99={values[99]:.1f}")
+
+    print("  per-stage (server side, mean):")
+    for series, stage in sorted(report["stages"].items()):
+        print(f"    {series:<75} n={stage['count']:<6} {stage['mean_ms']:.1f} ms")
+
+
+async def main_async(args):
+    upstream_url = f"http://127.0.0.1:{args.upstream_port}"
+    app_url = f"http://127.0.0.1:{args.app_port}"
+
+    env = dict(os.environ)
+    env.setdefault("GROQ_API_KEY", "bench-groq-key")
+    env.setdefault("TAVILY_API_KEY", "bench-tavily-key")
+    env["TAVILY_BASE_URL"] = f"{upstream_url}/tavily"
+    env["GROQ_BASE_URL"] = f"{upstream_url}/groq"
+
+    # Each run indexes into its own empty corpus, so earlier runs (or the app's
+    # own cache/corpus.db) can't answer searches that should reach the fake Tavily
+    corpus_dir = tempfile.mkdtemp(prefix="bench-corpus-")
+    env["LOCAL_CORPUS_PATH"] = os.path.join(corpus_dir, "corpus.db")
+
+    profile_flags = []
+    for name, value in vars(args).items():
+        if name.startswith(("tavily_", "groq_")):
+            profile_flags += [f"--{name.replace('_', '-')}", str(value)]
+
+    processes = [
+        _start_process(["-m", "benchmarks.fake_upstreams", "--port", str(args.upstream_port),
+                        "--seed", str(args.seed), *profile_flags], env),
+        _start_process(["-m", "uvicorn", "main:app", "--port", str(args.app_port),
+                        "--log-level", "warning"], env),
+    ]
+
+    try:
+        await _wait_until_ready(f"{upstream_url}/docs")
+        await _wait_until_ready(f"{app_url}/health")
+
+        queries = DEFAULT_QUERIES
+        if args.queries_file:
+            with open(args.queries_file, encoding="utf-8") as queries_file:
+                queries = [line.strip() for line in queries_file if line.strip()]
+
+        if args.warmup:
+            await run_load(app_url, args.endpoint, queries, args.warmup, args.concurrency, unique=True, tag="warmup")
+
+        report = await run_load(app_url, args.endpoint, queries, args.requests,
+                                args.concurrency, unique=not args.repeat_queries)
+        print_report(report)
+
+        if args.json:
+            with open(args.json, "w", encoding="utf-8") as output:
+                json.dump(report, output, indent=2)
+
+    finally:
+        for process in processes:
+            process.terminate()
+        for process in processes:
+            process.wait(timeout=10)
+        shutil.rmtree(corpus_dir, ignore_errors=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--endpoint", default="/search", choices=["/search", "/search/stream"])
+    parser.add_argument("--requests", type=int, default=100)
+    parser.add_argument("--concurrency", type=int, default=10)
+    parser.add_argument("--warmup", type=int, default=5)
+    parser.add_argument("--queries-file", default=None, help="One query per line")
+    parser.add_argument("--repeat-queries", action="store_true",
+                        help="Reuse query text verbatim so caches can serve repeats")
+    parser.add_argument("--app-port", type=int, default=9000)
+    parser.add_argument("--upstream-port", type=int, default=9100)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--json", default=None, help="Also write the report to this file")
+    add_profile_arguments(parser)
+    asyncio.run(main_async(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
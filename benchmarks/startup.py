@@ -0,0 +1,156 @@
+"""Cold-start benchmark for the API worker.
+
+Reports two things:
+
+* an import-time breakdown of `import main`, from `python -X importtime`,
+  grouped by top-level package plus every module under services/;
+* process start to the first answered /health request, and to the first
+  completed /search, against the fake Groq/Tavily upstreams (median of
+  several fresh processes).
+
+Run from the repository root:
+
+    python -m benchmarks.startup
+    python -m benchmarks.startup --runs 10 --top 20
+"""
+
+import argparse
+import asyncio
+import os
+import statistics
+import subprocess
+import sys
+import time
+from typing import Dict, List, Tuple
+
+import httpx
+
+from benchmarks.load_test import ROOT_DIR, _start_process, _wait_until_ready
+
+LOCAL_PACKAGES = ("main", "services", "models", "config", "logger_config")
+
+
+def _bench_env(upstream_url: str) -> Dict[str, str]:
+    env = dict(os.environ)
+    env.setdefault("GROQ_API_KEY", "bench-groq-key")
+    env.setdefault("TAVILY_API_KEY", "bench-tavily-key")
+    env["TAVILY_BASE_URL"] = f"{upstream_url}/tavily"
+    env["GROQ_BASE_URL"] = f"{upstream_url}/groq"
+    return env
+
+
+def import_breakdown(env: Dict[str, str]) -> Tuple[float, List[Tuple[str, float]]]:
+    """Return (total ms, [(module group, cumulative ms)]) for `import main`"""
+
+    completed = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import main"],
+        cwd=ROOT_DIR, env=env, capture_output=True, text=True, check=True
+    )
+
+    # importtime lists children before their parent; keep the entries since the
+    # previous top-level import, which is the subtree of `main`
+    subtree: List[Tuple[int, str, float]] = []
+    total = 0.0
+    for line in completed.stderr.splitlines():
+        if not line.startswith("import time:") or line.count("|") != 2:
+            continue
+        _, cumulative, name = line.split("|")
+        try:
+            cumulative_ms = int(cumulative) / 1000
+        except ValueError:
+            continue   # header row
+
+        depth = (len(name) - len(name.lstrip()) - 1) // 2
+        name = name.strip()
+        if depth == 0:
+            if name == "main":
+                total = cumulative_ms
+                break
+            subtree = []
+        else:
+            subtree.append((depth, name, cumulative_ms))
+
+    # Direct dependencies of main by package, plus our own modules at any depth
+    groups: Dict[str, float] = {}
+    for depth, name, cumulative_ms in subtree:
+        package = name.split(".")[0]
+        if package in LOCAL_PACKAGES:
+            groups[name] = max(groups.get(name, 0.0), cumulative_ms)
+        elif depth == 1:
+            groups[package] = max(groups.get(package, 0.0), cumulative_ms)
+
+    return total, sorted(groups.items(), key=lambda item: item[1], reverse=True)
+
+
+async def _wait_fine(client: httpx.AsyncClient, url: str, timeout: float = 30.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            if (await client.get(url)).status_code == 200:
+                return
+        except httpx.HTTPError:
+            pass
+        await asyncio.sleep(0.005)
+    raise RuntimeError(f"Timed out waiting for {url}")
+
+
+async def time_to_first_request(env: Dict[str, str], app_port: int) -> Tuple[float, float]:
+    """Return (seconds to first /health 200, seconds to first /search 200) for one fresh worker"""
+
+    app_url = f"http://127.0.0.1:{app_port}"
+    started = time.perf_counter()
+    process = _start_process(["-m", "uvicorn", "main:app", "--port", str(app_port), "--log-level", "warning"], env)
+
+    try:
+        async with httpx.AsyncClient(timeout=60) as client:
+            await _wait_fine(client, f"{app_url}/health")
+            ready = time.perf_counter() - started
+
+            response = await client.post(f"{app_url}/search", json={"query": "cold start benchmark query"})
+            response.raise_for_status()
+            first_search = time.perf_counter() - started
+    finally:
+        process.terminate()
+        process.wait(timeout=10)
+
+    return ready, first_search
+
+
+async def main_async(args):
+    upstream_url = f"http://127.0.0.1:{args.upstream_port}"
+    env = _bench_env(upstream_url)
+
+    total, groups = import_breakdown(env)
+    print(f"import main: {total:.1f} ms")
+    for name, milliseconds in groups[:args.top]:
+        print(f"  {name:<40} {milliseconds:8.1f} ms")
+
+    upstreams = _start_process(["-m", "benchmarks.fake_upstreams", "--port", str(args.upstream_port),
+                                "--tavily-latency-ms", "0", "--groq-latency-ms", "0",
+                                "--groq-token-delay-ms", "0"], env)
+    try:
+        await _wait_until_ready(f"{upstream_url}/docs")
+
+        samples = [await time_to_first_request(env, args.app_port) for _ in range(args.runs)]
+    finally:
+        upstreams.terminate()
+        upstreams.wait(timeout=10)
+
+    ready = [sample[0] * 1000 for sample in samples]
+    first_search = [sample[1] * 1000 for sample in samples]
+    print(f"\nfresh worker, median of {args.runs} runs (fake upstreams with zero latency):")
+    print(f"  start -> first /health : {statistics.median(ready):8.1f} ms  (min {min(ready):.1f})")
+    print(f"  start -> first /search : {statistics.median(first_search):8.1f} ms  (min {min(first_search):.1f})")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--top", type=int, default=15, help="Import groups to list")
+    parser.add_argument("--app-port", type=int, default=9000)
+    parser.add_argument("--upstream-port", type=int, default=9100)
+    asyncio.run(main_async(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,114 @@
+"""Micro-benchmark for source text cleaning.
+
+Compares the previous four-pass regex cleaner, the configured rules applied
+one pass per rule, and TextNormalizer's single scan on
+synthetic but realistic page text (navigation, cookie banners, ads, HTML
+remnants and long article bodies) and reports time per page and how much of
+the text each cleaner keeps. Run from the repository root:
+
+    python -m benchmarks.text_cleaning
+    python -m benchmarks.text_cleaning --pages 50 --paragraphs 200 --repeat 5
+"""
+
+import argparse
+import json
+import random
+import re
+import time
+from typing import Callable, List
+
+from config.settings import settings
+from services.text_normalizer import TextNormalizer
+
+ARTICLE_SENTENCES = [
+    "The committee published its findings after an eighteen month review of the available evidence.",
+    "Researchers measured the effect across three independent cohorts and found consistent results.",
+    "Critics argue the methodology underestimates long-term costs for smaller organisations.",
+    "Adoption grew fastest in regions where infrastructure investment had already been made.",
+    "The report recommends a phased rollout with independent audits at each stage.",
+    "Historical data suggests similar policies took roughly a decade to show measurable benefits.",
+    "Several cookie manufacturers reported record sales during the holiday season.",
+    "Industry groups welcomed the proposal but asked for clearer guidance on compliance.",
+]
+
+BOILERPLATE = [
+    "Skip to main content",
+    "We use cookies to improve your experience on our site. By continuing you agree to our Cookie Policy.",
+    "Advertisement",
+    "Share on Facebook Share on Twitter Share via Email",
+    "Subscribe to our newsletter for the latest updates!",
+    "<div class=\"ad-slot\"></div>",
+    "Privacy Policy | Terms of Service | Contact",
+    "© 2024 Example Media Group. All rights reserved.",
+]
+
+
+def legacy_clean(content: str) -> str:
+    """The cleaner ContentSynthesizer used before TextNormalizer"""
+    content = re.sub(r'\s+', ' ', content)
+    content = re.sub(r'(Cookie|Privacy Policy|Terms of Service).*', '', content)
+    content = re.sub(r'Advertisement\s*', '', content, flags=re.IGNORECASE)
+    content = re.sub(r'<[^>]+>', '', content)
+    return content.strip()
+
+
+def per_rule_cleaner(rules_path: str) -> Callable[[str], str]:
+    """The configured rules applied as one IGNORECASE re.sub pass each (phrase scope only)"""
+    with open(rules_path, encoding="utf-8") as rules_file:
+        config = json.load(rules_file)
+    patterns = [re.compile(rule, re.IGNORECASE) for rule in config.get("phrases", []) + config.get("sentences", [])]
+
+    def clean(content: str) -> str:
+        for pattern in patterns:
+            content = pattern.sub(" ", content)
+        return " ".join(content.split())
+
+    return clean
+
+
+def build_page(rng: random.Random, paragraphs: int) -> str:
+    lines = [rng.choice(BOILERPLATE) for _ in range(3)]
+    for _ in range(paragraphs):
+        lines.append(" ".join(rng.choice(ARTICLE_SENTENCES) for _ in range(rng.randint(3, 7))))
+        if rng.random() < 0.15:
+            lines.append(rng.choice(BOILERPLATE))
+    lines += [rng.choice(BOILERPLATE) for _ in range(3)]
+    return "\n\n".join(lines)
+
+
+def measure(name: str, clean: Callable[[str], str], pages: List[str], repeat: int):
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        cleaned = [clean(page) for page in pages]
+        best = min(best, time.perf_counter() - started)
+
+    kept = sum(len(text) for text in cleaned) / sum(len(page) for page in pages)
+    article_kept = sum(text.count("committee published") for text in cleaned) / \
+        max(1, sum(page.count("committee published") for page in pages))
+
+    print(f"  {name:<16} {best / len(pages) * 1000:8.3f} ms/page   "
+          f"chars kept {kept:6.1%}   article sentences kept {article_kept:6.1%}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--pages", type=int, default=20)
+    parser.add_argument("--paragraphs", type=int, default=120, help="Article paragraphs per page")
+    parser.add_argument("--repeat", type=int, default=5, help="Runs per cleaner; the best is reported")
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    pages = [build_page(rng, args.paragraphs) for _ in range(args.pages)]
+    average_chars = sum(len(page) for page in pages) // len(pages)
+    print(f"{args.pages} pages, ~{average_chars:,} chars each")
+
+    normalizer = TextNormalizer.from_file(settings.boilerplate_rules_path)
+    measure("legacy (4 pass)", legacy_clean, pages, args.repeat)
+    measure("per-rule passes", per_rule_cleaner(settings.boilerplate_rules_path), pages, args.repeat)
+    measure("TextNormalizer", normalizer.normalize, pages, args.repeat)
+
+
+if __name__ == "__main__":
+    main()
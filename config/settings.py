@@ -1,3 +1,5 @@
+import os
+from typing import Optional
 from pydantic_settings import BaseSettings
 from dotenv import load_dotenv
 
@@ -9,7 +11,142 @@ class Settings(BaseSettings):
     app_name: str = "Perplexity MVP"
     debug: bool = False
 
+    # Import numpy / the Groq SDK in the background at startup instead of on first use
+    preload_heavy_modules: bool = True
+
+    # Upstream endpoints (overridable to point at local stand-ins for benchmarks)
+    tavily_base_url: str = "https://api.tavily.com"
+    groq_base_url: Optional[str] = None    # None uses the Groq SDK default
+    groq_model: str = "openai/gpt-oss-120b"   # chat model used for analysis and synthesis
+
+    # Per-domain reputation weights used when ranking search results
+    domain_weights_path: str = os.path.join(os.path.dirname(__file__), "domain_weights.json")
+
+    # Boilerplate stripped from source text before synthesis
+    boilerplate_rules_path: str = os.path.join(os.path.dirname(__file__), "boilerplate_rules.json")
+
+    # Near-duplicate detection across search results
+    dedup_max_hamming_distance: int = 6    # SimHash bits that may differ between near-duplicates
+    dedup_min_tokens: int = 20             # shorter content is only deduplicated by URL
+
+    # Synthesis prompt context packing
+    synthesis_max_sources: int = 10          # top results considered for the prompt
+    synthesis_max_source_chars: int = 20000  # content read per source before passage selection
+    synthesis_context_tokens: int = 2500     # estimated token budget for all source passages
+    synthesis_passage_tokens: int = 80       # target passage size
+
+    # Batch reranking of search results (none | bm25)
+    reranker: str = "bm25"
+    rerank_bm25_weight: float = 0.5
+    rerank_recency_weight: float = 0.15
+    rerank_prior_weight: float = 0.35
+    rerank_recency_half_life_days: float = 365.0
+    rerank_real_time_recency_boost: float = 3.0   # recency weight multiplier for real-time queries
+
+    # Shared HTTP client (connection pool for upstream APIs)
+    http_timeout: float = 30.0
+    http2_enabled: bool = True
+    http_max_connections: int = 100            # total connections across all hosts
+    http_max_keepalive_connections: int = 20   # idle connections kept open for reuse
+    http_keepalive_expiry: float = 30.0        # seconds an idle connection stays alive
+    http_max_connections_per_host: int = 20    # cap on concurrent requests per upstream host
+
+    # Groq gateway shared by query analysis and synthesis
+    llm_max_concurrency: int = 16               # Groq calls in flight at once
+    llm_requests_per_minute: float = 1000.0     # account request quota for the model
+    llm_burst: int = 20                         # requests allowed back to back before pacing
+    llm_max_retries: int = 3                    # retries on 429 / 5xx / connection errors
+    llm_backoff_base: float = 0.5               # seconds, doubled per retry (with jitter)
+    llm_backoff_max: float = 8.0
+    llm_queue_timeout: float = 15.0             # seconds a call may wait for a slot before failing fast
+
+    # Full-pipeline response cache
+    response_cache_enabled: bool = True
+    response_cache_max_entries: int = 1000
+    response_cache_ttl: float = 3600.0             # seconds for evergreen queries
+    response_cache_real_time_ttl: float = 120.0    # seconds when analysis.requires_real_time
+    response_cache_shared_backend: str = "none"    # none | memory | sqlite
+    response_cache_sqlite_path: str = "cache/responses.db"
+
+    # Paraphrase cache in front of the pipeline (reuses the response cache TTLs)
+    semantic_cache_enabled: bool = True
+    semantic_cache_max_entries: int = 2000
+    semantic_cache_threshold: float = 0.9    # cosine similarity of hashed n-gram query vectors
+    semantic_cache_dim: int = 512
+    semantic_cache_lsh_tables: int = 16
+    semantic_cache_lsh_bits: int = 8          # hyperplanes per table; more = fewer candidates, lower recall
+
+    # Background refresh of trending queries' cached answers
+    cache_warmer_enabled: bool = True
+    cache_warmer_interval: float = 30.0           # seconds between warming cycles
+    cache_warmer_window: float = 3600.0           # sliding window for query frequency
+    cache_warmer_top_n: int = 20                  # hottest queries considered per cycle
+    cache_warmer_min_count: int = 3               # requests in the window for a query to count as hot
+    cache_warmer_refresh_ahead: float = 0.25      # refresh once less than this share of the TTL remains
+    cache_warmer_calls_per_minute: float = 30.0   # upstream (Groq + Tavily) calls warming may spend
+    cache_warmer_max_load: float = 0.5            # pause while this share of LLM slots is in use
+    cache_warmer_max_backoff: float = 1800.0      # max seconds before retrying a query whose warm was unusable
+
+    # Per-term Tavily result cache (stale-while-revalidate)
+    search_cache_enabled: bool = True
+    search_cache_max_entries: int = 5000
+    search_cache_fresh_ttl: float = 900.0     # served directly while younger than this
+    search_cache_stale_ttl: float = 86400.0   # served stale + refreshed in background until this
+
+    # Persistent full-text corpus of every fetched result, searched before Tavily
+    local_corpus_enabled: bool = True
+    local_corpus_path: str = "cache/corpus.db"
+    local_corpus_max_documents: int = 100000
+    local_corpus_min_matches: int = 2                  # fresh matching documents for a term to skip Tavily
+    local_corpus_min_tokens: int = 3                   # shorter terms are too vague to answer locally
+    local_corpus_near_distance: int = 10               # max tokens between a term's words in a matching document
+    local_corpus_min_score: float = 2.0                # min BM25 score of a matching document
+    local_corpus_max_age: float = 604800.0             # seconds since fetch for evergreen queries (7 days)
+    local_corpus_real_time_max_age: float = 3600.0     # seconds since fetch when analysis.requires_real_time
+    local_corpus_real_time_max_published_age: float = 172800.0   # real-time documents must be published within this
+
+    # Full page bodies from Tavily: off by default; when on, only the passages
+    # relevant to the search term are kept and appended to the snippet
+    search_include_raw_content: bool = False
+    raw_content_max_passages: int = 3
+    raw_content_max_chars: int = 1500      # extracted text kept per result
+
+    # Query analysis memoization and rule-based fast path
+    analysis_cache_max_entries: int = 5000
+    analysis_cache_ttl: float = 3600.0
+    query_fast_path_threshold: float = 0.85   # rule-based analysis is used only above this confidence
+
+    # Concurrent identical searches (and search terms) share one in-flight run
+    single_flight_enabled: bool = True
+
+    # /search/batch
+    batch_max_requests: int = 1000       # queries accepted per batch
+    batch_concurrency: int = 8           # queries run at once when the request doesn't say
+    batch_max_concurrency: int = 32      # upper bound on a requested concurrency
+
+    # Conversation sessions (SearchRequest.session_id): follow-ups reuse earlier sources and context
+    session_store_enabled: bool = True
+    session_max_sessions: int = 10000
+    session_ttl: float = 1800.0        # seconds of inactivity before a session is dropped
+    session_max_turns: int = 3         # earlier Q/A pairs included in the synthesis prompt
+    session_max_sources: int = 20      # ranked sources carried over to the next turn
+    session_answer_chars: int = 600    # characters of each earlier answer kept as context
+
+    # Search the raw query while analysis is still running
+    speculative_search_enabled: bool = True
+
+    # Search fan-out budget (max terms per request comes from query complexity)
+    search_parallelism: int = 3            # terms in flight at once
+    search_target_results: int = 6         # stop issuing once this many good results exist
+    search_min_result_score: float = 1.0   # calculated_score counted as a good result
+    search_deadline: float = 8.0           # seconds before in-flight searches are cancelled
+
+    # Request-level latency budget, split across pipeline stages
+    request_latency_budget: float = 20.0   # seconds, overridable per SearchRequest
+    analysis_budget_fraction: float = 0.2  # max share of the budget for query analysis
+    search_budget_fraction: float = 0.35   # max share of the budget for web search
+
     class Config:
         env_file = ".env"
 
-settings = Settings()
\ No newline at end of file
+settings = Settings()
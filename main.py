@@ -1,14 +1,22 @@
-from fastapi import FastAPI, HTTPException, Request
+from fastapi import Depends, FastAPI, HTTPException, Request
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import StreamingResponse, Response
+from prometheus_client import generate_latest, CONTENT_TYPE_LATEST
 from contextlib import asynccontextmanager
 from datetime import datetime
+import asyncio
 import uvicorn
 import logging
+import json
 
-from models.schemas import SearchRequest, SearchResponse
-from services.query_analyzer import QueryAnalyzer
+from models.schemas import SearchRequest, SearchResponse, BatchSearchRequest, BatchSearchItem
 from services.search_orchestrator import SearchOrchestrator
 from services.tavily_service import TavilyService
+from services.http_client import create_http_client
+from services.llm_gateway import LLMGateway
+from services.cache_warmer import build_cache_warmer
+from services.lazy_import import preload
+from services.metrics import IN_FLIGHT_REQUESTS, SERIALIZATION_STAGE, register_stats_provider
 from config.settings import settings
 from logger_config import setup_logger
 
@@ -16,18 +24,64 @@ setup_logger()
 # configure logging
 logger = logging.getLogger(__name__)
 
-# Initialize services
-query_analyzer = QueryAnalyzer()
-
-# Initialize orchestrator
-search_orchestrator = SearchOrchestrator()
+def collect_stats() -> dict:
+    """In-process counters from the caches, analyzer and request coalescing"""
+    search_orchestrator = getattr(app.state, "search_orchestrator", None)
+    if search_orchestrator is None:
+        return {}
+
+    response_cache = search_orchestrator.response_cache
+    semantic_cache = search_orchestrator.semantic_cache
+    session_store = search_orchestrator.session_store
+    local_corpus = search_orchestrator.local_corpus
+    cache_warmer = getattr(app.state, "cache_warmer", None)
+    return {
+        "response_cache": response_cache.get_stats() if response_cache else None,
+        "semantic_cache": semantic_cache.get_stats() if semantic_cache else None,
+        "search_cache": search_orchestrator.tavily_service.get_cache_stats(),
+        "query_analysis": search_orchestrator.query_analyzer.get_stats(),
+        "search_flight": search_orchestrator.get_flight_stats(),
+        "search_term_flight": search_orchestrator.tavily_service.term_flights.get_stats(),
+        "session_store": session_store.get_stats() if session_store else None,
+        "local_corpus": local_corpus.get_stats() if local_corpus else None,
+        "cache_warmer": cache_warmer.get_stats() if cache_warmer else None
+    }
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Manage application lifecycle"""
     logger.info("Perplexity MVP Starting Up. :)")
+
+    # Heavy libraries load in the background so the worker starts serving sooner
+    if settings.preload_heavy_modules:
+        asyncio.get_running_loop().run_in_executor(None, preload)
+
+    # One pooled HTTP client per process, shared by every Tavily search and Groq call
+    http_client = create_http_client()
+    app.state.http_client = http_client
+
+    # One Groq gateway per process: a single client, concurrency cap, rate limit and retries
+    llm_gateway = LLMGateway(http_client=http_client)
+    app.state.llm_gateway = llm_gateway
+
+    # Services are built once per worker, here rather than at import time
+    search_orchestrator = SearchOrchestrator(http_client=http_client, llm_gateway=llm_gateway)
+    app.state.search_orchestrator = search_orchestrator
+
+    # Keeps trending queries' answers cached, within its own upstream-call budget
+    cache_warmer = build_cache_warmer(search_orchestrator, llm_gateway)
+    app.state.cache_warmer = cache_warmer
+    if cache_warmer:
+        cache_warmer.start()
+
     yield
+
     logger.info("Perplexity MVP Shutting Down. :(")
+    if cache_warmer:
+        await cache_warmer.stop()
+    await search_orchestrator.aclose()
+    await llm_gateway.aclose()
+    await http_client.aclose()
 
 # Create FastAPI app
 app = FastAPI(
@@ -36,6 +90,12 @@ app = FastAPI(
     lifespan=lifespan
 )
 
+# Surface the same counters as Prometheus gauges on /metrics
+register_stats_provider(collect_stats)
+
+def get_orchestrator(request: Request) -> SearchOrchestrator:
+    return request.app.state.search_orchestrator
+
 # Add CORS middelware
 app.add_middleware(
     CORSMiddleware,
@@ -66,12 +126,25 @@ async def health_check():
         "timestamp": datetime.now().isoformat()
     }
 
+@app.get("/stats")
+async def stats_endpoint():
+    """Cache hit/miss counters for monitoring"""
+    return {
+        **collect_stats(),
+        "timestamp": datetime.now().isoformat()
+    }
+
+@app.get("/metrics")
+async def metrics_endpoint():
+    """Prometheus metrics in text exposition format"""
+    return Response(content=generate_latest(), media_type=CONTENT_TYPE_LATEST)
+
 # Add a test endpoint to verify Tavily connection
 @app.get("/test-tavily")
-async def test_tavily_endpoint():
+async def test_tavily_endpoint(request: Request):
     """Test Tavily API connection"""
     try:
-        tavily = TavilyService()
+        tavily = TavilyService(http_client=request.app.state.http_client)
         results = await tavily.search_multiple(["test query"], max_results_per_search=1)
         return {
             "status": "success",
@@ -85,25 +158,85 @@ async def test_tavily_endpoint():
         }
 
 @app.post("/search", response_model=SearchResponse)
-async def search_endpoint(request: SearchRequest):
+async def search_endpoint(request: SearchRequest,
+                          search_orchestrator: SearchOrchestrator = Depends(get_orchestrator)):
     """Complete search endpoint - Steps 1 & 2: Query Analysis + Web Search"""
 
     try:
         logger.info(f"Starting complete search for: {request.query}")
 
         # Execute complete search pipeline
-        response = await search_orchestrator.execute_search(request)
+        with IN_FLIGHT_REQUESTS.labels("search").track_inprogress():
+            response = await search_orchestrator.execute_search(request)
 
         # Log Summary
         if response.web_results:
             logger.info(f"Completed search for: {response.web_results.total_results}")
 
-        return response
+        # Serialize here so the cost shows up in the stage histogram
+        with SERIALIZATION_STAGE.time():
+            body = response.model_dump_json()
+
+        return Response(content=body, media_type="application/json")
 
     except Exception as e:
         logger.error(f"❌ Search endpoint error: {e}")
         raise HTTPException(status_code=500, detail=f"Search failed: {str(e)}")
 
+def _format_sse(event: str, data: dict) -> str:
+    """Encode one Server-Sent Event frame"""
+    return f"event: {event}\ndata: {json.dumps(data, default=str)}\n\n"
+
+@app.post("/search/stream")
+async def search_stream_endpoint(request: SearchRequest,
+                                 search_orchestrator: SearchOrchestrator = Depends(get_orchestrator)):
+    """Streaming search endpoint - emits analysis, web results, answer tokens and citations as SSE"""
+
+    logger.info(f"Starting streaming search for: {request.query}")
+
+    async def event_stream():
+        in_flight = IN_FLIGHT_REQUESTS.labels("search_stream")
+        in_flight.inc()
+        try:
+            async for event, data in search_orchestrator.stream_search(request):
+                yield _format_sse(event, data)
+        finally:
+            in_flight.dec()
+
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={
+            "Cache-Control": "no-cache",
+            "X-Accel-Buffering": "no"  # Disable proxy buffering so tokens flush immediately
+        }
+    )
+
+@app.post("/search/batch")
+async def search_batch_endpoint(request: BatchSearchRequest,
+                                search_orchestrator: SearchOrchestrator = Depends(get_orchestrator)):
+    """Bulk search endpoint - runs the queries concurrently and streams each result as an NDJSON line"""
+
+    if len(request.requests) > settings.batch_max_requests:
+        raise HTTPException(
+            status_code=413,
+            detail=f"Batch of {len(request.requests)} queries exceeds the limit of {settings.batch_max_requests}"
+        )
+
+    concurrency = min(request.concurrency or settings.batch_concurrency, settings.batch_max_concurrency)
+    logger.info(f"Starting batch search for {len(request.requests)} queries")
+
+    async def result_lines():
+        in_flight = IN_FLIGHT_REQUESTS.labels("search_batch")
+        in_flight.inc()
+        try:
+            async for index, response, error in search_orchestrator.execute_batch(request.requests, concurrency):
+                yield BatchSearchItem(index=index, response=response, error=error).model_dump_json() + "\n"
+        finally:
+            in_flight.dec()
+
+    return StreamingResponse(result_lines(), media_type="application/x-ndjson")
+
 if __name__ == "__main__":
     uvicorn.run(
         "main:app",
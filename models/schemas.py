@@ -14,6 +14,7 @@ class SearchRequest(BaseModel):
     query: str = Field(..., min_length=2, max_length=500)
     user_id: Optional[str] = None
     session_id: Optional[str] = None
+    latency_budget: Optional[float] = Field(None, gt=0, le=120)  # seconds; defaults to settings
 
 class QueryAnalysis(BaseModel):
     query_type: str
@@ -29,6 +30,7 @@ class SearchResult(BaseModel):
     content: str
     score: float
     calculated_score: Optional[float] = None
+    rerank_score: Optional[float] = None
     published_date: Optional[str] = None
 
 class WebSearchResults(BaseModel):
@@ -58,3 +60,14 @@ class SearchResponse(BaseModel):
     synthesized_response: Optional[SynthesizedResponse] = None
     status: str = "analyzed"
     timestamp: str
+    cached: bool = False
+    truncated_stages: List[str] = []  # stages cut short by the latency budget
+
+class BatchSearchRequest(BaseModel):
+    requests: List[SearchRequest] = Field(..., min_length=1)
+    concurrency: Optional[int] = Field(None, ge=1)  # queries run at once; capped by settings
+
+class BatchSearchItem(BaseModel):
+    index: int  # position of the query in BatchSearchRequest.requests
+    response: Optional[SearchResponse] = None
+    error: Optional[str] = None
@@ -0,0 +1,268 @@
+import asyncio
+import os
+import sqlite3
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Optional, Tuple
+
+from models.schemas import SearchResponse
+from config.settings import settings
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class TTLCache:
+    """In-process LRU cache whose entries also expire after a TTL"""
+
+    def __init__(self, max_entries: int, ttl: float):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries: "OrderedDict[Hashable, tuple]" = OrderedDict()
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+
+        expires_at, value = entry
+        if expires_at <= time.monotonic():
+            del self._entries[key]
+            return None
+
+        # Mark as most recently used
+        self._entries.move_to_end(key)
+        return value
+
+    def peek(self, key: Hashable) -> Optional[Tuple[float, Any]]:
+        """(seconds until expiry, value) without counting as a use"""
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+
+        expires_at, value = entry
+        remaining = expires_at - time.monotonic()
+        return (remaining, value) if remaining > 0 else None
+
+    def set(self, key: Hashable, value: Any, ttl: Optional[float] = None):
+        expires_at = time.monotonic() + (ttl if ttl is not None else self.ttl)
+        self._entries[key] = (expires_at, value)
+        self._entries.move_to_end(key)
+
+        # Evict least recently used entries beyond capacity
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def delete(self, key: Hashable):
+        self._entries.pop(key, None)
+
+    def clear(self):
+        self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class CacheBackend(ABC):
+    """Interface for a shared cache tier storing serialized values"""
+
+    name = "base"
+
+    @abstractmethod
+    async def get(self, key: str) -> Optional[Tuple[str, float]]:
+        """(value, seconds until expiry), or None if missing or expired"""
+        ...
+
+    @abstractmethod
+    async def set(self, key: str, value: str, ttl: float):
+        ...
+
+    async def close(self):
+        pass
+
+
+class MemoryCacheBackend(CacheBackend):
+    """Local stand-in for a Redis-style shared tier (useful for development)"""
+
+    name = "memory"
+
+    def __init__(self, max_entries: int = 10000):
+        self._cache = TTLCache(max_entries=max_entries, ttl=0)
+
+    async def get(self, key: str) -> Optional[Tuple[str, float]]:
+        entry = self._cache.peek(key)
+        if entry is None:
+            return None
+
+        remaining, value = entry
+        self._cache.get(key)   # mark as most recently used
+        return value, remaining
+
+    async def set(self, key: str, value: str, ttl: float):
+        self._cache.set(key, value, ttl=ttl)
+
+
+class SQLiteCacheBackend(CacheBackend):
+    """Shared tier backed by a SQLite file, usable across worker processes"""
+
+    name = "sqlite"
+
+    def __init__(self, path: str):
+        self.path = path
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS cache ("
+            "key TEXT PRIMARY KEY, value TEXT NOT NULL, expires_at REAL NOT NULL)"
+        )
+        self._conn.commit()
+
+    def _get(self, key: str) -> Optional[Tuple[str, float]]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value, expires_at FROM cache WHERE key = ?", (key,)
+            ).fetchone()
+
+            if row is None:
+                return None
+            remaining = row[1] - time.time()
+            if remaining <= 0:
+                self._conn.execute("DELETE FROM cache WHERE key = ?", (key,))
+                self._conn.commit()
+                return None
+            return row[0], remaining
+
+    def _set(self, key: str, value: str, ttl: float):
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO cache (key, value, expires_at) VALUES (?, ?, ?)",
+                (key, value, time.time() + ttl)
+            )
+            self._conn.commit()
+
+    async def get(self, key: str) -> Optional[Tuple[str, float]]:
+        return await asyncio.to_thread(self._get, key)
+
+    async def set(self, key: str, value: str, ttl: float):
+        await asyncio.to_thread(self._set, key, value, ttl)
+
+    async def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+class ResponseCache:
+    """Two-tier cache (in-process LRU+TTL, optional shared tier) for full search responses"""
+
+    def __init__(self,
+                 max_entries: int,
+                 ttl: float,
+                 real_time_ttl: float,
+                 shared_tier: Optional[CacheBackend] = None):
+        self.memory_tier = TTLCache(max_entries=max_entries, ttl=ttl)
+        self.shared_tier = shared_tier
+        self.ttl = ttl
+        self.real_time_ttl = real_time_ttl
+
+        self.memory_hits = 0
+        self.shared_hits = 0
+        self.misses = 0
+        self.stores = 0
+        self.errors = 0
+
+    def _ttl_for(self, response: SearchResponse) -> float:
+        """Real-time queries go stale quickly, so they get the shorter TTL"""
+        if response.analysis and response.analysis.requires_real_time:
+            return self.real_time_ttl
+        return self.ttl
+
+    async def get(self, key: str) -> Optional[SearchResponse]:
+        response = self.memory_tier.get(key)
+        if response is not None:
+            self.memory_hits += 1
+            return response
+
+        if self.shared_tier is not None:
+            try:
+                entry = await self.shared_tier.get(key)
+            except Exception as e:
+                self.errors += 1
+                logger.warning(f"Shared cache read failed for '{key}': {e}")
+                entry = None
+
+            if entry is not None:
+                payload, remaining = entry
+                response = SearchResponse.model_validate_json(payload)
+                # Promote into the local tier for the remainder of its lifetime
+                self.memory_tier.set(key, response, ttl=min(remaining, self._ttl_for(response)))
+                self.shared_hits += 1
+                return response
+
+        self.misses += 1
+        return None
+
+    def peek(self, key: str) -> Optional[Tuple[SearchResponse, float, float]]:
+        """(response, seconds left, full TTL) from the local tier, without touching the counters"""
+        entry = self.memory_tier.peek(key)
+        if entry is None:
+            return None
+
+        remaining, response = entry
+        return response, remaining, self._ttl_for(response)
+
+    async def set(self, key: str, response: SearchResponse):
+        ttl = self._ttl_for(response)
+        self.memory_tier.set(key, response, ttl=ttl)
+        self.stores += 1
+
+        if self.shared_tier is not None:
+            try:
+                await self.shared_tier.set(key, response.model_dump_json(), ttl)
+            except Exception as e:
+                self.errors += 1
+                logger.warning(f"Shared cache write failed for '{key}': {e}")
+
+    async def close(self):
+        if self.shared_tier is not None:
+            await self.shared_tier.close()
+
+    def get_stats(self) -> Dict[str, Any]:
+        hits = self.memory_hits + self.shared_hits
+        lookups = hits + self.misses
+        return {
+            "memory_hits": self.memory_hits,
+            "shared_hits": self.shared_hits,
+            "misses": self.misses,
+            "stores": self.stores,
+            "errors": self.errors,
+            "hit_rate": hits / lookups if lookups else 0.0,
+            "entries": len(self.memory_tier),
+            "shared_tier": self.shared_tier.name if self.shared_tier else None
+        }
+
+
+def build_response_cache() -> Optional[ResponseCache]:
+    """Create the response cache described by settings (None when disabled)"""
+
+    if not settings.response_cache_enabled:
+        return None
+
+    shared_tier = None
+    backend = settings.response_cache_shared_backend.lower()
+    if backend == "sqlite":
+        shared_tier = SQLiteCacheBackend(settings.response_cache_sqlite_path)
+    elif backend == "memory":
+        shared_tier = MemoryCacheBackend()
+    elif backend != "none":
+        logger.warning(f"Unknown response cache backend '{backend}', using in-process tier only")
+
+    return ResponseCache(
+        max_entries=settings.response_cache_max_entries,
+        ttl=settings.response_cache_ttl,
+        real_time_ttl=settings.response_cache_real_time_ttl,
+        shared_tier=shared_tier
+    )
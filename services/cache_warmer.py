@@ -0,0 +1,215 @@
+import asyncio
+import time
+from collections import Counter, deque
+from typing import Any, Deque, Dict, List, Optional, Tuple
+
+from config.settings import settings
+from services.llm_gateway import LLMGateway, TokenBucket
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Upstream calls charged for a query we have no cached response for:
+# analysis + a typical fan-out of three terms + synthesis
+DEFAULT_WARM_COST = 5
+
+
+class QueryFrequencyTracker:
+    """Request counts per query over a sliding window.
+
+    The window is split into `buckets` time slices; each slice counts the
+    queries seen in it and is dropped (and subtracted from the totals) once
+    it falls out of the window, so ranking never rescans old traffic.
+    """
+
+    def __init__(self, window: float, buckets: int = 12):
+        self.bucket_seconds = window / buckets
+        self.buckets = buckets
+        self._slices: Deque[Tuple[int, Counter]] = deque()
+        self._totals: Counter = Counter()
+        self._queries: Dict[str, str] = {}   # key -> latest query text seen for it
+
+    def _advance(self) -> Counter:
+        current = int(time.monotonic() // self.bucket_seconds)
+        while self._slices and self._slices[0][0] <= current - self.buckets:
+            _, expired = self._slices.popleft()
+            self._totals.subtract(expired)
+            for key in expired:
+                if self._totals[key] <= 0:
+                    del self._totals[key]
+                    del self._queries[key]
+
+        if not self._slices or self._slices[-1][0] != current:
+            self._slices.append((current, Counter()))
+        return self._slices[-1][1]
+
+    def record(self, key: str, query: str):
+        self._advance()[key] += 1
+        self._totals[key] += 1
+        self._queries[key] = query
+
+    def top(self, n: int) -> List[Tuple[str, str, int]]:
+        """The `n` most requested (key, query, count) in the window"""
+        self._advance()
+        return [(key, self._queries[key], count) for key, count in self._totals.most_common(n)]
+
+    def __len__(self) -> int:
+        return len(self._totals)
+
+
+class CacheWarmer:
+    """Refreshes the cached answers of trending queries before they expire.
+
+    Every `interval` seconds the hottest queries of the tracker's window
+    (at least `min_count` requests) are checked against the response cache,
+    and those missing or within `refresh_ahead` of the end of their TTL are
+    recomputed one at a time, with their analysis and search results
+    refetched too. Warming spends from its own upstream-call bucket and
+    stands down while the LLM gateway is busier than `max_load`, so live
+    requests always come first. A query whose last warm failed or produced
+    nothing cacheable (a fallback or truncated answer) is retried after an
+    exponential backoff starting at `interval` and capped at `max_backoff`.
+    """
+
+    def __init__(self,
+                 orchestrator: Any,
+                 llm_gateway: Optional[LLMGateway],
+                 interval: float,
+                 top_n: int,
+                 min_count: int,
+                 refresh_ahead: float,
+                 calls_per_minute: float,
+                 max_load: float,
+                 max_backoff: float):
+        self.orchestrator = orchestrator
+        self.llm_gateway = llm_gateway
+        self.interval = interval
+        self.top_n = top_n
+        self.min_count = min_count
+        self.refresh_ahead = refresh_ahead
+        self.max_load = max_load
+        self.max_backoff = max_backoff
+        self.budget = TokenBucket(rate=calls_per_minute / 60, capacity=calls_per_minute)
+        self._task: Optional[asyncio.Task] = None
+        self._backoff: Dict[str, Tuple[int, float]] = {}   # key -> (failed warms in a row, retry at)
+
+        self.cycles = 0
+        self.warmed = 0
+        self.failures = 0
+        self.uncacheable = 0
+        self.skipped_backoff = 0
+        self.skipped_busy = 0
+        self.skipped_budget = 0
+
+    def start(self):
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _run(self):
+        while True:
+            await asyncio.sleep(self.interval)
+            try:
+                await self.run_cycle()
+            except Exception as e:
+                logger.error(f"❌ Cache warming cycle failed: {e}")
+
+    def _busy(self) -> bool:
+        gateway = self.llm_gateway
+        if gateway is None:
+            return False
+        return gateway.queued > 0 or gateway.in_flight >= gateway.max_concurrency * self.max_load
+
+    async def run_cycle(self):
+        """Refresh whichever hot queries are due, as far as the budget allows"""
+        self.cycles += 1
+        response_cache = self.orchestrator.response_cache
+
+        for cache_key, query, count in self.orchestrator.query_frequency.top(self.top_n):
+            if count < self.min_count:
+                break
+
+            backoff = self._backoff.get(cache_key)
+            if backoff is not None and time.monotonic() < backoff[1]:
+                self.skipped_backoff += 1
+                continue
+
+            cost = DEFAULT_WARM_COST
+            cached = response_cache.peek(cache_key)
+            if cached is not None:
+                response, remaining, ttl = cached
+                if remaining > ttl * self.refresh_ahead:
+                    continue
+                if response.web_results is not None:
+                    cost = 2 + len(response.web_results.search_terms_used)
+
+            if self._busy():
+                self.skipped_busy += 1
+                logger.info("Cache warming paused: LLM gateway is busy with live traffic")
+                return
+            if not self.budget.try_acquire(cost):
+                self.skipped_budget += 1
+                logger.info(f"Cache warming budget spent, deferring '{query}'")
+                return
+
+            try:
+                logger.info(f"🔥 Warming '{query}' ({count} requests in window)")
+                response = await self.orchestrator.refresh_query(query)
+            except Exception as e:
+                self.failures += 1
+                logger.warning(f"⚠️ Warming '{query}' failed: {e}")
+                self._back_off(cache_key)
+                continue
+
+            if self.orchestrator.is_cacheable(response):
+                self.warmed += 1
+                self._backoff.pop(cache_key, None)
+            else:
+                self.uncacheable += 1
+                logger.info(f"Warming '{query}' produced nothing cacheable, backing off")
+                self._back_off(cache_key)
+
+    def _back_off(self, cache_key: str):
+        failures = self._backoff[cache_key][0] + 1 if cache_key in self._backoff else 1
+        delay = min(self.max_backoff, self.interval * 2 ** (failures - 1))
+        self._backoff[cache_key] = (failures, time.monotonic() + delay)
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "cycles": self.cycles,
+            "warmed": self.warmed,
+            "failures": self.failures,
+            "uncacheable": self.uncacheable,
+            "backing_off": len(self._backoff),
+            "skipped_backoff": self.skipped_backoff,
+            "skipped_busy": self.skipped_busy,
+            "skipped_budget": self.skipped_budget,
+            "tracked_queries": len(self.orchestrator.query_frequency)
+        }
+
+
+def build_cache_warmer(orchestrator: Any, llm_gateway: Optional[LLMGateway]) -> Optional[CacheWarmer]:
+    """Create the cache warmer described by settings (None when disabled or nothing to warm)"""
+
+    if orchestrator.query_frequency is None or orchestrator.response_cache is None:
+        return None
+
+    return CacheWarmer(
+        orchestrator=orchestrator,
+        llm_gateway=llm_gateway,
+        interval=settings.cache_warmer_interval,
+        top_n=settings.cache_warmer_top_n,
+        min_count=settings.cache_warmer_min_count,
+        refresh_ahead=settings.cache_warmer_refresh_ahead,
+        calls_per_minute=settings.cache_warmer_calls_per_minute,
+        max_load=settings.cache_warmer_max_load,
+        max_backoff=settings.cache_warmer_max_backoff
+    )
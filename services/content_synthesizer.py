@@ -1,8 +1,16 @@
+import asyncio
 import json
-from typing import List, Dict, Any, Optional
-from groq import AsyncGroq
+import time
+from typing import List, Dict, Any, Optional, AsyncIterator, Sequence, Tuple, Union
 from models.schemas import WebSearchResults, SearchResult, QueryAnalysis, SynthesizedResponse
 from config.settings import settings
+from services.context_packer import ContextPacker
+from services.text_normalizer import TextNormalizer
+from services.prompt_builder import PromptBuilder
+from services.llm_gateway import LLMGateway
+from services.metrics import (
+    PROMPT_BUILD_STAGE, GROQ_SYNTHESIS, GROQ_TIME_TO_FIRST_TOKEN, UPSTREAM_ERRORS
+)
 import logging
 import re
 
@@ -11,33 +19,59 @@ logger = logging.getLogger(__name__)
 class ContentSynthesizer:
     """Synthesizes search results into comprehensive, cited responses"""
 
-    def __init__(self):
-        self.client = AsyncGroq(api_key=settings.GROQ_API_KEY)
-        self.model = "openai/gpt-oss-120b"
-        self.max_content_length = 4000   # Limit content per source
+    def __init__(self, llm_gateway: Optional[LLMGateway] = None):
+        # Shared gateway (normally injected by the app lifespan)
+        self.llm_gateway = llm_gateway
+        self._owns_gateway = False
+        self.model = settings.groq_model
+        self.max_sources = settings.synthesis_max_sources
+        self.max_content_length = settings.synthesis_max_source_chars   # Bound work per source before packing
+        self.prompt_builder = PromptBuilder()
+        self.text_normalizer = TextNormalizer.from_file(settings.boilerplate_rules_path)
+        self.context_packer = ContextPacker(
+            token_budget=settings.synthesis_context_tokens,
+            passage_tokens=settings.synthesis_passage_tokens
+        )
+
+    def _get_gateway(self) -> LLMGateway:
+        """Return the shared gateway, creating a private one if none was injected"""
+        if self.llm_gateway is None:
+            self.llm_gateway = LLMGateway()
+            self._owns_gateway = True
+        return self.llm_gateway
+
+    async def aclose(self):
+        """Close the gateway if this service created it"""
+        if self._owns_gateway and self.llm_gateway is not None:
+            await self.llm_gateway.aclose()
+            self.llm_gateway = None
+            self._owns_gateway = False
 
     async def synthesize_response(self, 
                                   query: str, 
                                   analysis: QueryAnalysis, 
                                   web_results: WebSearchResults,
+                                  history: Optional[Sequence[Any]] = None
                                   ) -> SynthesizedResponse:
-        """Generate comprehensive response from search results"""
+        """Generate comprehensive response from search results (and earlier turns of the session)"""
 
         logger.info(f"Synthesizing Response from {web_results.total_results} sources")
 
         # Step 1: Prepare and clean search Content
-        processed_sources = self._process_search_results(web_results.results)
+        processed_sources = self._process_search_results(web_results.results, query, analysis)
 
         if not processed_sources:
             logger.warning("No Valid Sources to synthesis from")
-            return self._create_fallback_response(query)
+            return self.fallback_response(query)
         
         # Step 2: Create synthesis prompt
-        synthesis_prompt = self._create_synthesis_prompt(
-            query=query,
-            analysis=analysis,
-            sources=processed_sources
-        )
+        with PROMPT_BUILD_STAGE.time():
+            synthesis_prompt = self._create_synthesis_prompt(
+                query=query,
+                analysis=analysis,
+                sources=processed_sources,
+                history=history
+            )
 
         # Step 3: Generate response using Groq
         try: 
@@ -55,24 +89,26 @@ class ContentSynthesizer:
         
         except Exception as e:
             logger.error(f"Synthesis failed: {e}")
-            return self._create_fallback_response(query, str(e))
+            return self.fallback_response(query, str(e))
         
-    def _process_search_results(self, results: List[SearchResult]) -> List[Dict[str, Any]]:
-        """Clean and prepare search results for synthesis"""
+    def _process_search_results(self,
+                                results: List[SearchResult],
+                                query: str,
+                                analysis: QueryAnalysis) -> List[Dict[str, Any]]:
+        """Clean search results and pack the most relevant passages into the prompt budget"""
 
         processed = []
 
-        for i, result in enumerate(results[:8]):  # Limit to top 8 results
+        for i, result in enumerate(results[:self.max_sources]):
             try:
-                # Clean and truncate content
+                # Clean and bound content
                 content = self._clean_content(result.content)
 
                 if len(content) < 10:  # skip very short content
                     continue
 
-                # Truncate if too long
                 if len(content) > self.max_content_length:
-                    content = content[:self.max_content_length] + "..."
+                    content = content[:self.max_content_length]
 
                 source = {
                     "id": i + 1,
@@ -88,103 +124,159 @@ class ContentSynthesizer:
                 logger.warning(f"Failed to process result {i}: {e}")
                 continue
 
-        logger.info(f"Processed {len(processed)} valid sources")
-        return processed
+        # Greedily fill the token budget with the best passages across sources
+        packed = self.context_packer.pack(query, analysis.key_entities, processed)
+
+        logger.info(f"Packed {len(packed)} of {len(processed)} valid sources into the context budget")
+        return packed
     
     def _clean_content(self, content: str) -> str:
         """Clean and normalize content text"""
-        
-        # Remove extra whitespace and newlines
-        content = re.sub(r'\s+', ' ', content)
-        
-        # Remove common web artifacts
-        content = re.sub(r'(Cookie|Privacy Policy|Terms of Service).*', '', content)
-        content = re.sub(r'Advertisement\s*', '', content, flags=re.IGNORECASE)
-        
-        # Remove HTML-like tags if any
-        content = re.sub(r'<[^>]+>', '', content)
-        
-        return content.strip()
+        return self.text_normalizer.normalize(content)
     
     def _create_synthesis_prompt(
         self, 
         query: str, 
         analysis: QueryAnalysis, 
-        sources: List[Dict[str, Any]]
+        sources: List[Dict[str, Any]],
+        history: Optional[Sequence[Any]] = None
     ) -> str:
         """Create comprehensive prompt for content synthesis"""
-        
-        # Build sources context
-        sources_text = ""
-        for source in sources:
-            sources_text += f"""
-                                Source [{source['id']}]: {source['title']}
-                                URL: {source['url']}
-                                Content: {source['content']}
-
-                                ---
-                                """
-            
-            prompt = f"""
-                    You are an expert research assistant. Your task is to synthesize information from multiple sources to answer the user's query comprehensively and accurately.
-
-                    **User Query**: "{query}"
-
-                    **Query Analysis**:
-                    - Type: {analysis.query_type}
-                    - Intent: {analysis.search_intent}
-                    - Complexity: {analysis.complexity_score}/10
-
-                    **Available Sources**:
-                    {sources_text}
-
-                    **Instructions**:
-                    1. **Synthesize** information from the sources to create a comprehensive answer
-                    2. **Use proper citations** - Reference sources as [1], [2], etc. throughout your response
-                    3. **Be accurate** - Only use information that's clearly supported by the sources
-                    4. **Structure well** - Use headers, bullet points, and clear organization
-                    5. **Be comprehensive** - Cover all relevant aspects of the query
-                    6. **Maintain objectivity** - Present balanced information when there are different viewpoints
-
-                    **Response Format**:
-                    - Start with a clear, direct answer to the main question
-                    - Provide detailed explanation with proper citations
-                    - Use markdown formatting for better readability
-                    - Include relevant examples, comparisons, or additional context
-                    - End with a brief summary if the response is long
-
-                    **Citation Rules**:
-                    - Cite sources immediately after relevant statements: "Quantum computers use qubits[1][3]"
-                    - Use multiple citations when information comes from multiple sources
-                    - Never make claims without citing sources
-                    - Ensure every major fact or claim has proper citation
-
-                    Generate a comprehensive, well-cited response:
-                    """
-        
-        return prompt
+        return self.prompt_builder.synthesis_prompt(query, analysis, sources, history)
     
+    async def stream_response(self,
+                              query: str,
+                              analysis: QueryAnalysis,
+                              web_results: WebSearchResults,
+                              timeout: Optional[float] = None,
+                              history: Optional[Sequence[Any]] = None
+                              ) -> AsyncIterator[Tuple[str, Union[str, SynthesizedResponse]]]:
+        """Stream the synthesized answer token by token.
+
+        Yields ("token", text) chunks as Groq produces them and finishes with
+        ("synthesis", SynthesizedResponse) carrying citations and metrics. If
+        `timeout` elapses first, ("truncated", "synthesis") is yielded and the
+        answer is built from the tokens received so far.
+        """
+
+        logger.info(f"Streaming synthesis from {web_results.total_results} sources")
+
+        processed_sources = self._process_search_results(web_results.results, query, analysis)
+
+        if not processed_sources:
+            logger.warning("No Valid Sources to synthesis from")
+            fallback = self.fallback_response(query)
+            yield "token", fallback.response
+            yield "synthesis", fallback
+            return
+
+        with PROMPT_BUILD_STAGE.time():
+            synthesis_prompt = self._create_synthesis_prompt(
+                query=query,
+                analysis=analysis,
+                sources=processed_sources,
+                history=history
+            )
+
+        chunks = []
+        deadline = time.monotonic() + timeout if timeout is not None else None
+        tokens = self._stream_with_groq(synthesis_prompt).__aiter__()
+        try:
+            while True:
+                wait = deadline - time.monotonic() if deadline is not None else None
+                try:
+                    token = await asyncio.wait_for(tokens.__anext__(), wait)
+                except StopAsyncIteration:
+                    break
+                chunks.append(token)
+                yield "token", token
+
+        except asyncio.TimeoutError:
+            logger.warning(f"Streaming synthesis cut short after {timeout:.2f}s")
+            yield "truncated", "synthesis"
+            if not chunks:
+                fallback = self.fallback_response(query, "Response generation exceeded the latency budget")
+                yield "token", fallback.response
+                yield "synthesis", fallback
+                return
+
+        except Exception as e:
+            logger.error(f"Streaming synthesis failed: {e}")
+            if not chunks:
+                fallback = self.fallback_response(query, str(e))
+                yield "token", fallback.response
+                yield "synthesis", fallback
+                return
+
+        finally:
+            await tokens.aclose()
+
+        response = self._process_synthesized_response(
+            content="".join(chunks).strip(),
+            sources=processed_sources,
+            query=query
+        )
+
+        logger.info(f"Streamed response synthesized successfully")
+        yield "synthesis", response
+
+    def _build_messages(self, prompt: str) -> List[Dict[str, str]]:
+        """Chat messages for the synthesis call"""
+        return self.prompt_builder.synthesis_messages(prompt)
+
+    async def _stream_with_groq(self, prompt: str) -> AsyncIterator[str]:
+        """Stream response tokens from Groq as they are generated"""
+
+        started = time.perf_counter()
+        first_token = True
+
+        stream = self._get_gateway().stream(
+            "synthesis",
+            model=self.model,
+            messages=self._build_messages(prompt),
+            temperature=0.1,
+            max_tokens=2000,
+            top_p=0.9
+        )
+        try:
+            async for chunk in stream:
+                if not chunk.choices:
+                    continue
+                delta = chunk.choices[0].delta.content
+                if delta:
+                    if first_token:
+                        GROQ_TIME_TO_FIRST_TOKEN.observe(time.perf_counter() - started)
+                        first_token = False
+                    yield delta
+
+        except Exception as e:
+            UPSTREAM_ERRORS.labels("groq", type(e).__name__).inc()
+            raise
+
+        finally:
+            # Give the gateway slot back even when the consumer stops early
+            await stream.aclose()
+
+        GROQ_SYNTHESIS.observe(time.perf_counter() - started)
+
     async def _generate_with_groq(self, prompt: str) -> str:
         """Generate response using Groq LLM"""
         
         try:
-            response = await self.client.chat.completions.create(
-                model=self.model,
-                messages=[
-                    {
-                        "role": "system", 
-                        "content": "You are an expert research assistant that creates comprehensive, well-cited responses. Always use proper citations and maintain accuracy."
-                    },
-                    {"role": "user", "content": prompt}
-                ],
-                temperature=0.1,  # Low temperature for accuracy
-                max_tokens=2000,  # Comprehensive responses
-                top_p=0.9
-            )
+            with GROQ_SYNTHESIS.time():
+                response = await self._get_gateway().complete(
+                    "synthesis",
+                    model=self.model,
+                    messages=self._build_messages(prompt),
+                    temperature=0.1,  # Low temperature for accuracy
+                    max_tokens=2000,  # Comprehensive responses
+                    top_p=0.9
+                )
             
             return response.choices[0].message.content.strip()
             
         except Exception as e:
+            UPSTREAM_ERRORS.labels("groq", type(e).__name__).inc()
             logger.error(f"❌ Groq generation failed: {e}")
             raise
     
@@ -255,8 +347,8 @@ class ContentSynthesizer:
         
         return min(score, 1.0)  # Cap at 1.0
     
-    def _create_fallback_response(self, query: str, error: str = None) -> SynthesizedResponse:
-        """Create fallback response when synthesis fails"""
+    def fallback_response(self, query: str, error: str = None) -> SynthesizedResponse:
+        """Create fallback response when synthesis fails or runs out of time"""
         
         fallback_content = f"""
             I apologize, but I encountered difficulty synthesizing a comprehensive response for your query: "{query}".
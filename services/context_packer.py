@@ -0,0 +1,139 @@
+import math
+import re
+from typing import Any, Dict, List, Tuple
+
+from services.text_utils import content_terms, tokenize
+
+TOKEN_PATTERN = re.compile(r"\w+|[^\w\s]")
+SENTENCE_BOUNDARY = re.compile(r"(?<=[.!?])\s+")
+
+
+def estimate_tokens(text: str) -> int:
+    """Cheap local token estimate: one token per word piece of up to ~6 chars and per punctuation mark"""
+    return sum(1 + (len(piece) - 1) // 6 for piece in TOKEN_PATTERN.findall(text))
+
+
+class ContextPacker:
+    """Selects the most query-relevant passages across sources within a token budget.
+
+    Each source is split into sentence-aligned passages, every passage is
+    scored by query-term overlap (IDF-weighted across all passages) with a
+    small bonus for the source's rank and for lead passages, and passages are
+    added greedily until the budget is spent. Every source gets its best
+    passage first so one long page cannot crowd out the rest; after that only
+    passages sharing terms with the query are added.
+    """
+
+    def __init__(self, token_budget: int, passage_tokens: int = 80):
+        self.token_budget = token_budget
+        self.passage_tokens = passage_tokens
+
+    def pack(self, query: str, key_entities: List[str], sources: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Return sources (re-numbered from 1) whose content holds only the selected passages"""
+
+        passages = []  # (source_index, passage_index, text, tokens, terms)
+        for source_index, source in enumerate(sources):
+            for passage_index, text in enumerate(self._split_passages(source['content'])):
+                terms = set(tokenize(text))
+                passages.append((source_index, passage_index, text, estimate_tokens(text), terms))
+
+        if not passages:
+            return []
+
+        scores, overlaps = self._score_passages(query, key_entities, passages)
+
+        selected = set()
+        used_tokens = 0
+
+        def try_add(i: int) -> bool:
+            nonlocal used_tokens
+            tokens = passages[i][3]
+            if i in selected or used_tokens + tokens > self.token_budget:
+                return False
+            selected.add(i)
+            used_tokens += tokens
+            return True
+
+        ranked = sorted(range(len(passages)), key=lambda i: scores[i], reverse=True)
+
+        # Pass 1: best passage of each source, in source rank order
+        best_per_source: Dict[int, int] = {}
+        for i in ranked:
+            best_per_source.setdefault(passages[i][0], i)
+        for source_index in sorted(best_per_source):
+            try_add(best_per_source[source_index])
+
+        # Pass 2: fill the remaining budget with passages that actually match the query
+        for i in ranked:
+            if overlaps[i] > 0:
+                try_add(i)
+
+        # Reassemble each source's passages in reading order
+        by_source: Dict[int, List[Tuple[int, str]]] = {}
+        for i in selected:
+            source_index, passage_index, text = passages[i][:3]
+            by_source.setdefault(source_index, []).append((passage_index, text))
+
+        packed = []
+        for source_index in sorted(by_source):
+            chunks = [text for _, text in sorted(by_source[source_index])]
+            packed.append({
+                **sources[source_index],
+                "id": len(packed) + 1,
+                "content": " ... ".join(chunks)
+            })
+
+        return packed
+
+    def _split_passages(self, content: str) -> List[str]:
+        passages = []
+        current: List[str] = []
+        current_tokens = 0
+
+        for sentence in SENTENCE_BOUNDARY.split(content):
+            sentence = sentence.strip()
+            if not sentence:
+                continue
+
+            tokens = estimate_tokens(sentence)
+            if current and current_tokens + tokens > self.passage_tokens:
+                passages.append(" ".join(current))
+                current, current_tokens = [], 0
+
+            # Hard-wrap run-on "sentences" (tables, lists without punctuation)
+            while tokens > self.passage_tokens * 2:
+                words = sentence.split()
+                cut = max(1, len(words) * self.passage_tokens // tokens)
+                passages.append(" ".join(words[:cut]))
+                sentence = " ".join(words[cut:])
+                tokens = estimate_tokens(sentence)
+
+            current.append(sentence)
+            current_tokens += tokens
+
+        if current:
+            passages.append(" ".join(current))
+
+        return passages
+
+    def _score_passages(self,
+                        query: str,
+                        key_entities: List[str],
+                        passages: List[tuple]) -> Tuple[List[float], List[float]]:
+        """Return (ranking score, raw query-term overlap) per passage"""
+        query_terms = set(content_terms(" ".join([query, *key_entities])))
+
+        total = len(passages)
+        document_frequency = {term: sum(1 for passage in passages if term in passage[4]) for term in query_terms}
+        idf = {term: math.log1p(total / (1 + df)) for term, df in document_frequency.items()}
+
+        scores = []
+        overlaps = []
+        for source_index, passage_index, _, tokens, terms in passages:
+            overlap = sum(idf[term] for term in query_terms & terms)
+            # Prefer higher-ranked sources and lead passages when relevance ties
+            prior = 0.3 / (1 + source_index) + (0.2 if passage_index == 0 else 0.0)
+            scores.append(overlap + prior)
+            overlaps.append(overlap)
+
+        return scores, overlaps
@@ -0,0 +1,135 @@
+import hashlib
+import re
+from functools import lru_cache
+from typing import Any, Dict, List, Optional, Set, Tuple
+from urllib.parse import parse_qsl, urlencode, urlsplit
+
+from services.lazy_import import lazy_import
+
+np = lazy_import("numpy")
+
+TOKEN_PATTERN = re.compile(r"\w+")
+
+# Query parameters that only track the referrer and never change the page
+TRACKING_PARAMS = {
+    "fbclid", "gclid", "dclid", "msclkid", "mc_cid", "mc_eid", "igshid",
+    "ref", "ref_src", "ref_url", "cmpid", "ocid", "ncid"
+}
+TRACKING_PREFIXES = ("utm_",)
+HOST_PREFIXES = ("www.", "m.", "mobile.", "amp.")
+
+SIMHASH_BITS = 64
+
+
+@lru_cache(maxsize=1)
+def _bit_shifts():
+    return np.arange(SIMHASH_BITS, dtype=np.uint64)
+
+
+def canonicalize_url(url: str) -> str:
+    """Collapse scheme, www/mobile hosts, default ports, tracking params, fragments and trailing slashes"""
+
+    try:
+        parts = urlsplit(url.strip())
+    except ValueError:
+        return url.strip().lower()
+
+    host = (parts.hostname or "").lower().rstrip(".")
+    for prefix in HOST_PREFIXES:
+        if host.startswith(prefix):
+            host = host[len(prefix):]
+            break
+
+    port = parts.port
+    if port and port not in (80, 443):
+        host = f"{host}:{port}"
+
+    path = re.sub(r"/{2,}", "/", parts.path or "/")
+    path = re.sub(r"(/amp|/index\.html?)$", "", path).rstrip("/") or "/"
+
+    params = sorted(
+        (key, value) for key, value in parse_qsl(parts.query, keep_blank_values=True)
+        if key.lower() not in TRACKING_PARAMS and not key.lower().startswith(TRACKING_PREFIXES)
+    )
+    query = f"?{urlencode(params)}" if params else ""
+
+    # Scheme is deliberately dropped so http/https variants collide
+    return f"{host}{path}{query}"
+
+
+def simhash(text: str, shingle_size: int = 3, max_tokens: int = 2000) -> Optional[int]:
+    """64-bit SimHash over word shingles (None when the text is too short to fingerprint)"""
+
+    tokens = TOKEN_PATTERN.findall(text.lower())[:max_tokens]
+    if len(tokens) < shingle_size:
+        return None
+
+    shingles = {" ".join(tokens[i:i + shingle_size]) for i in range(len(tokens) - shingle_size + 1)}
+    hashes = np.fromiter(
+        (int.from_bytes(hashlib.blake2b(shingle.encode(), digest_size=8).digest(), "little") for shingle in shingles),
+        dtype=np.uint64,
+        count=len(shingles)
+    )
+
+    # Majority vote per bit position across all shingle hashes
+    bits = (hashes[:, None] >> _bit_shifts()) & np.uint64(1)
+    votes = bits.sum(axis=0, dtype=np.int64) * 2 - len(hashes)
+    fingerprint = 0
+    for position in np.flatnonzero(votes > 0):
+        fingerprint |= 1 << int(position)
+    return fingerprint
+
+
+class NearDuplicateDetector:
+    """Single-pass duplicate filter over ranked results.
+
+    Results must arrive best-first: the first member of each cluster is kept.
+    Exact duplicates are caught by canonical URL; near-duplicate content by
+    SimHash Hamming distance, using band buckets (pigeonhole on
+    `max_distance + 1` bands) so each lookup only compares against the few
+    kept fingerprints that share a band.
+    """
+
+    def __init__(self, max_distance: int = 6, min_tokens: int = 20, max_tokens: int = 2000):
+        self.max_distance = max_distance
+        self.min_tokens = min_tokens
+        self.max_tokens = max_tokens
+        self.bands = max_distance + 1
+        self.band_bits = SIMHASH_BITS // self.bands
+
+    def _band_keys(self, fingerprint: int) -> List[Tuple[int, int]]:
+        mask = (1 << self.band_bits) - 1
+        return [(band, (fingerprint >> (band * self.band_bits)) & mask) for band in range(self.bands)]
+
+    def deduplicate(self, results: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        seen_urls: Set[str] = set()
+        buckets: Dict[Tuple[int, int], List[int]] = {}
+        unique = []
+
+        for result in results:
+            url = result.get('url', '')
+            if not url:
+                continue
+
+            canonical = canonicalize_url(url)
+            if canonical in seen_urls:
+                continue
+
+            content = result.get('content', '')
+            fingerprint = None
+            if len(content.split()) >= self.min_tokens:
+                fingerprint = simhash(content, max_tokens=self.max_tokens)
+
+            if fingerprint is not None:
+                band_keys = self._band_keys(fingerprint)
+                candidates = {kept for key in band_keys for kept in buckets.get(key, ())}
+                if any(bin(fingerprint ^ kept).count("1") <= self.max_distance for kept in candidates):
+                    continue
+
+                for key in band_keys:
+                    buckets.setdefault(key, []).append(fingerprint)
+
+            seen_urls.add(canonical)
+            unique.append(result)
+
+        return unique
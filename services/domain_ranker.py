@@ -0,0 +1,98 @@
+import json
+from functools import lru_cache
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import urlsplit
+
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class DomainRanker:
+    """Domain reputation lookup backed by a hashed suffix index.
+
+    Rules are keyed by registrable domain (or any suffix such as "gov.uk") and
+    optionally a path prefix ("skysports.com/cricket"). A lookup walks the
+    host's label suffixes from most to least specific, so its cost depends on
+    the number of labels in the host, not on the number of rules.
+    """
+
+    def __init__(self, weights: Dict[str, float]):
+        self._host_weights: Dict[str, float] = {}
+        self._path_weights: Dict[str, List[Tuple[str, float]]] = {}
+
+        for rule, weight in weights.items():
+            host, _, path = rule.strip().lower().partition('/')
+            host = host.strip('.')
+            if not host:
+                continue
+
+            if path:
+                self._path_weights.setdefault(host, []).append(('/' + path.strip('/'), float(weight)))
+            else:
+                self._host_weights[host] = float(weight)
+
+        # Longest path prefix first so the most specific rule matches
+        for rules in self._path_weights.values():
+            rules.sort(key=lambda rule: len(rule[0]), reverse=True)
+
+        self._host_lookup = lru_cache(maxsize=4096)(self._lookup_host)
+
+    @classmethod
+    def from_file(cls, path: str) -> "DomainRanker":
+        try:
+            with open(path, encoding="utf-8") as weights_file:
+                config = json.load(weights_file)
+        except (OSError, json.JSONDecodeError) as e:
+            logger.error(f"Failed to load domain weights from '{path}': {e}")
+            return cls({})
+
+        ranker = cls(config.get("domains", {}))
+        logger.info(f"Loaded {len(ranker)} domain reputation rules")
+        return ranker
+
+    def __len__(self) -> int:
+        return len(self._host_weights) + sum(len(rules) for rules in self._path_weights.values())
+
+    def score_url(self, url: str) -> float:
+        """Reputation bonus for a URL (0.0 when no rule matches)"""
+        try:
+            parts = urlsplit(url)
+        except ValueError:
+            return 0.0
+
+        host = (parts.hostname or '').rstrip('.')
+        if not host:
+            return 0.0
+
+        weight, path_hosts = self._host_lookup(host)
+
+        # Path-scoped rules ("skysports.com/cricket") take precedence over host rules
+        for path_host in path_hosts:
+            path_weight = self._match_path(path_host, parts.path or '/')
+            if path_weight is not None:
+                return path_weight
+
+        return weight
+
+    def _lookup_host(self, host: str) -> Tuple[float, Tuple[str, ...]]:
+        """Return (host weight, suffixes that carry path rules), most specific first"""
+        labels = host.split('.')
+        weight = None
+        path_hosts = []
+
+        for i in range(len(labels)):
+            suffix = '.'.join(labels[i:])
+            if suffix in self._path_weights:
+                path_hosts.append(suffix)
+            if weight is None:
+                weight = self._host_weights.get(suffix)
+
+        return weight or 0.0, tuple(path_hosts)
+
+    def _match_path(self, host: str, path: str) -> Optional[float]:
+        path = path.lower().rstrip('/') or '/'
+        for prefix, weight in self._path_weights[host]:
+            if path == prefix or path.startswith(prefix + '/'):
+                return weight
+        return None
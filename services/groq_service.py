@@ -1,52 +1,57 @@
 import json
-from groq import AsyncGroq
-from langchain_community.callbacks.flyte_callback import analyze_text
+from typing import Optional
 
 from config.settings import settings
 from models.schemas import QueryAnalysis, QueryType
+from services.prompt_builder import PromptBuilder
+from services.llm_gateway import LLMGateway
+from services.metrics import GROQ_ANALYSIS, UPSTREAM_ERRORS
 import logging
 
 logger = logging.getLogger(__name__)
 
+
+class AnalysisUnavailable(Exception):
+    """Groq could not produce an analysis; callers fall back to `GroqService.fallback_analysis`"""
+
+
 class GroqService:
-    def __init__(self):
-        self.client = AsyncGroq(api_key=settings.GROQ_API_KEY)
-        self.model = "openai/gpt-oss-120b"
+    def __init__(self, llm_gateway: Optional[LLMGateway] = None):
+        # Shared gateway (normally injected by the app lifespan)
+        self.llm_gateway = llm_gateway
+        self._owns_gateway = False
+        self.model = settings.groq_model
+        self.prompt_builder = PromptBuilder()
+
+    def _get_gateway(self) -> LLMGateway:
+        """Return the shared gateway, creating a private one if none was injected"""
+        if self.llm_gateway is None:
+            self.llm_gateway = LLMGateway()
+            self._owns_gateway = True
+        return self.llm_gateway
+
+    async def aclose(self):
+        """Close the gateway if this service created it"""
+        if self._owns_gateway and self.llm_gateway is not None:
+            await self.llm_gateway.aclose()
+            self.llm_gateway = None
+            self._owns_gateway = False
 
     async def analyze_query(self, query: str) -> QueryAnalysis:
-        """Analyze user query to understand intent and generate search strategy"""
-
-        prompt = f"""
-                You are an expert query analyzer for a search engine. Analyze the following user query and provide a structured response.
-
-                Query: "{query}"
-
-                Provide analysis in this EXACT JSON format:
-                {{
-                    "query_type": "factual|comparison|how_to|current_events|opinion|calculation",
-                    "search_intent": "Clear description of what user wants to know",
-                    "key_entities": ["entity1", "entity2", "entity3"],
-                    "suggested_searches": ["search_term_1", "search_term_2", "search_term_3"],
-                    "complexity_score": 1-10,
-                    "requires_real_time": true/false
-                }}
-
-                Rules:
-                - complexity_score: 1-3 (simple facts), 4-6 (moderate research), 7-10 (complex multi-step)
-                - requires_real_time: true if query needs current/recent information
-                - suggested_searches: 3 optimized search terms for web search
-                - key_entities: important nouns, concepts, or topics from the query
-                """
+        """Analyze user query to understand intent and generate search strategy.
+
+        Raises AnalysisUnavailable when Groq fails or returns an unusable analysis.
+        """
+
         try:
-            response = await self.client.chat.completions.create(
-                model=self.model,
-                messages=[
-                    {'role': "system", 'content': "You are a query analysis expert. Always respond with valid JSON only."},
-                    {'role': 'user', 'content': prompt}
-                ],
-                temperature=0.1, # Low temperature for consistent analysis
-                max_tokens=500
-            )
+            with GROQ_ANALYSIS.time():
+                response = await self._get_gateway().complete(
+                    "analysis",
+                    model=self.model,
+                    messages=self.prompt_builder.analysis_messages(query),
+                    temperature=0.1, # Low temperature for consistent analysis
+                    max_tokens=500
+                )
 
             analysis_text = response.choices[0].message.content.strip()
 
@@ -57,14 +62,16 @@ class GroqService:
             return QueryAnalysis(**analysis_data)
 
         except json.JSONDecodeError as e:
+            UPSTREAM_ERRORS.labels("groq", "invalid_json").inc()
             logger.error(f"Error parsing query: {e}")
-            return self._create_fall_back_analysis(query)
+            raise AnalysisUnavailable(str(e)) from e
 
         except Exception as e:
+            UPSTREAM_ERRORS.labels("groq", type(e).__name__).inc()
             logger.error(f"Grok API error: {e}")
-            return self._create_fall_back_analysis(query)
+            raise AnalysisUnavailable(str(e)) from e
 
-    def _create_fall_back_analysis(self, query: str) -> QueryAnalysis:
+    def fallback_analysis(self, query: str) -> QueryAnalysis:
         """Create basic analysis when Groq fails"""
         return QueryAnalysis(
             query_type=QueryType.FACTUAL,
@@ -0,0 +1,86 @@
+import asyncio
+from typing import Callable, Dict, Optional
+
+import httpx
+from config.settings import settings
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class _ReleasingStream(httpx.AsyncByteStream):
+    """Response body wrapper that frees the host slot once the body is closed"""
+
+    def __init__(self, stream: httpx.AsyncByteStream, release: Callable[[], None]):
+        self._stream = stream
+        self._release = release
+        self._released = False
+
+    async def __aiter__(self):
+        async for chunk in self._stream:
+            yield chunk
+
+    async def aclose(self) -> None:
+        try:
+            await self._stream.aclose()
+        finally:
+            if not self._released:
+                self._released = True
+                self._release()
+
+
+class PerHostLimitTransport(httpx.AsyncHTTPTransport):
+    """HTTP transport that caps concurrent in-flight requests per upstream host"""
+
+    def __init__(self, max_per_host: int, **kwargs):
+        super().__init__(**kwargs)
+        self.max_per_host = max_per_host
+        self._semaphores: Dict[str, asyncio.Semaphore] = {}
+
+    def _semaphore_for(self, host: str) -> asyncio.Semaphore:
+        semaphore = self._semaphores.get(host)
+        if semaphore is None:
+            semaphore = asyncio.Semaphore(self.max_per_host)
+            self._semaphores[host] = semaphore
+        return semaphore
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        semaphore = self._semaphore_for(request.url.host)
+        await semaphore.acquire()
+
+        try:
+            response = await super().handle_async_request(request)
+        except BaseException:
+            semaphore.release()
+            raise
+
+        # Hold the slot until the body has been consumed and closed
+        response.stream = _ReleasingStream(response.stream, semaphore.release)
+        return response
+
+
+def create_http_client(timeout: Optional[float] = None) -> httpx.AsyncClient:
+    """Build the process-wide pooled HTTP client for upstream APIs"""
+
+    limits = httpx.Limits(
+        max_connections=settings.http_max_connections,
+        max_keepalive_connections=settings.http_max_keepalive_connections,
+        keepalive_expiry=settings.http_keepalive_expiry
+    )
+
+    transport = PerHostLimitTransport(
+        max_per_host=settings.http_max_connections_per_host,
+        http2=settings.http2_enabled,
+        limits=limits
+    )
+
+    logger.info(
+        f"Creating shared HTTP client (http2={settings.http2_enabled}, "
+        f"max_connections={settings.http_max_connections}, "
+        f"per_host={settings.http_max_connections_per_host})"
+    )
+
+    return httpx.AsyncClient(
+        transport=transport,
+        timeout=timeout if timeout is not None else settings.http_timeout
+    )
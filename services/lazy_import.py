@@ -0,0 +1,41 @@
+import importlib
+from typing import Any, Iterable
+
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Modules that are slow to import and only needed once requests flow
+HEAVY_MODULES = ("numpy", "groq")
+
+
+class LazyModule:
+    """Stand-in for a module that is imported on first attribute access.
+
+    After the import the module's namespace is copied onto the proxy, so later
+    attribute lookups are plain dictionary hits rather than __getattr__ calls.
+    """
+
+    def __init__(self, name: str):
+        self._lazy_name = name
+
+    def __getattr__(self, attribute: str) -> Any:
+        module = importlib.import_module(self._lazy_name)
+        self.__dict__.update(module.__dict__)
+        return getattr(module, attribute)
+
+    def __repr__(self) -> str:
+        return f"<lazy module '{self._lazy_name}'>"
+
+
+def lazy_import(name: str) -> Any:
+    return LazyModule(name)
+
+
+def preload(modules: Iterable[str] = HEAVY_MODULES):
+    """Import modules ahead of use (run off the event loop so startup isn't blocked)"""
+    for name in modules:
+        try:
+            importlib.import_module(name)
+        except ImportError as e:
+            logger.warning(f"Could not preload '{name}': {e}")
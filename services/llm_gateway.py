@@ -0,0 +1,197 @@
+import asyncio
+import random
+import time
+from typing import Any, AsyncIterator, Optional
+
+import httpx
+
+from config.settings import settings
+from services.lazy_import import lazy_import
+from services.metrics import LLM_IN_FLIGHT, LLM_QUEUE_DEPTH, LLM_QUEUE_WAIT, LLM_RETRIES
+import logging
+
+logger = logging.getLogger(__name__)
+
+# The Groq SDK is slow to import; it loads with the first call (or the startup preload)
+groq = lazy_import("groq")
+
+
+class LLMOverloadedError(Exception):
+    """Raised when a call waited longer than the queue timeout for a slot"""
+
+
+class TokenBucket:
+    """Async token bucket: `rate` tokens per second, bursts of up to `capacity`"""
+
+    def __init__(self, rate: float, capacity: float):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated = time.monotonic()
+        self._lock = asyncio.Lock()   # waiters are served in arrival order
+
+    def _refill(self):
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    async def acquire(self):
+        async with self._lock:
+            while True:
+                self._refill()
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                await asyncio.sleep((1 - self.tokens) / self.rate)
+
+    def try_acquire(self, tokens: float = 1) -> bool:
+        """Take `tokens` now if they are available, without waiting"""
+        self._refill()
+        if self.tokens < tokens:
+            return False
+        self.tokens -= tokens
+        return True
+
+
+class LLMGateway:
+    """Single entry point for Groq chat completions.
+
+    Owns the one AsyncGroq client of the process and puts every call through
+    a token bucket (the account's request quota) and a semaphore (concurrent
+    calls). Calls that cannot get a slot within `queue_timeout` fail fast with
+    LLMOverloadedError, and 429/5xx/connection errors are retried with
+    exponential backoff, honouring Retry-After when Groq sends it. Every
+    retry takes another token from the bucket, so retries count against the
+    quota too.
+    """
+
+    def __init__(self,
+                 http_client: Optional[httpx.AsyncClient] = None,
+                 max_concurrency: Optional[int] = None,
+                 requests_per_minute: Optional[float] = None,
+                 burst: Optional[int] = None,
+                 max_retries: Optional[int] = None,
+                 queue_timeout: Optional[float] = None):
+        self.http_client = http_client
+        self.client = None   # AsyncGroq, created on first use
+        self.model = settings.groq_model
+        self._owns_http_client = http_client is None
+
+        self.max_concurrency = max_concurrency or settings.llm_max_concurrency
+        self.semaphore = asyncio.Semaphore(self.max_concurrency)
+        self.queued = 0      # calls waiting for a slot
+        self.in_flight = 0   # calls holding a slot
+        self.rate_limiter = TokenBucket(
+            rate=(requests_per_minute or settings.llm_requests_per_minute) / 60,
+            capacity=burst or settings.llm_burst
+        )
+        self.max_retries = settings.llm_max_retries if max_retries is None else max_retries
+        self.backoff_base = settings.llm_backoff_base
+        self.backoff_max = settings.llm_backoff_max
+        self.queue_timeout = queue_timeout or settings.llm_queue_timeout
+
+    def _get_client(self):
+        if self.client is None:
+            # The SDK's own retries are disabled so the gateway's policy is the only one
+            self.client = groq.AsyncGroq(
+                api_key=settings.GROQ_API_KEY,
+                base_url=settings.groq_base_url,
+                http_client=self.http_client,
+                max_retries=0
+            )
+        return self.client
+
+    async def aclose(self):
+        """Close the Groq client unless it runs on a shared, injected HTTP client"""
+        if self.client is not None and self._owns_http_client:
+            await self.client.close()
+
+    async def complete(self, operation: str, **kwargs) -> Any:
+        """Non-streaming chat completion"""
+        await self._acquire(operation)
+        try:
+            return await self._create_with_retries(operation, **kwargs)
+        finally:
+            self._release()
+
+    async def stream(self, operation: str, **kwargs) -> AsyncIterator[Any]:
+        """Streaming chat completion; the slot is held until the stream is consumed or closed.
+
+        Only opening the stream is retried: once chunks have been yielded a
+        failure is passed to the caller.
+        """
+        await self._acquire(operation)
+        stream = None
+        try:
+            stream = await self._create_with_retries(operation, stream=True, **kwargs)
+            async for chunk in stream:
+                yield chunk
+        finally:
+            try:
+                # An abandoned stream would otherwise keep its connection checked out
+                if stream is not None:
+                    await stream.close()
+            finally:
+                self._release()
+
+    async def _acquire(self, operation: str):
+        queued_at = time.perf_counter()
+        self.queued += 1
+        LLM_QUEUE_DEPTH.inc()
+        try:
+            await asyncio.wait_for(self._wait_for_slot(), self.queue_timeout)
+        except asyncio.TimeoutError:
+            raise LLMOverloadedError(f"No LLM slot for '{operation}' within {self.queue_timeout:.1f}s")
+        finally:
+            self.queued -= 1
+            LLM_QUEUE_DEPTH.dec()
+            LLM_QUEUE_WAIT.labels(operation).observe(time.perf_counter() - queued_at)
+        self.in_flight += 1
+        LLM_IN_FLIGHT.inc()
+
+    async def _wait_for_slot(self):
+        await self.rate_limiter.acquire()
+        await self.semaphore.acquire()
+
+    def _release(self):
+        self.in_flight -= 1
+        LLM_IN_FLIGHT.dec()
+        self.semaphore.release()
+
+    async def _create_with_retries(self, operation: str, **kwargs) -> Any:
+        kwargs.setdefault("model", self.model)
+        client = self._get_client()
+        attempt = 0
+
+        while True:
+            try:
+                return await client.chat.completions.create(**kwargs)
+
+            except groq.APIStatusError as e:
+                if (e.status_code != 429 and e.status_code < 500) or attempt >= self.max_retries:
+                    raise
+                reason = str(e.status_code)
+                delay = self._retry_after(e.response) or self._backoff(attempt)
+
+            except groq.APIConnectionError as e:
+                if attempt >= self.max_retries:
+                    raise
+                reason = type(e).__name__
+                delay = self._backoff(attempt)
+
+            attempt += 1
+            LLM_RETRIES.labels(operation, reason).inc()
+            logger.warning(f"Groq {operation} failed ({reason}), retry {attempt}/{self.max_retries} in {delay:.2f}s")
+            await asyncio.sleep(delay)
+            # The slot is still held; only the quota has to be paid again
+            await self.rate_limiter.acquire()
+
+    def _backoff(self, attempt: int) -> float:
+        """Exponential backoff with full jitter"""
+        return random.uniform(0, min(self.backoff_max, self.backoff_base * 2 ** attempt))
+
+    def _retry_after(self, response: httpx.Response) -> Optional[float]:
+        try:
+            return min(self.backoff_max, float(response.headers.get("retry-after")))
+        except (TypeError, ValueError):
+            return None
@@ -0,0 +1,259 @@
+import asyncio
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+from config.settings import settings
+from services.deduplicator import canonicalize_url
+from services.text_utils import content_terms, parse_published_date
+import logging
+
+logger = logging.getLogger(__name__)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS documents (
+    id INTEGER PRIMARY KEY,
+    url_key TEXT NOT NULL UNIQUE,
+    url TEXT NOT NULL,
+    title TEXT NOT NULL,
+    content TEXT NOT NULL,
+    score REAL NOT NULL,
+    published_date TEXT,
+    published_at REAL,
+    fetched_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS documents_fetched_at ON documents (fetched_at);
+CREATE VIRTUAL TABLE IF NOT EXISTS documents_fts USING fts5(
+    title, content, content='documents', content_rowid='id'
+);
+CREATE TRIGGER IF NOT EXISTS documents_ai AFTER INSERT ON documents BEGIN
+    INSERT INTO documents_fts (rowid, title, content) VALUES (new.id, new.title, new.content);
+END;
+CREATE TRIGGER IF NOT EXISTS documents_ad AFTER DELETE ON documents BEGIN
+    INSERT INTO documents_fts (documents_fts, rowid, title, content) VALUES ('delete', old.id, old.title, old.content);
+END;
+CREATE TRIGGER IF NOT EXISTS documents_au AFTER UPDATE ON documents BEGIN
+    INSERT INTO documents_fts (documents_fts, rowid, title, content) VALUES ('delete', old.id, old.title, old.content);
+    INSERT INTO documents_fts (rowid, title, content) VALUES (new.id, new.title, new.content);
+END;
+"""
+
+
+def _published_at(published_date: Optional[str]) -> Optional[float]:
+    published = parse_published_date(published_date)
+    return published.timestamp() if published is not None else None
+
+
+def match_expression(term: str, near_distance: int, min_tokens: int) -> Optional[str]:
+    """FTS5 query requiring every significant word of the term within `near_distance` tokens of each other.
+
+    None when the term has fewer than `min_tokens` significant words: "what
+    is java" is one word, which any page mentioning Java would match.
+    """
+    tokens = list(dict.fromkeys(content_terms(term)))
+    if len(tokens) < min_tokens:
+        return None
+    phrase = " ".join(f'"{token}"' for token in tokens)
+    return f"NEAR({phrase}, {near_distance})"
+
+
+class LocalCorpus:
+    """Persistent full-text index of every search result fetched from Tavily.
+
+    Results are stored once per canonical URL (a refetch updates the row and
+    its fetch time) in a SQLite table mirrored by an FTS5 index, so a search
+    term can be answered locally with BM25-ranked documents containing all of
+    its significant words. Lookups filter on fetch age and, for real-time
+    queries, on published date. The oldest fetches are pruned beyond
+    `max_documents`.
+
+    A term is only answered locally when it has at least `min_tokens`
+    significant words, they all occur within `near_distance` tokens of each
+    other, and the document's BM25 score reaches `min_score`.
+    """
+
+    def __init__(self,
+                 path: str,
+                 max_documents: int,
+                 near_distance: int = 10,
+                 min_tokens: int = 3,
+                 min_score: float = 2.0):
+        self.path = path
+        self.max_documents = max_documents
+        self.near_distance = near_distance
+        self.min_tokens = min_tokens
+        self.min_score = min_score
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(SCHEMA)
+        self._conn.commit()
+        self._documents = self._conn.execute("SELECT count(*) FROM documents").fetchone()[0]
+
+        self.lookups = 0
+        self.covered_terms = 0
+        self.documents_written = 0
+        self.errors = 0
+
+    def _add(self, results: List[Dict[str, Any]]):
+        now = time.time()
+        rows = [
+            (
+                canonicalize_url(result['url']),
+                result['url'],
+                result.get('title') or '',
+                result.get('content') or '',
+                float(result.get('score') or 0.0),
+                result.get('published_date'),
+                _published_at(result.get('published_date')),
+                now
+            )
+            for result in results
+            if result.get('url') and result.get('content')
+        ]
+        if not rows:
+            return
+
+        keys = [row[0] for row in rows]
+        with self._lock:
+            try:
+                existing = self._conn.execute(
+                    f"SELECT count(*) FROM documents WHERE url_key IN ({','.join('?' * len(keys))})", keys
+                ).fetchone()[0]
+                self._conn.executemany(
+                    "INSERT INTO documents (url_key, url, title, content, score, published_date, published_at, fetched_at) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?, ?) "
+                    "ON CONFLICT (url_key) DO UPDATE SET url = excluded.url, title = excluded.title, "
+                    "content = excluded.content, score = excluded.score, published_date = excluded.published_date, "
+                    "published_at = excluded.published_at, fetched_at = excluded.fetched_at",
+                    rows
+                )
+                documents = self._documents + len(set(keys)) - existing
+
+                # Drop the least recently fetched documents beyond capacity
+                excess = documents - self.max_documents
+                if excess > 0:
+                    self._conn.execute(
+                        "DELETE FROM documents WHERE id IN (SELECT id FROM documents ORDER BY fetched_at LIMIT ?)",
+                        (excess,)
+                    )
+                    documents -= excess
+                self._conn.commit()
+            except sqlite3.Error:
+                self._conn.rollback()
+                raise
+            self._documents = documents
+
+        self.documents_written += len(rows)
+
+    def _search(self, term: str, limit: int, max_age: float, max_published_age: Optional[float]) -> List[Dict[str, Any]]:
+        expression = match_expression(term, self.near_distance, self.min_tokens)
+        if expression is None:
+            return []
+
+        # bm25() is negative, lower is better
+        now = time.time()
+        sql = (
+            "SELECT d.title, d.url, d.content, d.score, d.published_date FROM documents_fts "
+            "JOIN documents d ON d.id = documents_fts.rowid "
+            "WHERE documents_fts MATCH ? AND bm25(documents_fts, 2.0, 1.0) <= ? AND d.fetched_at >= ?"
+        )
+        params: List[Any] = [expression, -self.min_score, now - max_age]
+        if max_published_age is not None:
+            sql += " AND d.published_at >= ?"
+            params.append(now - max_published_age)
+        sql += " ORDER BY bm25(documents_fts, 2.0, 1.0) LIMIT ?"
+        params.append(limit)
+
+        with self._lock:
+            rows = self._conn.execute(sql, params).fetchall()
+
+        return [
+            {"title": title, "url": url, "content": content, "score": score, "published_date": published_date}
+            for title, url, content, score, published_date in rows
+        ]
+
+    async def add(self, results: List[Dict[str, Any]]):
+        """Index fetched results (a failed write only costs future local hits)"""
+        try:
+            await asyncio.to_thread(self._add, results)
+        except sqlite3.Error as e:
+            self.errors += 1
+            logger.warning(f"Local corpus write failed: {e}")
+
+    def _cover(self,
+               terms: List[str],
+               limit: int,
+               min_matches: int,
+               max_age: float,
+               max_published_age: Optional[float]) -> Tuple[List[Dict[str, Any]], List[str]]:
+        results: List[Dict[str, Any]] = []
+        covered: List[str] = []
+        for term in terms:
+            documents = self._search(term, limit, max_age, max_published_age)
+            if len(documents) >= min_matches:
+                covered.append(term)
+                results.extend(documents)
+        return results, covered
+
+    async def cover(self,
+                    terms: List[str],
+                    limit: int,
+                    min_matches: int,
+                    max_age: float,
+                    max_published_age: Optional[float] = None) -> Tuple[List[Dict[str, Any]], List[str]]:
+        """Return (local results, terms they cover) for the terms with at least `min_matches` fresh documents.
+
+        Results use Tavily's result format, so they merge with fetched ones.
+        """
+        try:
+            results, covered = await asyncio.to_thread(
+                self._cover, terms, limit, min_matches, max_age, max_published_age
+            )
+        except sqlite3.Error as e:
+            self.errors += 1
+            logger.warning(f"Local corpus lookup failed: {e}")
+            return [], []
+
+        self.lookups += len(terms)
+        self.covered_terms += len(covered)
+        return results, covered
+
+    async def close(self):
+        with self._lock:
+            self._conn.close()
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "documents": self._documents,
+            "lookups": self.lookups,
+            "covered_terms": self.covered_terms,
+            "coverage_rate": self.covered_terms / self.lookups if self.lookups else 0.0,
+            "documents_written": self.documents_written,
+            "errors": self.errors
+        }
+
+
+def build_local_corpus() -> Optional[LocalCorpus]:
+    """Create the local corpus described by settings (None when disabled or unavailable)"""
+
+    if not settings.local_corpus_enabled:
+        return None
+
+    try:
+        return LocalCorpus(
+            settings.local_corpus_path,
+            settings.local_corpus_max_documents,
+            near_distance=settings.local_corpus_near_distance,
+            min_tokens=settings.local_corpus_min_tokens,
+            min_score=settings.local_corpus_min_score
+        )
+    except sqlite3.Error as e:
+        # e.g. a SQLite build without FTS5
+        logger.warning(f"Local corpus unavailable, searching Tavily only: {e}")
+        return None
@@ -0,0 +1,107 @@
+from typing import Any, Callable, Dict
+
+from prometheus_client import Counter, Gauge, Histogram, REGISTRY
+from prometheus_client.core import GaugeMetricFamily
+
+# Latency buckets (seconds) covering sub-millisecond CPU work up to slow LLM calls
+LATENCY_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 20.0, 30.0)
+
+STAGE_DURATION = Histogram(
+    "perplexity_stage_duration_seconds",
+    "Time spent in each pipeline stage",
+    ["stage"],
+    buckets=LATENCY_BUCKETS
+)
+
+TAVILY_CALL_DURATION = Histogram(
+    "perplexity_tavily_call_duration_seconds",
+    "Duration of individual Tavily search calls",
+    buckets=LATENCY_BUCKETS
+)
+
+GROQ_DURATION = Histogram(
+    "perplexity_groq_duration_seconds",
+    "Total duration of Groq completions",
+    ["operation"],
+    buckets=LATENCY_BUCKETS
+)
+
+GROQ_TIME_TO_FIRST_TOKEN = Histogram(
+    "perplexity_groq_time_to_first_token_seconds",
+    "Time until the first streamed Groq token arrives",
+    buckets=LATENCY_BUCKETS
+)
+
+LLM_QUEUE_WAIT = Histogram(
+    "perplexity_llm_queue_wait_seconds",
+    "Time LLM calls wait for the rate limiter and a concurrency slot",
+    ["operation"],
+    buckets=LATENCY_BUCKETS
+)
+
+LLM_QUEUE_DEPTH = Gauge(
+    "perplexity_llm_queue_depth",
+    "LLM calls waiting for a slot"
+)
+
+LLM_IN_FLIGHT = Gauge(
+    "perplexity_llm_in_flight",
+    "LLM calls currently holding a slot"
+)
+
+LLM_RETRIES = Counter(
+    "perplexity_llm_retries_total",
+    "LLM calls retried after a retryable error",
+    ["operation", "reason"]
+)
+
+IN_FLIGHT_REQUESTS = Gauge(
+    "perplexity_in_flight_requests",
+    "Requests currently being processed",
+    ["endpoint"]
+)
+
+UPSTREAM_ERRORS = Counter(
+    "perplexity_upstream_errors_total",
+    "Errors returned by upstream APIs",
+    ["service", "kind"]
+)
+
+# Pre-bound children keep label lookups off the request path
+ANALYSIS_STAGE = STAGE_DURATION.labels("analysis")
+SEARCH_STAGE = STAGE_DURATION.labels("search")
+DEDUPE_RANK_STAGE = STAGE_DURATION.labels("dedupe_rank")
+RERANK_STAGE = STAGE_DURATION.labels("rerank")
+PROMPT_BUILD_STAGE = STAGE_DURATION.labels("prompt_build")
+SYNTHESIS_STAGE = STAGE_DURATION.labels("synthesis")
+SERIALIZATION_STAGE = STAGE_DURATION.labels("serialization")
+
+GROQ_ANALYSIS = GROQ_DURATION.labels("analysis")
+GROQ_SYNTHESIS = GROQ_DURATION.labels("synthesis")
+
+
+class StatsCollector:
+    """Exposes the services' in-process counters (cache hit rates etc.) at scrape time"""
+
+    def __init__(self, stats_provider: Callable[[], Dict[str, Any]]):
+        self.stats_provider = stats_provider
+
+    def collect(self):
+        family = GaugeMetricFamily(
+            "perplexity_component_stat",
+            "Counters and ratios reported by service components",
+            labels=["component", "stat"]
+        )
+
+        for component, stats in self.stats_provider().items():
+            if not isinstance(stats, dict):
+                continue
+            for stat, value in stats.items():
+                if isinstance(value, (int, float)) and not isinstance(value, bool):
+                    family.add_metric([component, stat], float(value))
+
+        yield family
+
+
+def register_stats_provider(stats_provider: Callable[[], Dict[str, Any]]):
+    REGISTRY.register(StatsCollector(stats_provider))
@@ -0,0 +1,66 @@
+import heapq
+import re
+from typing import Iterator, List, Set, Tuple
+
+from services.text_utils import content_terms, tokenize
+
+# Paragraphs are separated by blank lines or line breaks in Tavily raw_content
+PARAGRAPH_PATTERN = re.compile(r"[^\n]+(?:\n(?!\s*\n)[^\n]+)*")
+
+
+class PassageExtractor:
+    """Pulls the query-relevant passages out of a full page body.
+
+    The page is scanned one paragraph at a time (lazily, via finditer) and only
+    the best `max_passages` are kept in a bounded heap, so memory stays flat no
+    matter how long the page is. Passages without any query term are dropped.
+    """
+
+    def __init__(self, max_passages: int = 3, max_chars: int = 1500,
+                 min_passage_chars: int = 80, max_scan_chars: int = 200000):
+        self.max_passages = max_passages
+        self.max_chars = max_chars
+        self.min_passage_chars = min_passage_chars
+        self.max_scan_chars = max_scan_chars
+
+    def extract(self, query: str, raw_content: str) -> str:
+        """Return the selected passages in reading order, joined and capped at max_chars"""
+
+        query_terms = self._query_terms(query)
+        if not query_terms or not raw_content:
+            return ""
+
+        heap: List[Tuple[float, int, str]] = []   # min-heap of (score, position, passage)
+        for position, passage in enumerate(self._iter_passages(raw_content)):
+            score = self._score(query_terms, passage)
+            if score <= 0:
+                continue
+            if len(heap) < self.max_passages:
+                heapq.heappush(heap, (score, -position, passage))
+            elif score > heap[0][0]:
+                heapq.heapreplace(heap, (score, -position, passage))
+
+        selected = [passage for _, _, passage in sorted(heap, key=lambda item: -item[1])]
+
+        extracted = " ... ".join(selected)
+        if len(extracted) > self.max_chars:
+            extracted = extracted[:self.max_chars].rsplit(" ", 1)[0]
+        return extracted
+
+    def _iter_passages(self, raw_content: str) -> Iterator[str]:
+        for match in PARAGRAPH_PATTERN.finditer(raw_content, 0, self.max_scan_chars):
+            passage = " ".join(match.group().split())
+            if len(passage) >= self.min_passage_chars:
+                yield passage
+
+    def _query_terms(self, query: str) -> Set[str]:
+        return set(content_terms(query))
+
+    def _score(self, query_terms: Set[str], passage: str) -> float:
+        terms = tokenize(passage)
+        matched = query_terms.intersection(terms)
+        if not matched:
+            return 0.0
+        # Coverage of distinct query terms dominates; density breaks ties
+        hits = sum(1 for term in terms if term in query_terms)
+        return len(matched) + hits / (len(terms) + 1)
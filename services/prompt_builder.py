@@ -0,0 +1,126 @@
+from textwrap import dedent
+from typing import Any, Dict, List, Optional, Sequence
+
+from models.schemas import QueryAnalysis
+
+# Templates are dedented once at import. Static instructions come first and the
+# per-request parts last, so every request shares the same message prefix and
+# the provider can reuse its cached prefix across requests.
+
+ANALYSIS_SYSTEM = "You are a query analysis expert. Always respond with valid JSON only."
+
+ANALYSIS_INSTRUCTIONS = dedent("""
+    You are an expert query analyzer for a search engine. Analyze the user query below and provide a structured response.
+
+    Provide analysis in this EXACT JSON format:
+    {
+        "query_type": "factual|comparison|how_to|current_events|opinion|calculation",
+        "search_intent": "Clear description of what user wants to know",
+        "key_entities": ["entity1", "entity2", "entity3"],
+        "suggested_searches": ["search_term_1", "search_term_2", "search_term_3"],
+        "complexity_score": 1-10,
+        "requires_real_time": true/false
+    }
+
+    Rules:
+    - complexity_score: 1-3 (simple facts), 4-6 (moderate research), 7-10 (complex multi-step)
+    - requires_real_time: true if query needs current/recent information
+    - suggested_searches: 3 optimized search terms for web search
+    - key_entities: important nouns, concepts, or topics from the query
+""").strip()
+
+ANALYSIS_QUERY = 'Query: "{query}"'
+
+SYNTHESIS_SYSTEM = ("You are an expert research assistant that creates comprehensive, well-cited responses. "
+                    "Always use proper citations and maintain accuracy.")
+
+SYNTHESIS_INSTRUCTIONS = dedent("""
+    You are an expert research assistant. Your task is to synthesize information from multiple sources to answer the user's query comprehensively and accurately.
+
+    **Instructions**:
+    1. **Synthesize** information from the sources to create a comprehensive answer
+    2. **Use proper citations** - Reference sources as [1], [2], etc. throughout your response
+    3. **Be accurate** - Only use information that's clearly supported by the sources
+    4. **Structure well** - Use headers, bullet points, and clear organization
+    5. **Be comprehensive** - Cover all relevant aspects of the query
+    6. **Maintain objectivity** - Present balanced information when there are different viewpoints
+
+    **Response Format**:
+    - Start with a clear, direct answer to the main question
+    - Provide detailed explanation with proper citations
+    - Use markdown formatting for better readability
+    - Include relevant examples, comparisons, or additional context
+    - End with a brief summary if the response is long
+
+    **Citation Rules**:
+    - Cite sources immediately after relevant statements: "Quantum computers use qubits[1][3]"
+    - Use multiple citations when information comes from multiple sources
+    - Never make claims without citing sources
+    - Ensure every major fact or claim has proper citation
+""").strip()
+
+SYNTHESIS_QUERY = dedent("""
+    **User Query**: "{query}"
+
+    **Query Analysis**:
+    - Type: {query_type}
+    - Intent: {search_intent}
+    - Complexity: {complexity_score}/10
+
+    **Available Sources**:
+""").strip()
+
+HISTORY_HEADER = "**Conversation So Far** (earlier questions in this session, for context only):"
+HISTORY_TURN_TEMPLATE = "Q: {query}\nA: {answer}"
+
+SOURCE_TEMPLATE = "Source [{id}]: {title}\nURL: {url}\nContent: {content}"
+SOURCE_SEPARATOR = "\n\n---\n\n"
+
+SYNTHESIS_CLOSING = "Generate a comprehensive, well-cited response:"
+
+
+class PromptBuilder:
+    """Assembles the analysis and synthesis prompts from the precompiled templates"""
+
+    def analysis_messages(self, query: str) -> List[Dict[str, str]]:
+        prompt = "\n\n".join([ANALYSIS_INSTRUCTIONS, ANALYSIS_QUERY.format(query=query)])
+        return [
+            {"role": "system", "content": ANALYSIS_SYSTEM},
+            {"role": "user", "content": prompt}
+        ]
+
+    def synthesis_prompt(self,
+                         query: str,
+                         analysis: QueryAnalysis,
+                         sources: List[Dict[str, Any]],
+                         history: Optional[Sequence[Any]] = None) -> str:
+        """`history` holds earlier turns of the conversation (objects with .query and .answer)"""
+        header = SYNTHESIS_QUERY.format(
+            query=query,
+            query_type=analysis.query_type,
+            search_intent=analysis.search_intent,
+            complexity_score=analysis.complexity_score
+        )
+        sources_text = SOURCE_SEPARATOR.join(
+            SOURCE_TEMPLATE.format(
+                id=source['id'],
+                title=source['title'],
+                url=source['url'],
+                content=source['content']
+            )
+            for source in sources
+        )
+        sections = [SYNTHESIS_INSTRUCTIONS]
+        if history:
+            # History grows turn by turn, so consecutive turns of a session share a long prefix too
+            sections.append("\n\n".join(
+                [HISTORY_HEADER] + [HISTORY_TURN_TEMPLATE.format(query=turn.query, answer=turn.answer) for turn in history]
+            ))
+        sections.extend([header, sources_text, SYNTHESIS_CLOSING])
+        return "\n\n".join(sections)
+
+    def synthesis_messages(self, prompt: str) -> List[Dict[str, str]]:
+        return [
+            {"role": "system", "content": SYNTHESIS_SYSTEM},
+            {"role": "user", "content": prompt}
+        ]
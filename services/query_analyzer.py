@@ -1,27 +1,90 @@
 import re
-from typing import List
+from typing import Any, Dict, List, Optional
 from models.schemas import QueryAnalysis, SearchRequest
-from services.groq_service import GroqService
+from services.groq_service import AnalysisUnavailable, GroqService
+from services.llm_gateway import LLMGateway
+from services.query_classifier import QueryClassifier
+from services.cache import TTLCache
+from config.settings import settings
 import logging
 
 logger = logging.getLogger(__name__)
 
 class QueryAnalyzer:
-    def __init__(self):
-        self.groq_service = GroqService()
+    def __init__(self, llm_gateway: Optional[LLMGateway] = None):
+        self.groq_service = GroqService(llm_gateway)
+        self.classifier = QueryClassifier()
+        self.fast_path_threshold = settings.query_fast_path_threshold
+        self.analysis_cache = TTLCache(
+            max_entries=settings.analysis_cache_max_entries,
+            ttl=settings.analysis_cache_ttl
+        )
+
+        self.total_queries = 0
+        self.cache_hits = 0
+        self.fast_path_hits = 0
+        self.llm_calls = 0
 
     async def process_query(self, request: SearchRequest) -> QueryAnalysis:
         """Main method to process and analyze user query"""
 
+        self.total_queries += 1
+
         # 1. Clean and validate query
         cleaned_query = self._clean_query(request.query)
 
-        # 2. Pre-analysis check
-        if self._is_simple_query(cleaned_query):
-            return await self._handle_simple_query(request.query)
+        # 2. Memoized analysis for a query we have already seen
+        cache_key = self.normalize_query(request.query)
+        cached = self.analysis_cache.get(cache_key)
+        if cached is not None:
+            self.cache_hits += 1
+            return cached
 
-        # 3. Full LLM analysis for complex query
-        return await self.groq_service.analyze_query(cleaned_query)
+        # 3. Pre-analysis check
+        if self._is_simple_query(cleaned_query):
+            self.fast_path_hits += 1
+            analysis = await self._handle_simple_query(request.query)
+            self.analysis_cache.set(cache_key, analysis)
+            return analysis
+
+        # 4. Rule-based classification when it is confident enough
+        analysis, confidence = self.classifier.classify(request.query)
+        if analysis is not None and confidence > self.fast_path_threshold:
+            logger.info(f"Fast-path {analysis.query_type} analysis (confidence {confidence:.2f})")
+            self.fast_path_hits += 1
+            self.analysis_cache.set(cache_key, analysis)
+            return analysis
+
+        # 5. Full LLM analysis for complex query
+        self.llm_calls += 1
+        try:
+            analysis = await self.groq_service.analyze_query(cleaned_query)
+        except AnalysisUnavailable:
+            # Don't memoize the degraded analysis used when Groq fails
+            return self.groq_service.fallback_analysis(cleaned_query)
+
+        self.analysis_cache.set(cache_key, analysis)
+        return analysis
+
+    def invalidate(self, query: str):
+        """Forget the memoized analysis of a query so the next one is recomputed"""
+        self.analysis_cache.delete(self.normalize_query(query))
+
+    async def aclose(self):
+        await self.groq_service.aclose()
+
+    def fallback_analysis(self, query: str) -> QueryAnalysis:
+        """Basic analysis used when the real one is unavailable or too slow"""
+        return self.groq_service.fallback_analysis(self._clean_query(query))
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "total_queries": self.total_queries,
+            "cache_hits": self.cache_hits,
+            "fast_path_hits": self.fast_path_hits,
+            "llm_calls": self.llm_calls,
+            "fast_path_hit_rate": self.fast_path_hits / self.total_queries if self.total_queries else 0.0
+        }
 
     def _clean_query(self, query: str) -> str:
         """clean and normalize query"""
@@ -33,6 +96,10 @@ class QueryAnalyzer:
 
         return cleaned
 
+    def normalize_query(self, query: str) -> str:
+        """Canonical form of a query used as a cache key"""
+        return self._clean_query(query).lower().rstrip('?.! ')
+
     def _is_simple_query(self, query: str) -> bool:
         """Determine if query is simple enough to skip LLM analysis"""
         simple_patterns = [
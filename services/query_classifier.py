@@ -0,0 +1,248 @@
+import re
+from datetime import datetime
+from typing import List, Optional, Tuple
+
+from models.schemas import QueryAnalysis, QueryType
+from services.text_utils import STOPWORDS
+
+# Question scaffolding and comparison words that are never part of an entity
+ENTITY_STOPWORDS = STOPWORDS | {
+    "did", "i", "me", "my", "you", "your", "it", "its", "whom", "can", "could",
+    "should", "would", "will", "between", "than", "vs", "versus",
+    "better", "best", "tell", "please", "any", "there", "this", "that", "these", "those",
+    "going", "gonna", "get", "much", "many", "some"
+}
+# Entities keep dots and hyphens so names like "node.js" and "gpt-4" survive
+ENTITY_PATTERN = re.compile(r'[\w\-\.]+')
+
+# Comparison: "X vs Y", "difference between X and Y", "compare X with Y", "X or Y which is better"
+COMPARISON_PATTERNS = [
+    re.compile(r'^(?:compare\s+)?(?P<a>.+?)\s+(?:vs\.?|versus)\s+(?P<b>.+?)$'),
+    re.compile(r'^(?:what\s+(?:is|are)\s+the\s+)?differences?\s+between\s+(?P<a>.+?)\s+and\s+(?P<b>.+?)$'),
+    re.compile(r'^compare\s+(?P<a>.+?)\s+(?:and|with|to)\s+(?P<b>.+?)$'),
+    re.compile(r'^(?:is\s+|should\s+i\s+(?:use|choose|buy)\s+)?(?P<a>.+?)\s+or\s+(?P<b>.+?)[\s,]+which\s+is\s+better$'),
+    re.compile(r'^is\s+(?P<a>.+?)\s+better\s+than\s+(?P<b>.+?)$'),
+]
+
+# How-to: "how to X", "how do I X", "steps to X", "X tutorial"
+HOW_TO_PATTERNS = [
+    re.compile(r'^how\s+(?:do|can|should)\s+(?:i|you|we|one)\s+(?P<task>.+?)$'),
+    re.compile(r'^how\s+to\s+(?P<task>.+?)$'),
+    re.compile(r'^(?:steps|guide|tutorial)\s+(?:to|for|on)\s+(?P<task>.+?)$'),
+    re.compile(r'^(?P<task>.+?)\s+(?:tutorial|step by step|guide)$'),
+]
+
+# Calculation: arithmetic, unit conversion, percentages
+CALCULATION_PATTERNS = [
+    re.compile(r'^(?:what\s+is\s+|calculate\s+|compute\s+)?[\d\.\s]+(?:[\+\-\*/x\^]|plus|minus|times|divided by)[\d\.\s\+\-\*/x\^]+$'),
+    re.compile(r'^(?:convert\s+)?[\d\.]+\s*(?P<from>[a-z]+)\s+(?:to|in|into)\s+(?P<to>[a-z]+)$'),
+    re.compile(r'^(?:what\s+is\s+)?[\d\.]+\s*(?:%|percent)\s+of\s+[\d\.]+$'),
+    re.compile(r'^how\s+many\s+(?P<from>[a-z]+)\s+(?:are\s+)?in\s+(?:a\s+|an\s+|one\s+)?(?P<to>[a-z]+)$'),
+]
+
+# Definition-style factual lookups ("who is X" asks about a person, not a definition)
+FACTUAL_PATTERNS = [
+    re.compile(r'^(?P<wh>what|who)\s+(?P<verb>is|are|was|were)\s+(?:a\s+|an\s+|the\s+)?(?P<subject>[\w\s\-\.]{1,60}?)$'),
+    re.compile(r'^(?:define|meaning\s+of|definition\s+of)\s+(?P<subject>[\w\s\-\.]{1,60})$'),
+    re.compile(r'^(?P<subject>[\w\s\-\.]{1,60}?)\s+(?:meaning|definition)$'),
+]
+
+# Signals that fresh information is needed
+REAL_TIME_PATTERN = re.compile(
+    r'\b(?:latest|today|tonight|yesterday|tomorrow|this\s+(?:week|month|year)|right\s+now|'
+    r'current(?:ly)?|breaking|news|live|score|weather|stock\s+price|price\s+of|recent(?:ly)?|'
+    r'upcoming|announced|release\s+date)\b'
+)
+WEATHER_PATTERN = re.compile(r'\b(?:weather|forecast|rain(?:ing|y)?|snow(?:ing)?|temperature|humid(?:ity)?|storm)\b')
+SCORE_PATTERN = re.compile(r'\b(?:score|scores|scorecard|live)\b')
+YEAR_PATTERN = re.compile(r'\b(20\d{2})\b')
+# Open-ended or opinion phrasing that rules cannot summarise well
+OPEN_ENDED_PATTERN = re.compile(r'\b(?:why|should|opinion|think|pros\s+and\s+cons|impact|explain\s+how)\b')
+
+
+def needs_real_time(query: str) -> bool:
+    """Whether the query asks for fresh information (recency words or a current/future year)"""
+    text = query.lower()
+    if REAL_TIME_PATTERN.search(text):
+        return True
+    current_year = datetime.now().year
+    return any(int(year) >= current_year for year in YEAR_PATTERN.findall(text))
+
+
+class QueryClassifier:
+    """Deterministic keyword/rule classifier that builds a QueryAnalysis without an LLM call"""
+
+    def __init__(self, max_words: int = 12):
+        self.max_words = max_words
+
+    def classify(self, query: str) -> Tuple[Optional[QueryAnalysis], float]:
+        """Return (analysis, confidence); analysis is None when no rule matches"""
+
+        text = query.lower().strip().rstrip('?.! ')
+        if not text:
+            return None, 0.0
+
+        real_time = needs_real_time(text)
+
+        candidates = [
+            self._match_calculation(text),
+            self._match_comparison(text, real_time),
+            self._match_how_to(text, real_time),
+            self._match_current_events(text, query, real_time),
+            self._match_factual(text, real_time),
+        ]
+        matches = [candidate for candidate in candidates if candidate is not None]
+
+        if not matches:
+            return None, 0.0
+
+        analysis, confidence = max(matches, key=lambda match: match[1])
+
+        # Ambiguity lowers confidence: several categories fired or the query is long/open-ended
+        if len(matches) > 1:
+            confidence -= 0.1 * (len(matches) - 1)
+        if len(text.split()) > self.max_words:
+            confidence -= 0.3
+        if OPEN_ENDED_PATTERN.search(text):
+            confidence -= 0.3
+
+        return analysis, max(confidence, 0.0)
+
+    def _match_calculation(self, text: str) -> Optional[Tuple[QueryAnalysis, float]]:
+        for pattern in CALCULATION_PATTERNS:
+            if pattern.match(text):
+                return self._build(
+                    QueryType.CALCULATION,
+                    intent=f"User wants the result of: {text}",
+                    entities=[text],
+                    searches=[text, f"{text} calculator"],
+                    complexity=2
+                ), 0.9
+        return None
+
+    def _match_comparison(self, text: str, real_time: bool) -> Optional[Tuple[QueryAnalysis, float]]:
+        # "score of india vs australia" is a live match, not a comparison
+        if real_time:
+            return None
+
+        for pattern in COMPARISON_PATTERNS:
+            match = pattern.match(text)
+            if not match:
+                continue
+
+            first = self._subject(match.group('a'))
+            second = self._subject(match.group('b'))
+            if not first or not second:
+                continue
+
+            return self._build(
+                QueryType.COMPARISON,
+                intent=f"User wants to compare {first} and {second}",
+                entities=[first, second],
+                searches=[f"{first} vs {second}", f"difference between {first} and {second}",
+                          f"{first} {second} comparison"],
+                complexity=5
+            ), 0.9
+        return None
+
+    def _match_how_to(self, text: str, real_time: bool) -> Optional[Tuple[QueryAnalysis, float]]:
+        for pattern in HOW_TO_PATTERNS:
+            match = pattern.match(text)
+            if not match:
+                continue
+
+            task = match.group('task').strip()
+            if len(task) < 3:
+                continue
+
+            return self._build(
+                QueryType.HOW_TO,
+                intent=f"User wants step-by-step instructions to {task}",
+                entities=self._entities(task),
+                searches=[f"how to {task}", f"{task} step by step guide", f"{task} tutorial"],
+                complexity=4,
+                real_time=real_time
+            ), 0.9
+        return None
+
+    def _match_current_events(self, text: str, query: str, real_time: bool) -> Optional[Tuple[QueryAnalysis, float]]:
+        if not real_time:
+            return None
+
+        topic = self._subject(REAL_TIME_PATTERN.sub(' ', text)) or text
+        if WEATHER_PATTERN.search(text):
+            # Only the place is worth keeping; "rain" or "forecast" alone is not a topic
+            place = self._subject(WEATHER_PATTERN.sub(' ', REAL_TIME_PATTERN.sub(' ', text)))
+            intent = f"User wants the current weather forecast for {place}" if place else "User wants the current weather forecast"
+            searches = [query.strip()] + ([f"{place} weather forecast"] if place else [])
+        elif SCORE_PATTERN.search(text):
+            intent = f"User wants the live score of {topic}"
+            searches = [query.strip(), f"{topic} live score"]
+        else:
+            intent = f"User wants the latest information about {topic}"
+            searches = [query.strip(), f"{topic} latest news", f"{topic} today"]
+
+        # Location, teams and dates are easy to get wrong with rules, so this never clears the fast path alone
+        return self._build(
+            QueryType.CURRENT_EVENTS,
+            intent=intent,
+            entities=self._entities(topic) or [topic],
+            searches=searches,
+            complexity=4,
+            real_time=True
+        ), 0.8
+
+    def _match_factual(self, text: str, real_time: bool) -> Optional[Tuple[QueryAnalysis, float]]:
+        # "what is the weather in paris" is not a definition lookup
+        if real_time:
+            return None
+
+        for pattern in FACTUAL_PATTERNS:
+            match = pattern.match(text)
+            if not match:
+                continue
+
+            subject = match.group('subject').strip()
+            if not subject or len(subject.split()) > 5:
+                continue
+
+            if match.groupdict().get('wh') == 'who':
+                question = f"who {match.group('verb')} {subject}"
+                return self._build(
+                    QueryType.FACTUAL,
+                    intent=f"User wants to know {question}",
+                    entities=[subject],
+                    searches=[question, f"{subject} biography"],
+                    complexity=2
+                ), 0.8
+
+            return self._build(
+                QueryType.FACTUAL,
+                intent=f"User wants to understand what {subject} is",
+                entities=[subject],
+                searches=[f"{subject} definition", f"what is {subject}", f"{subject} explanation"],
+                complexity=2
+            ), 0.9
+        return None
+
+    def _subject(self, text: str) -> str:
+        return " ".join(self._entities(text))
+
+    def _entities(self, text: str) -> List[str]:
+        return [word for word in ENTITY_PATTERN.findall(text) if word not in ENTITY_STOPWORDS]
+
+    def _build(self,
+               query_type: QueryType,
+               intent: str,
+               entities: List[str],
+               searches: List[str],
+               complexity: int,
+               real_time: bool = False) -> QueryAnalysis:
+        return QueryAnalysis(
+            query_type=query_type.value,
+            search_intent=intent,
+            key_entities=entities[:5],
+            suggested_searches=list(dict.fromkeys(searches)),
+            complexity_score=complexity,
+            requires_real_time=real_time
+        )
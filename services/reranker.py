@@ -0,0 +1,160 @@
+from __future__ import annotations
+
+from datetime import datetime, timezone
+from typing import Dict, List, Optional
+
+from models.schemas import QueryAnalysis, SearchResult
+from config.settings import settings
+from services.lazy_import import lazy_import
+from services.text_utils import content_terms, parse_published_date, tokenize
+import logging
+
+np = lazy_import("numpy")
+
+logger = logging.getLogger(__name__)
+
+
+class Reranker:
+    """Reorders ranked search results for a query; the base class keeps the input order"""
+
+    name = "none"
+
+    def rerank(self, query: str, analysis: QueryAnalysis, results: List[SearchResult]) -> List[SearchResult]:
+        return results
+
+
+class BM25Reranker(Reranker):
+    """Batch reranker combining BM25 overlap, recency and the upstream ranking score.
+
+    All candidates for a query are scored together as NumPy arrays: a
+    document x query-term frequency matrix feeds BM25, published dates feed an
+    exponential recency decay, and the existing calculated_score is kept as a
+    prior. Each feature is min-max normalised before the weighted sum.
+    """
+
+    name = "bm25"
+
+    def __init__(self,
+                 bm25_weight: float,
+                 recency_weight: float,
+                 prior_weight: float,
+                 recency_half_life_days: float,
+                 real_time_recency_boost: float,
+                 k1: float = 1.5,
+                 b: float = 0.75):
+        self.bm25_weight = bm25_weight
+        self.recency_weight = recency_weight
+        self.prior_weight = prior_weight
+        self.recency_half_life_days = recency_half_life_days
+        self.real_time_recency_boost = real_time_recency_boost
+        self.k1 = k1
+        self.b = b
+
+    def rerank(self, query: str, analysis: QueryAnalysis, results: List[SearchResult]) -> List[SearchResult]:
+        if len(results) < 2:
+            return results
+
+        query_terms = self._query_terms(query, analysis)
+        if not query_terms:
+            return results
+
+        bm25 = self._bm25_scores(query_terms, results)
+        recency = self._recency_scores(results)
+        prior = np.array([result.calculated_score or result.score for result in results], dtype=np.float64)
+
+        recency_weight = self.recency_weight
+        if analysis.requires_real_time:
+            recency_weight *= self.real_time_recency_boost
+
+        combined = (
+            self.bm25_weight * _normalize(bm25)
+            + recency_weight * recency
+            + self.prior_weight * _normalize(prior)
+        )
+
+        # Stable sort keeps upstream order for ties
+        order = np.argsort(-combined, kind="stable")
+        reranked = []
+        for index in order:
+            result = results[index]
+            result.rerank_score = float(combined[index])
+            reranked.append(result)
+
+        return reranked
+
+    def _query_terms(self, query: str, analysis: QueryAnalysis) -> Dict[str, int]:
+        """Map each distinct query/entity token to a column index"""
+        terms: Dict[str, int] = {}
+        for token in content_terms(" ".join([query, *analysis.key_entities])):
+            if token not in terms:
+                terms[token] = len(terms)
+        return terms
+
+    def _bm25_scores(self, query_terms: Dict[str, int], results: List[SearchResult]) -> np.ndarray:
+        n_docs = len(results)
+        n_terms = len(query_terms)
+
+        doc_ids = []
+        term_ids = []
+        doc_lengths = np.empty(n_docs, dtype=np.float64)
+
+        for doc_index, result in enumerate(results):
+            tokens = tokenize(f"{result.title} {result.content}")
+            doc_lengths[doc_index] = len(tokens)
+            matched = [query_terms[token] for token in tokens if token in query_terms]
+            term_ids.extend(matched)
+            doc_ids.extend([doc_index] * len(matched))
+
+        # Term-frequency matrix built in one scatter-add
+        tf = np.bincount(
+            np.asarray(doc_ids, dtype=np.int64) * n_terms + np.asarray(term_ids, dtype=np.int64),
+            minlength=n_docs * n_terms
+        ).reshape(n_docs, n_terms).astype(np.float64)
+
+        df = np.count_nonzero(tf, axis=0)
+        idf = np.log1p((n_docs - df + 0.5) / (df + 0.5))
+
+        avg_length = doc_lengths.mean() or 1.0
+        length_norm = self.k1 * (1 - self.b + self.b * doc_lengths / avg_length)
+
+        scores = idf * (tf * (self.k1 + 1)) / (tf + length_norm[:, None])
+        return scores.sum(axis=1)
+
+    def _recency_scores(self, results: List[SearchResult]) -> np.ndarray:
+        """Exponential decay in [0, 1] by article age; undated results score 0"""
+        now = datetime.now(timezone.utc)
+        ages = np.array([_age_in_days(result.published_date, now) for result in results], dtype=np.float64)
+
+        scores = np.exp2(-ages / self.recency_half_life_days)
+        return np.nan_to_num(scores, nan=0.0)
+
+
+def _age_in_days(published_date: Optional[str], now: datetime) -> float:
+    published = parse_published_date(published_date)
+    if published is None:
+        return np.nan
+    return max((now - published).total_seconds() / 86400, 0.0)
+
+
+def _normalize(values: np.ndarray) -> np.ndarray:
+    spread = values.max() - values.min()
+    if spread <= 0:
+        return np.zeros_like(values)
+    return (values - values.min()) / spread
+
+
+def build_reranker() -> Reranker:
+    """Create the reranker selected in settings"""
+
+    name = settings.reranker.lower()
+    if name == "bm25":
+        return BM25Reranker(
+            bm25_weight=settings.rerank_bm25_weight,
+            recency_weight=settings.rerank_recency_weight,
+            prior_weight=settings.rerank_prior_weight,
+            recency_half_life_days=settings.rerank_recency_half_life_days,
+            real_time_recency_boost=settings.rerank_real_time_recency_boost
+        )
+    if name != "none":
+        logger.warning(f"Unknown reranker '{name}', keeping upstream ranking")
+    return Reranker()
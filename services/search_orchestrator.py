@@ -1,10 +1,26 @@
+import asyncio
 import time
-from typing import Dict, Any
+import httpx
+from typing import Dict, Any, AsyncIterator, List, Optional, Tuple
 
-from models.schemas import SearchRequest, SearchResponse, SearchResult, WebSearchResults
+from models.schemas import (
+    SearchRequest, SearchResponse, SearchResult, WebSearchResults, QueryAnalysis, SynthesizedResponse
+)
 from services.query_analyzer import QueryAnalyzer
+from services.query_classifier import needs_real_time
+from services.llm_gateway import LLMGateway
 from services.tavily_service import TavilyService
 from services.content_synthesizer import ContentSynthesizer
+from services.cache import build_response_cache
+from services.semantic_cache import build_semantic_cache
+from services.session_store import Session, build_session_store
+from services.local_corpus import build_local_corpus
+from services.cache_warmer import QueryFrequencyTracker
+from services.search_scheduler import SearchBudget, SearchScheduler
+from services.reranker import build_reranker
+from services.single_flight import EventBroadcast, SingleFlight
+from services.metrics import ANALYSIS_STAGE, SEARCH_STAGE, SYNTHESIS_STAGE, RERANK_STAGE
+from config.settings import settings
 from datetime import datetime
 import logging
 
@@ -13,33 +29,182 @@ logger = logging.getLogger(__name__)
 class SearchOrchestrator:
     """Main orchestrator that coordinates query analysis and web search"""
 
-    def __init__(self):
-        self.query_analyzer = QueryAnalyzer()
-        self.tavily_service = TavilyService()
-        self.content_synthesizer = ContentSynthesizer()
+    def __init__(self,
+                 http_client: Optional[httpx.AsyncClient] = None,
+                 llm_gateway: Optional[LLMGateway] = None):
+        self.query_analyzer = QueryAnalyzer(llm_gateway)
+        self.local_corpus = build_local_corpus()
+        self.tavily_service = TavilyService(http_client, self.local_corpus)
+        self.content_synthesizer = ContentSynthesizer(llm_gateway)
+        self.search_scheduler = SearchScheduler(self.tavily_service)
+        self.reranker = build_reranker()
+        self.response_cache = build_response_cache()
+        self.semantic_cache = build_semantic_cache()
+        self.session_store = build_session_store()
+
+        # Request counts per query, read by the background cache warmer
+        self.query_frequency = (
+            QueryFrequencyTracker(window=settings.cache_warmer_window) if settings.cache_warmer_enabled else None
+        )
+        self.speculative_search = settings.speculative_search_enabled
+        self.results_per_search = 2   # 2 results per search term
+
+        # Concurrent identical requests share one pipeline run
+        self.single_flight = settings.single_flight_enabled
+        self.search_flights = SingleFlight()
+        self.stream_flights: Dict[Tuple[str, float], EventBroadcast] = {}
+        self.stream_leaders = 0
+        self.stream_followers = 0
+
+    async def aclose(self):
+        """Stop background work and release the resources the services created themselves"""
+        await self.tavily_service.aclose()
+        if self.local_corpus:
+            await self.local_corpus.close()
+        await self.query_analyzer.aclose()
+        await self.content_synthesizer.aclose()
+        if self.response_cache:
+            await self.response_cache.close()
 
     async def execute_search(self, request: SearchRequest) -> SearchResponse:
         """Execute complete search pipeline: Analysis + Web Search + Synthesis"""
 
+        cache_key = self.query_analyzer.normalize_query(request.query)
+
+        # A follow-up builds on its session's sources and turns, so it is neither shared nor cached
+        session = self._get_session(request)
+        if session is not None:
+            response = await self._run_search(request, cache_key, session)
+        else:
+            self._track_query(cache_key, request)
+            response = await self._search_shared(request, cache_key)
+
+        self._record_turn(request, response)
+        return response
+
+    async def _search_shared(self, request: SearchRequest, cache_key: str) -> SearchResponse:
+        """Answer from cache or an identical in-flight request before running the pipeline"""
+
+        # Step 0: Serve identical / near-identical queries from cache
+        cached_response = await self._get_cached_response(cache_key, request)
+        if cached_response is not None:
+            return cached_response
+
+        if not self.single_flight:
+            return await self._run_search(request, cache_key)
+
+        # Join an identical request already in flight, streamed or not
+        flight_key = self._flight_key(cache_key, request)
+        stream_flight = self.stream_flights.get(flight_key)
+        if stream_flight is not None:
+            response = await stream_flight.wait()
+            if response is not None:
+                self.stream_followers += 1
+                return response.model_copy(update={"original_query": request.query})
+
+        response = await self.search_flights.do(flight_key, lambda: self._run_search(request, cache_key))
+        return response.model_copy(update={"original_query": request.query})
+
+    async def refresh_query(self, query: str) -> SearchResponse:
+        """Recompute a query's analysis, search results and answer, replacing what is cached"""
+
+        request = SearchRequest(query=query)
+        cache_key = self.query_analyzer.normalize_query(query)
+
+        # Drop the memoized analysis so this run goes upstream instead of replaying it
+        self.query_analyzer.invalidate(query)
+
+        # Live requests for the same query arriving meanwhile join this run. Every
+        # term it issues skips the term cache and the local corpus, whatever the
+        # fresh analysis suggests, or the refresh would replay stale results
+        flight_key = self._flight_key(cache_key, request)
+        return await self.search_flights.do(
+            flight_key, lambda: self._run_search(request, cache_key, refresh=True)
+        )
+
+    async def execute_batch(self,
+                            requests: List[SearchRequest],
+                            concurrency: int
+                            ) -> AsyncIterator[Tuple[int, Optional[SearchResponse], Optional[str]]]:
+        """Run many searches with bounded concurrency, yielding (index, response, error) as each completes.
+
+        Identical queries in the batch run once. Search terms shared between
+        different queries are fetched once too: concurrent fetches of a term
+        are coalesced and later ones are served by the per-term cache.
+        """
+
+        groups: Dict[Tuple[str, float], List[int]] = {}
+        for index, request in enumerate(requests):
+            cache_key = self.query_analyzer.normalize_query(request.query)
+            groups.setdefault(self._flight_key(cache_key, request), []).append(index)
+
+        logger.info(f"Batch of {len(requests)} queries ({len(groups)} unique), concurrency {concurrency}")
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def run(indices: List[int]):
+            async with semaphore:
+                try:
+                    return indices, await self.execute_search(requests[indices[0]]), None
+                except Exception as e:
+                    logger.error(f"❌ Batch query failed: '{requests[indices[0]].query}' : {e}")
+                    return indices, None, str(e)
+
+        tasks = [asyncio.create_task(run(indices)) for indices in groups.values()]
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                indices, response, error = await next_done
+                for index in indices:
+                    if response is not None and index != indices[0]:
+                        yield index, response.model_copy(update={"original_query": requests[index].query}), None
+                    else:
+                        yield index, response, error
+        finally:
+            # The client went away: don't keep working on the rest of the batch
+            for task in tasks:
+                task.cancel()
+
+    async def _run_search(self,
+                          request: SearchRequest,
+                          cache_key: str,
+                          session: Optional[Session] = None,
+                          refresh: bool = False) -> SearchResponse:
+        """Run analysis, web search and synthesis for one request (bypassing cached results if `refresh`)"""
+
         start_time = time.time()
         analysis = None
         web_results = None
+        truncated_stages: List[str] = []
+
+        # The raw query is always searched, so start it while analysis runs
+        speculative_task = self._start_speculative_search(request.query, session, refresh)
+        latency_budget = self._get_latency_budget(request)
+        deadline = time.monotonic() + latency_budget
 
         try:
             # Step 1: Analyze Query
             logger.info(f"Step 1: Analyzing Query: '{request.query}'")
-            analysis = await self.query_analyzer.process_query(request)
+            analysis = await self._analyze_within(
+                request, latency_budget * settings.analysis_budget_fraction, truncated_stages
+            )
+            analysis = self._with_session_entities(analysis, session)
 
             # Step 2: Execute Web Searches
             logger.info(f"Step 2: Executing Web Searches")
-            web_results = await self._execute_web_search(analysis, request.query)
+            web_results = await self._execute_web_search(
+                analysis,
+                request.query,
+                speculative_task,
+                time_budget=self._search_time_budget(latency_budget, deadline),
+                truncated_stages=truncated_stages,
+                session=session,
+                refresh=refresh
+            )
 
             # Step 3: Synthesize Response
             logger.info(f"Step: Synthesizeing Response")
-            synthesized_response = await self.content_synthesizer.synthesize_response(
-                query=request.query,
-                analysis=analysis,
-                web_results=web_results
+            synthesized_response = await self._synthesize_within(
+                request.query, analysis, web_results, deadline - time.monotonic(), truncated_stages,
+                history=session.turns if session else None
             )
 
             total_duration = time.time() - start_time
@@ -51,10 +216,13 @@ class SearchOrchestrator:
                 analysis=analysis,
                 web_results=web_results,
                 synthesized_response=synthesized_response,
-                status="search_completed",
-                timestamp=datetime.now().isoformat()
+                status="partial_results" if truncated_stages else "search_completed",
+                timestamp=datetime.now().isoformat(),
+                truncated_stages=truncated_stages
             )
 
+            if session is None:
+                await self._store_response(cache_key, response)
             return response
 
         except Exception as e:
@@ -67,11 +235,334 @@ class SearchOrchestrator:
                 web_results=web_results,
                 synthesized_response=None,
                 status="partial_failure",
-                timestamp=datetime.now().isoformat()
+                timestamp=datetime.now().isoformat(),
+                truncated_stages=truncated_stages
+            )
+
+        finally:
+            self._cancel_task(speculative_task)
+
+    async def stream_search(self, request: SearchRequest) -> AsyncIterator[Tuple[str, Dict[str, Any]]]:
+        """Execute the search pipeline, yielding (event, payload) pairs as each stage completes"""
+
+        cache_key = self.query_analyzer.normalize_query(request.query)
+
+        session = self._get_session(request)
+        if session is None:
+            self._track_query(cache_key, request)
+            cached_response = await self._get_cached_response(cache_key, request)
+            if cached_response is not None:
+                self._record_turn(request, cached_response)
+                async for event, data in self._replay_response(cached_response):
+                    yield event, data
+                return
+
+        # Follow-ups run their own pipeline on top of the session
+        if session is not None or not self.single_flight:
+            flight = EventBroadcast(lambda broadcast: self._stream_pipeline(request, cache_key, broadcast, session))
+            async for event, data in flight.subscribe():
+                yield event, data
+            self._record_turn(request, flight.result)
+            return
+
+        flight_key = self._flight_key(cache_key, request)
+
+        # An identical non-streaming request is already running: wait for it and replay
+        if self.search_flights.get(flight_key) is not None:
+            response = await self.search_flights.join(flight_key)
+            if response.synthesized_response is not None:
+                self.stream_followers += 1
+                self._record_turn(request, response)
+                async for event, data in self._replay_response(response, cached=False):
+                    yield event, data
+                return
+
+        # Attach to (or start) the shared stream; late subscribers replay what they missed
+        flight = self.stream_flights.get(flight_key)
+        if flight is None:
+            self.stream_leaders += 1
+            flight = EventBroadcast(lambda broadcast: self._stream_pipeline(request, cache_key, broadcast))
+            self.stream_flights[flight_key] = flight
+            flight.add_done_callback(lambda done: self._release_stream_flight(flight_key, done))
+        else:
+            self.stream_followers += 1
+
+        async for event, data in flight.subscribe():
+            yield event, data
+        self._record_turn(request, flight.result)
+
+    def _track_query(self, cache_key: str, request: SearchRequest):
+        if self.query_frequency is not None:
+            self.query_frequency.record(cache_key, request.query)
+
+    def _get_session(self, request: SearchRequest) -> Optional[Session]:
+        if self.session_store is None:
+            return None
+        return self.session_store.get(request)
+
+    def _record_turn(self, request: SearchRequest, response: Optional[SearchResponse]):
+        if self.session_store is not None:
+            self.session_store.record(request, response)
+
+    def _flight_key(self, cache_key: str, request: SearchRequest) -> Tuple[str, float]:
+        # Different latency budgets can produce different answers, so they don't share
+        return cache_key, self._get_latency_budget(request)
+
+    def _release_stream_flight(self, flight_key: Tuple[str, float], flight: EventBroadcast):
+        if self.stream_flights.get(flight_key) is flight:
+            del self.stream_flights[flight_key]
+
+    def get_flight_stats(self) -> Dict[str, Any]:
+        return {
+            **self.search_flights.get_stats(),
+            "stream_in_flight": len(self.stream_flights),
+            "stream_leaders": self.stream_leaders,
+            "stream_followers": self.stream_followers
+        }
+
+    async def _stream_pipeline(self,
+                               request: SearchRequest,
+                               cache_key: str,
+                               broadcast: Optional[EventBroadcast] = None,
+                               session: Optional[Session] = None
+                               ) -> AsyncIterator[Tuple[str, Dict[str, Any]]]:
+        """Run the pipeline as a stream of events; the final response is left on `broadcast.result`"""
+
+        start_time = time.time()
+
+        speculative_task = self._start_speculative_search(request.query, session)
+        latency_budget = self._get_latency_budget(request)
+        deadline = time.monotonic() + latency_budget
+        truncated_stages: List[str] = []
+
+        try:
+            # Step 1: Analysis is emitted as soon as it exists
+            logger.info(f"Stream Step 1: Analyzing Query: '{request.query}'")
+            analysis = await self._analyze_within(
+                request, latency_budget * settings.analysis_budget_fraction, truncated_stages
+            )
+            analysis = self._with_session_entities(analysis, session)
+            yield "analysis", analysis.model_dump()
+
+            # Step 2: Ranked web results
+            logger.info(f"Stream Step 2: Executing Web Searches")
+            web_results = await self._execute_web_search(
+                analysis,
+                request.query,
+                speculative_task,
+                time_budget=self._search_time_budget(latency_budget, deadline),
+                truncated_stages=truncated_stages,
+                session=session
+            )
+            yield "web_results", web_results.model_dump()
+
+            # Step 3: Synthesized tokens as Groq produces them, then citation metadata
+            logger.info(f"Stream Step 3: Streaming Synthesized Response")
+            synthesized_response = None
+            synthesis_start = time.perf_counter()
+            async for event, data in self.content_synthesizer.stream_response(
+                query=request.query,
+                analysis=analysis,
+                web_results=web_results,
+                timeout=deadline - time.monotonic(),
+                history=session.turns if session else None
+            ):
+                if event == "token":
+                    yield "token", {"text": data}
+                elif event == "truncated":
+                    truncated_stages.append(data)
+                else:
+                    synthesized_response = data
+                    yield "synthesis", data.model_dump()
+            SYNTHESIS_STAGE.observe(time.perf_counter() - synthesis_start)
+
+            status = "partial_results" if truncated_stages else "search_completed"
+            response = SearchResponse(
+                original_query=request.query,
+                analysis=analysis,
+                web_results=web_results,
+                synthesized_response=synthesized_response,
+                status=status,
+                timestamp=datetime.now().isoformat(),
+                truncated_stages=truncated_stages
             )
+            if broadcast is not None:
+                broadcast.result = response
+            if session is None:
+                await self._store_response(cache_key, response)
+
+            total_duration = time.time() - start_time
+            logger.info(f"⚡ Streamed search completed in {total_duration:.2f}s")
+
+            yield "done", {
+                "status": status,
+                "truncated_stages": truncated_stages,
+                "duration": total_duration,
+                "timestamp": datetime.now().isoformat()
+            }
+
+        except Exception as e:
+            logger.error(f"❌ Streaming Search Pipeline failed: {e}")
+            yield "error", {
+                "status": "partial_failure",
+                "detail": str(e),
+                "truncated_stages": truncated_stages,
+                "timestamp": datetime.now().isoformat()
+            }
+
+        finally:
+            self._cancel_task(speculative_task)
+
+    async def _get_cached_response(self, cache_key: str, request: SearchRequest):
+        """Return a cached response for this query (or a paraphrase of it), if one is fresh"""
+        cached = None
+        if self.response_cache is not None:
+            cached = await self.response_cache.get(cache_key)
+            if cached is not None:
+                logger.info(f"⚡ Cache hit for: '{request.query}'")
+
+        if cached is None and self.semantic_cache is not None:
+            match = self.semantic_cache.get(request.query)
+            if match is not None:
+                cached, similarity = match
+                logger.info(f"⚡ Semantic cache hit for: '{request.query}' "
+                            f"(matched '{cached.original_query}', similarity {similarity:.2f})")
+
+        if cached is None:
+            return None
+        return cached.model_copy(update={"original_query": request.query, "cached": True})
+
+    def is_cacheable(self, response: SearchResponse) -> bool:
+        """Whether a response is worth caching (not a fallback answer)"""
+        synthesized = response.synthesized_response
+        if synthesized is None or synthesized.total_sources == 0:
+            return False
+
+        # Answers degraded by the latency budget should not outlive their request
+        return not response.truncated_stages
+
+    async def _store_response(self, cache_key: str, response: SearchResponse):
+        """Cache a completed response (fallback answers are never cached)"""
+        if self.response_cache is None and self.semantic_cache is None:
+            return
+        if not self.is_cacheable(response):
+            return
+
+        if self.response_cache is not None:
+            await self.response_cache.set(cache_key, response)
+        if self.semantic_cache is not None:
+            self.semantic_cache.set(response.original_query, response)
 
-    async def _execute_web_search(self, analysis, original_query: str) -> WebSearchResults:
-        """Execute web search using analyzed query data"""
+    async def _replay_response(self,
+                               response: SearchResponse,
+                               cached: bool = True) -> AsyncIterator[Tuple[str, Dict[str, Any]]]:
+        """Emit a complete response using the same event sequence as a live stream"""
+        yield "analysis", response.analysis.model_dump()
+        yield "web_results", response.web_results.model_dump()
+        yield "token", {"text": response.synthesized_response.response}
+        yield "synthesis", response.synthesized_response.model_dump()
+        yield "done", {
+            "status": response.status,
+            "cached": cached,
+            "duration": 0.0,
+            "timestamp": datetime.now().isoformat()
+        }
+
+    def _get_latency_budget(self, request: SearchRequest) -> float:
+        return request.latency_budget or settings.request_latency_budget
+
+    def _search_time_budget(self, latency_budget: float, deadline: float) -> float:
+        """Search gets its slice of the budget, but never more than what is left"""
+        remaining = deadline - time.monotonic()
+        return max(0.0, min(latency_budget * settings.search_budget_fraction, remaining))
+
+    async def _analyze_within(self,
+                              request: SearchRequest,
+                              timeout: float,
+                              truncated_stages: List[str]) -> QueryAnalysis:
+        """Run query analysis, falling back to a basic analysis if it overruns its slice"""
+        try:
+            with ANALYSIS_STAGE.time():
+                return await asyncio.wait_for(self.query_analyzer.process_query(request), timeout)
+        except asyncio.TimeoutError:
+            logger.warning(f"⚠️ Analysis exceeded {timeout:.2f}s, using fallback analysis")
+            truncated_stages.append("analysis")
+            return self.query_analyzer.fallback_analysis(request.query)
+
+    async def _synthesize_within(self,
+                                 query: str,
+                                 analysis: QueryAnalysis,
+                                 web_results: WebSearchResults,
+                                 timeout: float,
+                                 truncated_stages: List[str],
+                                 history: Optional[List[Any]] = None) -> SynthesizedResponse:
+        """Run synthesis with whatever is left of the budget"""
+        try:
+            with SYNTHESIS_STAGE.time():
+                return await asyncio.wait_for(
+                    self.content_synthesizer.synthesize_response(
+                        query=query,
+                        analysis=analysis,
+                        web_results=web_results,
+                        history=history
+                    ),
+                    max(timeout, 0.0)
+                )
+        except asyncio.TimeoutError:
+            logger.warning(f"⚠️ Synthesis exceeded {timeout:.2f}s, returning fallback response")
+            truncated_stages.append("synthesis")
+            return self.content_synthesizer.fallback_response(
+                query, "Response generation exceeded the latency budget"
+            )
+
+    def _with_session_entities(self, analysis: QueryAnalysis, session: Optional[Session]) -> QueryAnalysis:
+        """Follow-ups often leave the subject out ("how fast is it?"): keep the earlier turns' entities"""
+        if session is None:
+            return analysis
+
+        earlier = [entity for turn in reversed(session.turns) for entity in turn.analysis.key_entities]
+        entities = list(dict.fromkeys(analysis.key_entities + earlier))
+        return analysis.model_copy(update={"key_entities": entities})
+
+    def _start_speculative_search(self,
+                                  query: str,
+                                  session: Optional[Session] = None,
+                                  refresh: bool = False) -> Optional[asyncio.Task]:
+        """Fire the search for the raw query without waiting for analysis"""
+        if not self.speculative_search:
+            return None
+        if session is not None and session.has_searched(query):
+            return None
+
+        return asyncio.create_task(self._speculate(query, refresh))
+
+    async def _speculate(self, query: str, refresh: bool = False) -> Optional[List[Dict[str, Any]]]:
+        """Search the raw query unless the local corpus covers it (None then).
+
+        The corpus check runs here, alongside analysis, and is repeated with
+        the analysis' freshness rules before the real searches are issued; a
+        raw query only covered here is then fetched by the search scheduler.
+        """
+        if self.local_corpus is not None and not refresh:
+            _, covered = await self._search_local_corpus([query], requires_real_time=needs_real_time(query))
+            if covered:
+                return None
+
+        return await self.tavily_service.fetch_multiple([query], self.results_per_search, bypass_cache=refresh)
+
+    def _cancel_task(self, task: Optional[asyncio.Task]):
+        if task is not None and not task.done():
+            task.cancel()
+
+    async def _execute_web_search(self,
+                                  analysis,
+                                  original_query: str,
+                                  speculative_task: Optional[asyncio.Task] = None,
+                                  time_budget: Optional[float] = None,
+                                  truncated_stages: Optional[List[str]] = None,
+                                  session: Optional[Session] = None,
+                                  refresh: bool = False) -> WebSearchResults:
+        """Execute web search using analyzed query data (only terms new to the session, if any)"""
 
         search_start = time.time()
 
@@ -81,19 +572,43 @@ class SearchOrchestrator:
         # Add original query if not already in suggestions
         if original_query not in search_terms:
             search_terms = [original_query] + search_terms
+
+        # Terms the session already searched are covered by its sources
+        if session is not None:
+            search_terms = self.session_store.unsearched_terms(session, search_terms)
         logger.info(f"Search Terms: {search_terms}")
 
         # Limit number of searches based on complexity
-        max_searches = min(len(search_terms), self._get_max_searches(analysis.complexity_score))
-        logger.info(f"Max Searches: {max_searches}")
+        budget = self._get_search_budget(analysis.complexity_score)
+        if time_budget is not None:
+            budget.deadline = min(budget.deadline, time_budget)
+        logger.info(f"Max Searches: {budget.max_searches}")
 
-        logger.info(f"Using {len(search_terms)} search terms: {search_terms}")
+        # Terms the local corpus covers with fresh documents don't go to Tavily
+        local_results: List[Dict[str, Any]] = []
+        covered_terms: List[str] = []
+        if self.local_corpus is not None and not refresh:
+            search_terms = list(dict.fromkeys(search_terms))[:budget.max_searches]
+            local_results, covered_terms = await self._search_local_corpus(search_terms, analysis.requires_real_time)
+            search_terms = [term for term in search_terms if term not in covered_terms]
+            if covered_terms:
+                logger.info(f"Local corpus covered {len(covered_terms)} terms: {covered_terms}")
 
-        # Execute searches via Tavily
-        raw_results = await self.tavily_service.search_multiple(
+        # Execute searches via Tavily; the original query may already be in flight
+        in_flight = {original_query: speculative_task} if speculative_task else None
+        raw_results, search_terms, timed_out = await self.search_scheduler.run(
             search_terms=search_terms,
-            max_results_per_search=2   # 2 results per search term
+            budget=budget,
+            results_per_search=self.results_per_search,
+            in_flight=in_flight,
+            bypass_cache=refresh
         )
+        if timed_out and truncated_stages is not None:
+            truncated_stages.append("search")
+        if local_results:
+            raw_results = self.tavily_service.merge_results(local_results + raw_results)
+            search_terms = covered_terms + search_terms
+        logger.info(f"Used {len(search_terms)} search terms: {search_terms}")
 
         # Convert to our schema
         search_results = []
@@ -112,7 +627,16 @@ class SearchOrchestrator:
                 logger.warning(f"⚠️ Failed to parse search result: {e}")
                 continue
 
+        # Carry the session's sources over; new results win on the same URL
+        if session is not None:
+            search_results.extend(self.session_store.reusable_sources(session, search_results))
+
+        # Batch rerank against the query's entities and recency
+        with RERANK_STAGE.time():
+            search_results = self.reranker.rerank(original_query, analysis, search_results)
+
         search_duration = time.time() - search_start
+        SEARCH_STAGE.observe(search_duration)
 
         return WebSearchResults(
             total_results=len(search_results),
@@ -121,6 +645,26 @@ class SearchOrchestrator:
             search_duration=search_duration
         )
 
+    async def _search_local_corpus(self,
+                                   search_terms: List[str],
+                                   requires_real_time: bool) -> Tuple[List[Dict[str, Any]], List[str]]:
+        """Local results for the terms the corpus covers under the query's freshness rules"""
+        if requires_real_time:
+            # Recently fetched and recently published, or it goes to Tavily
+            max_age = settings.local_corpus_real_time_max_age
+            max_published_age = settings.local_corpus_real_time_max_published_age
+        else:
+            max_age = settings.local_corpus_max_age
+            max_published_age = None
+
+        return await self.local_corpus.cover(
+            search_terms,
+            limit=max(self.results_per_search, settings.local_corpus_min_matches),
+            min_matches=settings.local_corpus_min_matches,
+            max_age=max_age,
+            max_published_age=max_published_age
+        )
+
     def _get_max_searches(self, complexity_score: int) -> int:
         """Determine maximum number of searches based on query complexity"""
         if complexity_score <= 3:
@@ -130,5 +674,15 @@ class SearchOrchestrator:
         else:
             return 4  # Complex queries: 4 searches
 
+    def _get_search_budget(self, complexity_score: int) -> SearchBudget:
+        """Build the fan-out budget for a query of the given complexity"""
+        return SearchBudget(
+            max_searches=self._get_max_searches(complexity_score),
+            parallelism=settings.search_parallelism,
+            target_results=settings.search_target_results,
+            min_score=settings.search_min_result_score,
+            deadline=settings.search_deadline
+        )
+
 
 
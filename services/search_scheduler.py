@@ -0,0 +1,106 @@
+import asyncio
+import time
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Tuple
+
+from services.tavily_service import TavilyService
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class SearchBudget:
+    """Limits applied to one request's Tavily fan-out"""
+    max_searches: int              # hard cap on terms issued
+    parallelism: int               # terms in flight at once
+    target_results: int            # stop once this many good unique results exist
+    min_score: float               # calculated_score that counts as "good"
+    deadline: float                # seconds before stragglers are cancelled
+
+
+class SearchScheduler:
+    """Issues search terms in priority order and stops early once the budget is met"""
+
+    def __init__(self, tavily_service: TavilyService):
+        self.tavily_service = tavily_service
+
+    async def run(self,
+                  search_terms: List[str],
+                  budget: SearchBudget,
+                  results_per_search: int,
+                  in_flight: Optional[Dict[str, asyncio.Task]] = None,
+                  bypass_cache: bool = False
+                  ) -> Tuple[List[Dict[str, Any]], List[str], bool]:
+        """Return (ranked results, terms actually issued, whether the deadline cut the search short).
+
+        `search_terms` must already be in priority order. `in_flight` maps terms
+        whose searches were started elsewhere (e.g. speculatively) to their tasks;
+        a task that yields None skipped Tavily, so its term is fetched here instead.
+        `bypass_cache` fetches every term upstream rather than from the term cache.
+        """
+
+        terms = list(dict.fromkeys(search_terms))[:budget.max_searches]
+        in_flight = {term: task for term, task in (in_flight or {}).items() if term in terms}
+        queue = [term for term in terms if term not in in_flight]
+        started_at = time.monotonic()
+
+        pending: Dict[asyncio.Task, str] = {task: term for term, task in in_flight.items()}
+        issued = list(in_flight)
+        collected: List[Dict[str, Any]] = []
+        ranked: List[Dict[str, Any]] = []
+        timed_out = False
+
+        def fetch(term: str):
+            task = asyncio.create_task(
+                self.tavily_service.fetch_multiple([term], results_per_search, bypass_cache=bypass_cache)
+            )
+            pending[task] = term
+
+        def fill():
+            while queue and len(pending) < budget.parallelism:
+                term = queue.pop(0)
+                fetch(term)
+                issued.append(term)
+
+        fill()
+
+        try:
+            while pending:
+                remaining = budget.deadline - (time.monotonic() - started_at)
+                if remaining <= 0:
+                    timed_out = True
+                    logger.warning(f"Search deadline of {budget.deadline}s reached with {len(pending)} in flight")
+                    break
+
+                done, _ = await asyncio.wait(
+                    pending, timeout=remaining, return_when=asyncio.FIRST_COMPLETED
+                )
+
+                for task in done:
+                    term = pending.pop(task)
+                    if task.cancelled():
+                        continue
+                    if task.exception() is not None:
+                        logger.error(f"Search Failed: '{term}' : {task.exception()}")
+                        continue
+                    if task.result() is None:
+                        # Skipped in favour of the local corpus, which this request's freshness rules reject
+                        fetch(term)
+                        continue
+                    collected.extend(task.result())
+
+                ranked = self.tavily_service.merge_results(collected)
+                good = sum(1 for result in ranked if result.get('calculated_score', 0.0) >= budget.min_score)
+                if good >= budget.target_results:
+                    logger.info(f"Early exit: {good} good results after {len(issued)} searches")
+                    break
+
+                fill()
+
+        finally:
+            # Cancel stragglers and anything left unissued
+            for task in pending:
+                task.cancel()
+
+        return ranked, issued, timed_out
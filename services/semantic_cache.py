@@ -0,0 +1,281 @@
+import time
+import zlib
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+from models.schemas import SearchResponse
+from config.settings import settings
+from services.lazy_import import lazy_import
+from services.query_classifier import needs_real_time
+from services.text_utils import STOPWORDS, content_terms
+import logging
+
+np = lazy_import("numpy")
+
+logger = logging.getLogger(__name__)
+
+# Question scaffolding only: modifiers like "best", "latest", "not" or "first" change the answer
+QUERY_STOPWORDS = STOPWORDS | {"did", "can", "me", "tell", "i", "you", "please", "explain", "explained"}
+
+# Words that flip which answer is right while barely moving the vector; both queries must agree on them
+QUALIFIERS = {
+    # ordinals
+    "first", "second", "third", "fourth", "fifth", "last", "final", "next", "previous",
+    # negations ("don't" tokenizes as "don" "t")
+    "not", "no", "never", "without", "nor", "cannot", "don", "doesn", "didn", "isn", "aren",
+    "wasn", "weren", "shouldn", "couldn", "wouldn",
+    # recency
+    "latest", "newest", "new", "recent", "recently", "current", "currently", "now", "today",
+    "tonight", "yesterday", "tomorrow", "upcoming", "old", "oldest",
+    # superlatives
+    "best", "worst", "top", "most", "least", "cheapest", "fastest", "biggest", "largest",
+    "smallest", "highest", "lowest",
+}
+
+# Irregular forms suffix stripping cannot reach
+IRREGULAR_STEMS = {
+    "won": "win", "lost": "lose", "made": "make", "wrote": "write", "written": "write",
+    "bought": "buy", "sold": "sell", "built": "build", "ran": "run", "began": "begin",
+    "children": "child", "people": "person", "men": "man", "women": "woman",
+}
+SUFFIXES = ("ing", "ies", "ers", "es", "er", "ed", "s")
+
+
+def _content_tokens(query: str) -> List[str]:
+    return content_terms(query, QUERY_STOPWORDS)
+
+
+def _qualifiers(tokens: List[str]) -> Set[str]:
+    """Numbers (years, counts, "3rd"), ordinals, negations, recency words and superlatives"""
+    return {token for token in tokens if token in QUALIFIERS or any(char.isdigit() for char in token)}
+
+
+def _stem(token: str) -> str:
+    """Crude inflection folding: "winner", "wins" and "won" all become "win" """
+    if token in IRREGULAR_STEMS:
+        return IRREGULAR_STEMS[token]
+
+    for suffix in SUFFIXES:
+        if token.endswith(suffix) and len(token) - len(suffix) >= 3 and not token.endswith("ss"):
+            token = token[:-len(suffix)] + ("y" if suffix == "ies" else "")
+            break
+    if len(token) > 3 and token[-1] == token[-2]:
+        token = token[:-1]
+    return token
+
+
+class QueryEmbedder:
+    """Hashed character n-gram vectors for short queries.
+
+    Every content word is folded to its stem, so inflections coincide, and
+    contributes the stem and its character n-grams (padded with spaces so
+    word starts and ends count), each hashed into `dim` signed buckets.
+    Vectors are L2-normalised, so a dot product is the cosine similarity.
+    No model, no vocabulary, nothing to load.
+    """
+
+    def __init__(self, dim: int = 512, ngram_sizes: Tuple[int, ...] = (3, 4)):
+        self.dim = dim
+        self.ngram_sizes = ngram_sizes
+
+    def _features(self, tokens: List[str]) -> List[str]:
+        features = []
+        for token in tokens:
+            stem = _stem(token)
+            features.append(f"w:{stem}")
+            padded = f" {stem} "
+            for size in self.ngram_sizes:
+                features.extend(padded[i:i + size] for i in range(max(1, len(padded) - size + 1)))
+        return features
+
+    def embed(self, query: str):
+        vector = np.zeros(self.dim, dtype=np.float32)
+        for feature in self._features(_content_tokens(query)):
+            hashed = zlib.crc32(feature.encode())
+            vector[hashed % self.dim] += 1.0 if hashed & 0x80000000 else -1.0
+
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm else vector
+
+
+class SemanticCache:
+    """Answers paraphrased queries from previously completed responses.
+
+    Query vectors live in a fixed-size matrix indexed by random-hyperplane LSH
+    (`tables` hash tables of `bits` bits each), so a lookup only scores the
+    few stored queries sharing a bucket. A candidate is served when its
+    cosine similarity reaches `threshold`, both queries carry the same
+    numbers, ordinals, negations, recency words and superlatives (so "2022
+    cricket world cup winner" never answers "who won the 2023 cricket world
+    cup", nor "ceo of apple" answer "first ceo of apple"), and it is fresh
+    enough for the new query: the real-time TTL applies when
+    either the cached analysis or the new query's wording asks for recent
+    information. Least recently used entries are evicted beyond `max_entries`.
+    """
+
+    def __init__(self,
+                 max_entries: int,
+                 threshold: float,
+                 ttl: float,
+                 real_time_ttl: float,
+                 dim: int = 512,
+                 tables: int = 16,
+                 bits: int = 8,
+                 seed: int = 0):
+        self.max_entries = max_entries
+        self.threshold = threshold
+        self.ttl = ttl
+        self.real_time_ttl = real_time_ttl
+        self.tables = tables
+        self.bits = bits
+        self.seed = seed
+        self.embedder = QueryEmbedder(dim)
+
+        # Arrays are allocated with the first entry, so startup doesn't import numpy
+        self._planes = None
+        self._powers = None
+        self._vectors = None
+        self._entries: "OrderedDict[int, Tuple[float, SearchResponse, Tuple[int, ...]]]" = OrderedDict()
+        self._slots_by_query: Dict[str, int] = {}
+        self._queries: Dict[int, str] = {}
+        self._buckets: List[Dict[int, Set[int]]] = [{} for _ in range(tables)]
+        self._free_slots = list(range(max_entries - 1, -1, -1))
+
+        self.hits = 0
+        self.misses = 0
+        self.rejected = 0
+        self.expired = 0
+        self.stores = 0
+
+    def _allocate(self):
+        rng = np.random.default_rng(self.seed)
+        self._planes = rng.standard_normal((self.embedder.dim, self.tables * self.bits)).astype(np.float32)
+        self._powers = 1 << np.arange(self.bits, dtype=np.int64)
+        self._vectors = np.zeros((self.max_entries, self.embedder.dim), dtype=np.float32)
+
+    def _bucket_keys(self, vector) -> Tuple[int, ...]:
+        signs = (vector @ self._planes > 0).reshape(self.tables, self.bits)
+        return tuple(int(key) for key in signs @ self._powers)
+
+    def _ttl_for(self, response: SearchResponse, real_time: bool) -> float:
+        if real_time or (response.analysis and response.analysis.requires_real_time):
+            return self.real_time_ttl
+        return self.ttl
+
+    def _same_qualifiers(self, qualifiers: Set[str], response: SearchResponse) -> bool:
+        return qualifiers == _qualifiers(_content_tokens(response.original_query))
+
+    def get(self, query: str) -> Optional[Tuple[SearchResponse, float]]:
+        """Return (response, similarity) for the closest fresh paraphrase, if any"""
+
+        if not self._entries:
+            self.misses += 1
+            return None
+
+        vector = self.embedder.embed(query)
+        qualifiers = _qualifiers(_content_tokens(query))
+        real_time = needs_real_time(query)
+        candidates = set()
+        for table, key in enumerate(self._bucket_keys(vector)):
+            candidates |= self._buckets[table].get(key, set())
+
+        if candidates:
+            slots = np.fromiter(candidates, dtype=np.int64, count=len(candidates))
+            similarities = self._vectors[slots] @ vector
+            now = time.monotonic()
+
+            for position in np.argsort(-similarities):
+                similarity = float(similarities[position])
+                if similarity < self.threshold:
+                    break
+
+                slot = int(slots[position])
+                stored_at, response, _ = self._entries[slot]
+                age = now - stored_at
+                if age > self._ttl_for(response, real_time=False):
+                    self.expired += 1
+                    self._remove(slot)
+                    continue
+                if not self._same_qualifiers(qualifiers, response):
+                    self.rejected += 1
+                    continue
+                if age > self._ttl_for(response, real_time):
+                    # Fresh for the cached wording, too old for a query asking for recent information
+                    self.rejected += 1
+                    continue
+
+                self._entries.move_to_end(slot)
+                self.hits += 1
+                return response, similarity
+
+        self.misses += 1
+        return None
+
+    def set(self, query: str, response: SearchResponse):
+        normalized = " ".join(_content_tokens(query))
+        if not normalized:
+            return
+
+        # A refreshed answer for the same query replaces the old one
+        existing = self._slots_by_query.get(normalized)
+        if existing is not None:
+            self._remove(existing)
+        if not self._free_slots:
+            self._remove(next(iter(self._entries)))
+        if self._vectors is None:
+            self._allocate()
+
+        slot = self._free_slots.pop()
+        vector = self.embedder.embed(query)
+        keys = self._bucket_keys(vector)
+        self._vectors[slot] = vector
+        for table, key in enumerate(keys):
+            self._buckets[table].setdefault(key, set()).add(slot)
+
+        self._entries[slot] = (time.monotonic(), response, keys)
+        self._slots_by_query[normalized] = slot
+        self._queries[slot] = normalized
+        self.stores += 1
+
+    def _remove(self, slot: int):
+        _, _, keys = self._entries.pop(slot)
+        for table, key in enumerate(keys):
+            bucket = self._buckets[table][key]
+            bucket.discard(slot)
+            if not bucket:
+                del self._buckets[table][key]
+
+        del self._slots_by_query[self._queries.pop(slot)]
+        self._free_slots.append(slot)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get_stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "rejected": self.rejected,
+            "expired": self.expired,
+            "stores": self.stores,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "entries": len(self._entries)
+        }
+
+
+def build_semantic_cache() -> Optional[SemanticCache]:
+    """Create the semantic cache described by settings (None when disabled)"""
+
+    if not settings.semantic_cache_enabled:
+        return None
+
+    return SemanticCache(
+        max_entries=settings.semantic_cache_max_entries,
+        threshold=settings.semantic_cache_threshold,
+        ttl=settings.response_cache_ttl,
+        real_time_ttl=settings.response_cache_real_time_ttl,
+        dim=settings.semantic_cache_dim,
+        tables=settings.semantic_cache_lsh_tables,
+        bits=settings.semantic_cache_lsh_bits
+    )
@@ -0,0 +1,132 @@
+import re
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+from models.schemas import QueryAnalysis, SearchRequest, SearchResponse, SearchResult
+from services.cache import TTLCache
+from services.deduplicator import canonicalize_url
+from config.settings import settings
+import logging
+
+logger = logging.getLogger(__name__)
+
+CITATION_PATTERN = re.compile(r"\[\d+\]")
+
+
+@dataclass
+class SessionTurn:
+    """One answered question, kept as conversation context for follow-ups"""
+    query: str
+    analysis: QueryAnalysis
+    answer: str
+
+
+@dataclass
+class Session:
+    """What a conversation has already paid for: earlier turns, ranked sources and searched terms"""
+    turns: List[SessionTurn] = field(default_factory=list)
+    sources: List[SearchResult] = field(default_factory=list)
+    searched_terms: Set[str] = field(default_factory=set)
+
+    def has_searched(self, term: str) -> bool:
+        return normalize_term(term) in self.searched_terms
+
+
+def normalize_term(term: str) -> str:
+    return " ".join(term.lower().split())
+
+
+class SessionStore:
+    """Bounded, expiring store of conversation sessions.
+
+    Sessions are keyed by (user_id, session_id) in an LRU+TTL cache; every
+    recorded turn renews the TTL, so idle conversations expire and the least
+    recently active ones are evicted beyond `max_sessions`. Each session
+    keeps its last `max_turns` turns and the top `max_sources` sources.
+    """
+
+    def __init__(self, max_sessions: int, ttl: float, max_turns: int, max_sources: int, answer_chars: int):
+        self.sessions = TTLCache(max_entries=max_sessions, ttl=ttl)
+        self.max_turns = max_turns
+        self.max_sources = max_sources
+        self.answer_chars = answer_chars
+
+        self.turns_recorded = 0
+        self.follow_ups = 0
+        self.reused_sources = 0
+        self.skipped_terms = 0
+
+    def _key(self, request: SearchRequest) -> Tuple[Optional[str], str]:
+        return request.user_id, request.session_id
+
+    def get(self, request: SearchRequest) -> Optional[Session]:
+        """The request's session if it already has answered turns (i.e. this is a follow-up)"""
+        if not request.session_id:
+            return None
+
+        session = self.sessions.get(self._key(request))
+        if session is None or not session.turns:
+            return None
+
+        self.follow_ups += 1
+        return session
+
+    def unsearched_terms(self, session: Session, terms: List[str]) -> List[str]:
+        """The terms the session has not searched yet (the rest are covered by its sources)"""
+        new_terms = [term for term in terms if not session.has_searched(term)]
+        self.skipped_terms += len(terms) - len(new_terms)
+        return new_terms
+
+    def reusable_sources(self, session: Session, results: List[SearchResult]) -> List[SearchResult]:
+        """Copies of the session's sources not among `results` (new results win on the same URL)"""
+        seen_urls = {canonicalize_url(result.url) for result in results}
+        reused = [source.model_copy() for source in session.sources if canonicalize_url(source.url) not in seen_urls]
+        self.reused_sources += len(reused)
+        return reused
+
+    def record(self, request: SearchRequest, response: Optional[SearchResponse]):
+        """Add an answered turn to the request's session, creating the session if needed"""
+        if not request.session_id or response is None or response.analysis is None:
+            return
+
+        key = self._key(request)
+        session = self.sessions.get(key) or Session()
+
+        synthesized = response.synthesized_response
+        if synthesized is not None and synthesized.total_sources > 0:
+            # Old citation numbers would point at the wrong sources in the next prompt
+            answer = CITATION_PATTERN.sub("", synthesized.response)[:self.answer_chars].strip()
+            session.turns.append(SessionTurn(query=request.query, analysis=response.analysis, answer=answer))
+            del session.turns[:-self.max_turns]
+
+        if response.web_results is not None:
+            # Follow-up results already include the reused sources, reranked
+            session.sources = response.web_results.results[:self.max_sources]
+            session.searched_terms.update(normalize_term(term) for term in response.web_results.search_terms_used)
+
+        self.sessions.set(key, session)
+        self.turns_recorded += 1
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "sessions": len(self.sessions),
+            "turns_recorded": self.turns_recorded,
+            "follow_ups": self.follow_ups,
+            "reused_sources": self.reused_sources,
+            "skipped_terms": self.skipped_terms
+        }
+
+
+def build_session_store() -> Optional[SessionStore]:
+    """Create the session store described by settings (None when disabled)"""
+
+    if not settings.session_store_enabled:
+        return None
+
+    return SessionStore(
+        max_sessions=settings.session_max_sessions,
+        ttl=settings.session_ttl,
+        max_turns=settings.session_max_turns,
+        max_sources=settings.session_max_sources,
+        answer_chars=settings.session_answer_chars
+    )
@@ -0,0 +1,132 @@
+import asyncio
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, Hashable, List, Optional, Tuple
+
+
+class SingleFlight:
+    """Coalesces concurrent calls with the same key into one shared task.
+
+    The first caller starts the work as a task; callers arriving while it is
+    in flight await the same task. Each caller awaits through a shield, so one
+    caller being cancelled (client disconnect, deadline) never cancels the work
+    the others are waiting on; once the last waiter is cancelled, the work is
+    cancelled too. The key is released as soon as the task ends, so later
+    calls start fresh work (or hit whatever cache it populated).
+    """
+
+    def __init__(self):
+        self._calls: Dict[Hashable, asyncio.Task] = {}
+        self._waiters: Dict[asyncio.Task, int] = {}
+        self.leaders = 0
+        self.followers = 0
+        self.abandoned = 0
+
+    def get(self, key: Hashable) -> Optional[asyncio.Task]:
+        return self._calls.get(key)
+
+    async def do(self, key: Hashable, work: Callable[[], Awaitable[Any]]) -> Any:
+        task = self._calls.get(key)
+        if task is None:
+            self.leaders += 1
+            task = asyncio.create_task(work())
+            self._calls[key] = task
+            task.add_done_callback(lambda done: self._release(key, done))
+        else:
+            self.followers += 1
+
+        return await self._wait(task)
+
+    async def join(self, key: Hashable) -> Any:
+        """Wait for the call already in flight for `key` without starting one"""
+        return await self._wait(self._calls[key])
+
+    async def _wait(self, task: asyncio.Task) -> Any:
+        self._waiters[task] = self._waiters.get(task, 0) + 1
+        try:
+            return await asyncio.shield(task)
+        finally:
+            self._waiters[task] -= 1
+            if not self._waiters[task]:
+                del self._waiters[task]
+                # Nobody is left to use the result
+                if not task.done():
+                    self.abandoned += 1
+                    task.cancel()
+
+    def _release(self, key: Hashable, task: asyncio.Task):
+        if self._calls.get(key) is task:
+            del self._calls[key]
+        if not task.cancelled():
+            task.exception()   # retrieved here so an unawaited failure isn't logged as lost
+
+    def get_stats(self) -> Dict[str, Any]:
+        calls = self.leaders + self.followers
+        return {
+            "in_flight": len(self._calls),
+            "leaders": self.leaders,
+            "followers": self.followers,
+            "abandoned": self.abandoned,
+            "coalesced_rate": self.followers / calls if calls else 0.0
+        }
+
+
+class EventBroadcast:
+    """Fans one event stream out to any number of subscribers.
+
+    A producer task drains the source into a buffer; subscribers replay the
+    buffer from the start and then follow live events, so a subscriber that
+    attaches mid-stream still sees the full sequence. When the last
+    subscriber leaves before the source finishes, the producer is cancelled.
+    `result` can be set by the source for callers that only need the outcome.
+    """
+
+    def __init__(self, source: Callable[["EventBroadcast"], AsyncIterator[Tuple[str, Any]]]):
+        self.events: List[Tuple[str, Any]] = []
+        self.result: Any = None
+        self.finished = False
+        self.subscribers = 0
+        self._changed = asyncio.Event()
+        self._producer = asyncio.create_task(self._produce(source(self)))
+
+    async def _produce(self, source: AsyncIterator[Tuple[str, Any]]):
+        try:
+            async for event in source:
+                self.events.append(event)
+                self._notify()
+        finally:
+            self.finished = True
+            self._notify()
+
+    def _notify(self):
+        changed, self._changed = self._changed, asyncio.Event()
+        changed.set()
+
+    def add_done_callback(self, callback: Callable[["EventBroadcast"], None]):
+        self._producer.add_done_callback(lambda _: callback(self))
+
+    async def wait(self) -> Any:
+        """Wait for the stream to finish and return its result (None if it was cut short)"""
+        self.subscribers += 1
+        try:
+            await asyncio.shield(self._producer)
+        except asyncio.CancelledError:
+            if not self._producer.cancelled():
+                raise
+        finally:
+            self.subscribers -= 1
+        return self.result
+
+    async def subscribe(self) -> AsyncIterator[Tuple[str, Any]]:
+        self.subscribers += 1
+        index = 0
+        try:
+            while True:
+                while index < len(self.events):
+                    yield self.events[index]
+                    index += 1
+                if self.finished:
+                    return
+                await self._changed.wait()
+        finally:
+            self.subscribers -= 1
+            if self.subscribers == 0 and not self.finished:
+                self._producer.cancel()
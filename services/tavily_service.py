@@ -1,25 +1,107 @@
 import httpx
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Set, Tuple
 from config.settings import settings
+from services.http_client import create_http_client
+from services.cache import TTLCache
+from services.domain_ranker import DomainRanker
+from services.deduplicator import NearDuplicateDetector
+from services.passage_extractor import PassageExtractor
+from services.single_flight import SingleFlight
+from services.local_corpus import LocalCorpus
+from services.metrics import TAVILY_CALL_DURATION, DEDUPE_RANK_STAGE, UPSTREAM_ERRORS
 import asyncio
 import logging
+import re
+import time
 
 logger = logging.getLogger(__name__)
 
 class TavilyService:
-    def __init__(self):
+    def __init__(self,
+                 http_client: Optional[httpx.AsyncClient] = None,
+                 local_corpus: Optional[LocalCorpus] = None):
         self.api_key = settings.TAVILY_API_KEY
-        self.base_url = "https://api.tavily.com"
-        self.timeout = 30
+        self.base_url = settings.tavily_base_url
+        self.timeout = settings.http_timeout
+        self.domain_ranker = DomainRanker.from_file(settings.domain_weights_path)
+        self.deduplicator = NearDuplicateDetector(
+            max_distance=settings.dedup_max_hamming_distance,
+            min_tokens=settings.dedup_min_tokens
+        )
+
+        # Raw page bodies are only requested when something reads them
+        self.include_raw_content = settings.search_include_raw_content
+        self.passage_extractor = PassageExtractor(
+            max_passages=settings.raw_content_max_passages,
+            max_chars=settings.raw_content_max_chars
+        )
+
+        # Pooled client shared across searches (normally injected by the app lifespan)
+        self.http_client = http_client
+        self._owns_client = False
+
+        # Per-term result cache: entries are fresh until fresh_ttl, then served
+        # stale (with a background refresh) until they expire at stale_ttl
+        self.cache_enabled = settings.search_cache_enabled
+        self.fresh_ttl = settings.search_cache_fresh_ttl
+        self.term_cache = TTLCache(
+            max_entries=settings.search_cache_max_entries,
+            ttl=settings.search_cache_stale_ttl
+        )
+        self._refresh_tasks: Dict[Tuple[str, int], asyncio.Task] = {}
+
+        # Identical terms searched concurrently (across requests) share one upstream call
+        self.single_flight = settings.single_flight_enabled
+        self.term_flights = SingleFlight()
+
+        # Every fetched result is also indexed into the persistent local corpus
+        self.local_corpus = local_corpus
+        self._corpus_writes: Set[asyncio.Task] = set()
+
+        self.fresh_hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+        self.background_refreshes = 0
+
+    def _get_client(self) -> httpx.AsyncClient:
+        """Return the shared client, creating a private pooled one if none was injected"""
+        if self.http_client is None:
+            self.http_client = create_http_client(timeout=self.timeout)
+            self._owns_client = True
+        return self.http_client
+
+    async def aclose(self):
+        """Cancel background refreshes and close the HTTP client if this service created it"""
+        for task in list(self._refresh_tasks.values()):
+            task.cancel()
+        if self._corpus_writes:
+            await asyncio.gather(*self._corpus_writes, return_exceptions=True)
+
+        if self._owns_client and self.http_client is not None:
+            await self.http_client.aclose()
+            self.http_client = None
+            self._owns_client = False
 
     async def search_multiple(self, search_terms: List[str], max_results_per_search: int =3) -> List[Dict[str, Any]]:
         """Execute multiple searches in parallel"""
 
+        all_results = await self.fetch_multiple(search_terms, max_results_per_search)
+        return self.merge_results(all_results)
+
+    async def fetch_multiple(self,
+                             search_terms: List[str],
+                             max_results_per_search: int =3,
+                             bypass_cache: bool = False) -> List[Dict[str, Any]]:
+        """Run searches in parallel and return their raw, un-merged results.
+
+        `bypass_cache` fetches every term upstream (still refreshing the cache).
+        """
+
         logger.info(f"Executing {len(search_terms)} parallel searches")
 
         # create task for parallel execution
         tasks = [
-            self._single_search(term, max_results_per_search)
+            self._single_search(term, max_results_per_search, bypass_cache)
             for term in search_terms
         ]
 
@@ -36,14 +118,99 @@ class TavilyService:
             if result and result.get('results'):
                 all_results.extend(result['results'])
 
-        # Remove Duplicate And Result
-        deduplicated_results = self._deduplicated_results(all_results)
-        ranked_results = self._rank_results(deduplicated_results)
+        return all_results
+
+    def merge_results(self, all_results: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Deduplicate and rank raw results gathered from one or more searches"""
+
+        # Rank first so the best member of each duplicate cluster is the one kept
+        with DEDUPE_RANK_STAGE.time():
+            ranked_results = self._rank_results(all_results)
+            ranked_results = self._deduplicated_results(ranked_results)
 
         logger.info(f"Found {len(ranked_results)} Unique results")
         return ranked_results
 
-    async def _single_search(self, query: str, max_results: int) -> Dict[str, Any]:
+    def _cache_key(self, query: str, max_results: int) -> Tuple[str, int]:
+        return re.sub(r'\s+', ' ', query.strip().lower()), max_results
+
+    async def _single_search(self, query: str, max_results: int, bypass_cache: bool = False) -> Dict[str, Any]:
+        """Execute a single search, served from the per-term cache when possible"""
+
+        key = self._cache_key(query, max_results)
+        if not self.cache_enabled or bypass_cache:
+            return await self._fetch_shared(key, query, max_results)
+
+        entry = self.term_cache.get(key)
+
+        if entry is not None:
+            fetched_at, result = entry
+            if time.monotonic() - fetched_at < self.fresh_ttl:
+                self.fresh_hits += 1
+                return result
+
+            # Stale: answer instantly and revalidate off the critical path
+            self.stale_hits += 1
+            self._schedule_refresh(key, query, max_results)
+            return result
+
+        self.misses += 1
+        return await self._fetch_shared(key, query, max_results)
+
+    async def _fetch_shared(self, key: Tuple[str, int], query: str, max_results: int) -> Dict[str, Any]:
+        """Fetch a term, joining an identical fetch that is already in flight"""
+        if not self.single_flight:
+            return await self._fetch_and_store(key, query, max_results)
+        return await self.term_flights.do(key, lambda: self._fetch_and_store(key, query, max_results))
+
+    async def _fetch_and_store(self, key: Tuple[str, int], query: str, max_results: int) -> Dict[str, Any]:
+        result = await self._fetch_search(query, max_results)
+        if self.cache_enabled:
+            self._store(key, result)
+        self._index(result)
+        return result
+
+    def _store(self, key: Tuple[str, int], result: Dict[str, Any]):
+        # Failed searches come back empty; never cache those
+        if result.get('results'):
+            self.term_cache.set(key, (time.monotonic(), result))
+
+    def _index(self, result: Dict[str, Any]):
+        """Write results into the local corpus off the request path"""
+        if self.local_corpus is None or not result.get('results'):
+            return
+
+        task = asyncio.create_task(self.local_corpus.add(result['results']))
+        self._corpus_writes.add(task)
+        task.add_done_callback(self._corpus_writes.discard)
+
+    def _schedule_refresh(self, key: Tuple[str, int], query: str, max_results: int):
+        if key in self._refresh_tasks:
+            return
+
+        async def refresh():
+            try:
+                result = await self._fetch_search(query, max_results)
+                self._store(key, result)
+                self._index(result)
+            finally:
+                self._refresh_tasks.pop(key, None)
+
+        self.background_refreshes += 1
+        self._refresh_tasks[key] = asyncio.create_task(refresh())
+
+    def get_cache_stats(self) -> Dict[str, Any]:
+        lookups = self.fresh_hits + self.stale_hits + self.misses
+        return {
+            "fresh_hits": self.fresh_hits,
+            "stale_hits": self.stale_hits,
+            "misses": self.misses,
+            "background_refreshes": self.background_refreshes,
+            "hit_rate": (self.fresh_hits + self.stale_hits) / lookups if lookups else 0.0,
+            "entries": len(self.term_cache)
+        }
+
+    async def _fetch_search(self, query: str, max_results: int) -> Dict[str, Any]:
         """Execute a single search via Tavily API"""
 
         payload = {
@@ -51,46 +218,59 @@ class TavilyService:
             "query": query,
             "search_depth": "basic",     # or "basic" for faster results
             "include_answers": False,       # We'll generate our own answer
-            "include_raw_content": True,    # Get full content
+            "include_raw_content": self.include_raw_content,
             "max_results": max_results,
             "include_domains": [],
             "exclude_domains": ["youtube.com", "tiktok.com"]  # Filter out video content
         }
 
-        async with httpx.AsyncClient(timeout=self.timeout) as client:
-            try:
+        client = self._get_client()
+        try:
+            with TAVILY_CALL_DURATION.time():
                 response = await client.post(f"{self.base_url}/search", json=payload)
-                response.raise_for_status()
-
-                result = response.json()
-                logger.info(f"Search '{query}' Returned {len(result.get('results', []))} results")
-
-                return result
+            response.raise_for_status()
+
+            result = response.json()
+            if self.include_raw_content:
+                self._extract_raw_content(query, result)
+            logger.info(f"Search '{query}' Returned {len(result.get('results', []))} results")
+
+            return result
+
+        except httpx.HTTPStatusError as e:
+            UPSTREAM_ERRORS.labels("tavily", str(e.response.status_code)).inc()
+            logger.error(f"Tavily API Error for query: '{query}' : {e}")
+            return {'results': []}
+        except httpx.HTTPError as e:
+            UPSTREAM_ERRORS.labels("tavily", type(e).__name__).inc()
+            logger.error(f"Tavily API Error for query: '{query}' : {e}")
+            return {'results': []}
+        except Exception as e:
+            UPSTREAM_ERRORS.labels("tavily", "unexpected").inc()
+            logger.error(f"Unexpected error for query: '{query}' : {e}")
+            return {'results': []}
+
+    def _extract_raw_content(self, query: str, result: Dict[str, Any]):
+        """Fold the query-relevant passages of each page body into its content and drop the body"""
+
+        for item in result.get('results', []):
+            raw_content = item.pop('raw_content', None)
+            if not raw_content:
+                continue
 
-            except httpx.HTTPError as e:
-                logger.error(f"Tavily API Error for query: '{query}' : {e}")
-                return {'results': []}
-            except Exception as e:
-                logger.error(f"Unexpected error for query: '{query}' : {e}")
-                return {'results': []}
+            passages = self.passage_extractor.extract(query, raw_content)
+            content = item.get('content', '')
+            if passages and passages not in content:
+                item['content'] = f"{content} ... {passages}" if content else passages
 
     def _deduplicated_results(self, results: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
-        """Remove Duplicated results Based On URL"""
-        seen_urls = set()
-        unique_urls = []
-
-        for result in results:
-            url = result.get('url', '')
-            if url and url not in seen_urls:
-                seen_urls.add(url)
-                unique_urls.append(result)
-
-        return unique_urls
+        """Remove duplicates by canonical URL and near-duplicate content, keeping the first (best) of each"""
+        return self.deduplicator.deduplicate(results)
 
     def _rank_results(self, results: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
         """Rank results by relevance score and content quality"""
 
-        def calculate_score(result: Dict[str, Any]) -> float:
+        for result in results:
             score = result.get('score', 0.0)
 
             # Boost score based on content length (more comprehensive = better)
@@ -101,83 +281,10 @@ class TavilyService:
                 score += 0.5
 
             # Boost score for reputable domain
-            url = result.get('url','').lower()
-            reputable_domains = [
-                # Encyclopedias & General Knowledge
-                'wikipedia.org',
-                'britannica.com',
-                'stanford.edu',
-                'ox.ac.uk',
-                'mit.edu',
-
-                # Science & Research
-                'nature.com',
-                'sciencedirect.com',
-                'sciencemag.org',
-                'springer.com',
-                'jstor.org',
-
-                # Technology & Computing / IT
-                'ieee.org',
-                'acm.org',
-                'arxiv.org',
-                'nasa.gov',
-                'techcrunch.com',
-
-                # News & Journalism
-                'bbc.com',
-                'nytimes.com',
-                'reuters.com',
-                'theguardian.com',
-                'washingtonpost.com',
-
-                # Health & Medicine
-                'nih.gov',
-                'who.int',
-                'cdc.gov',
-                'mayoclinic.org',
-                'clevelandclinic.org',
-
-                # Sports (General)
-                'espn.com',
-                'skysports.com',
-                'sports.yahoo.com',
-                'cbssports.com',
-                'bleacherreport.com',
-
-                # Cricket (Specialized)
-                'espncricinfo.com',
-                'icc-cricket.com',
-                'cricbuzz.com',
-                'wisden.com',
-                'skysports.com/cricket',
-
-                # Archives & Libraries
-                'archive.org',
-                'loc.gov',  # Library of Congress
-                'europeana.eu',
-                'nationalarchives.gov.uk',
-                'worlddigitalibrary.org'
-            ]
-
-            if any(domain in url for domain in reputable_domains):
-                score += 0.15
-
-            return score
-
-        # Sort by calculated score (highest first)
-        ranked = sorted(results, key=calculate_score, reverse=True)
-
-        # Add calculated score to results for debugging
-        for result in ranked:
-            result['calculated_score'] = calculate_score(result)
-
-        return ranked
-
-
-
-
-
-
+            score += self.domain_ranker.score_url(result.get('url', ''))
 
+            # Add calculated score to results for debugging
+            result['calculated_score'] = score
 
+        # Sort by calculated score (highest first)
+        return sorted(results, key=lambda result: result['calculated_score'], reverse=True)
@@ -0,0 +1,99 @@
+import json
+import re
+from typing import List, Optional
+
+import logging
+
+logger = logging.getLogger(__name__)
+
+SENTENCE_TERMINATORS = ".!?\n"
+
+
+class TextNormalizer:
+    """Single-scan boilerplate stripper for page text.
+
+    All rules are compiled once into one alternation, so a page is scanned a
+    single time no matter how many rules are configured. Rules are lowercase
+    and run case-sensitively over a lowercased copy of the page, which is much
+    cheaper for the regex engine than IGNORECASE. Phrase rules cut only
+    the matched text; sentence rules cut the sentence (or line) around the
+    match, bounded by `max_sentence_chars` on each side so a page without
+    punctuation is never wiped out. Whitespace is collapsed at the end.
+    """
+
+    def __init__(self, phrases: List[str], sentences: List[str], max_sentence_chars: int = 300):
+        self.max_sentence_chars = max_sentence_chars
+
+        groups = []
+        if sentences:
+            groups.append("(?P<sentence>" + "|".join(f"(?:{rule})" for rule in sentences) + ")")
+        if phrases:
+            groups.append("(?P<phrase>" + "|".join(f"(?:{rule})" for rule in phrases) + ")")
+        self._pattern: Optional[re.Pattern] = None
+        self._fallback_pattern: Optional[re.Pattern] = None
+        if groups:
+            self._pattern = re.compile("|".join(groups))
+            # For the rare text whose lowercase form changes length (offsets would drift)
+            self._fallback_pattern = re.compile("|".join(groups), re.IGNORECASE)
+
+    @classmethod
+    def from_file(cls, path: str, max_sentence_chars: int = 300) -> "TextNormalizer":
+        try:
+            with open(path, encoding="utf-8") as rules_file:
+                config = json.load(rules_file)
+            normalizer = cls(config.get("phrases", []), config.get("sentences", []), max_sentence_chars)
+        except (OSError, json.JSONDecodeError, re.error) as e:
+            logger.error(f"Failed to load boilerplate rules from '{path}': {e}")
+            return cls([], [], max_sentence_chars)
+
+        logger.info(f"Loaded {len(config.get('phrases', []))} phrase and "
+                    f"{len(config.get('sentences', []))} sentence boilerplate rules")
+        return normalizer
+
+    def normalize(self, text: str) -> str:
+        """Strip boilerplate and collapse whitespace"""
+        if self._pattern is not None:
+            text = self._strip(text)
+        return " ".join(text.split())
+
+    def _strip(self, text: str) -> str:
+        pieces = []
+        cursor = 0
+
+        lowered = text.lower()
+        if len(lowered) == len(text):
+            matches = self._pattern.finditer(lowered)
+        else:
+            matches = self._fallback_pattern.finditer(text)
+
+        for match in matches:
+            start, end = match.span()
+            if start < cursor:
+                continue   # inside a sentence already removed
+
+            if match.lastgroup == "sentence":
+                start = self._sentence_start(text, cursor, start)
+                end = self._sentence_end(text, end)
+
+            pieces.append(text[cursor:start])
+            pieces.append(" ")
+            cursor = end
+
+        if not pieces:
+            return text
+
+        pieces.append(text[cursor:])
+        return "".join(pieces)
+
+    def _sentence_start(self, text: str, floor: int, position: int) -> int:
+        window_start = max(floor, position - self.max_sentence_chars)
+        boundary = max(text.rfind(terminator, window_start, position) for terminator in SENTENCE_TERMINATORS)
+        return boundary + 1 if boundary >= 0 else (window_start if window_start == floor else position)
+
+    def _sentence_end(self, text: str, position: int) -> int:
+        window_end = min(len(text), position + self.max_sentence_chars)
+        boundaries = [text.find(terminator, position, window_end) for terminator in SENTENCE_TERMINATORS]
+        boundaries = [boundary for boundary in boundaries if boundary >= 0]
+        if boundaries:
+            return min(boundaries) + 1
+        return window_end if window_end == len(text) else position
@@ -0,0 +1,44 @@
+import re
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import List, Optional, Set
+
+# Lowercase alphanumeric runs: the unit every relevance score in the pipeline counts
+TERM_PATTERN = re.compile(r"[a-z0-9]+")
+
+STOPWORDS = {
+    "a", "an", "the", "of", "in", "on", "for", "to", "and", "or", "is", "are", "was", "were",
+    "be", "what", "which", "who", "how", "why", "when", "where", "with", "about", "does", "do"
+}
+
+
+def tokenize(text: str) -> List[str]:
+    """Lowercase terms of `text`, in order and with repeats"""
+    return TERM_PATTERN.findall(text.lower())
+
+
+def content_terms(text: str, stopwords: Set[str] = STOPWORDS) -> List[str]:
+    """Terms of `text` without stopwords, in order and with repeats"""
+    return [term for term in tokenize(text) if term not in stopwords]
+
+
+def parse_published_date(published_date: Optional[str]) -> Optional[datetime]:
+    """Parse a result's published date as an aware datetime (None if missing or unparseable).
+
+    Tavily returns ISO 8601 for most sources and RFC 822 ("Tue, 05 Mar 2024
+    14:30:00 GMT") for feed-backed ones; naive values are taken as UTC.
+    """
+    if not published_date:
+        return None
+
+    try:
+        published = datetime.fromisoformat(published_date.replace("Z", "+00:00"))
+    except ValueError:
+        try:
+            published = parsedate_to_datetime(published_date)
+        except (TypeError, ValueError, IndexError):
+            return None
+
+    if published.tzinfo is None:
+        published = published.replace(tzinfo=timezone.utc)
+    return published
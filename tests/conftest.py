@@ -0,0 +1,6 @@
+import os
+
+# Settings require API keys at import time; tests never reach the real upstreams
+os.environ.setdefault("GROQ_API_KEY", "test")
+os.environ.setdefault("TAVILY_API_KEY", "test")
+os.environ.setdefault("LOCAL_CORPUS_ENABLED", "false")
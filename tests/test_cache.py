@@ -0,0 +1,57 @@
+import asyncio
+
+import pytest
+
+from models.schemas import QueryAnalysis, SearchResponse
+from services.cache import MemoryCacheBackend, ResponseCache, SQLiteCacheBackend
+
+
+def response(real_time=False):
+    return SearchResponse(
+        original_query="who won the match",
+        analysis=QueryAnalysis(
+            query_type="current_events",
+            search_intent="User wants the result of the match",
+            key_entities=["match"],
+            suggested_searches=["who won the match"],
+            complexity_score=3,
+            requires_real_time=real_time
+        ),
+        status="search_completed",
+        timestamp="2024-01-01T00:00:00"
+    )
+
+
+@pytest.fixture(params=["memory", "sqlite"])
+def backend(request, tmp_path):
+    if request.param == "sqlite":
+        backend = SQLiteCacheBackend(str(tmp_path / "cache.db"))
+        yield backend
+        asyncio.run(backend.close())
+    else:
+        yield MemoryCacheBackend()
+
+
+def test_backend_returns_the_remaining_ttl(backend):
+    async def scenario():
+        await backend.set("key", "value", ttl=60)
+        return await backend.get("key"), await backend.get("missing")
+
+    (value, remaining), missing = asyncio.run(scenario())
+    assert value == "value"
+    assert 59 < remaining <= 60
+    assert missing is None
+
+
+def test_shared_hit_is_promoted_only_for_its_remaining_lifetime(backend):
+    async def scenario():
+        # Written by another worker 55s ago with a 60s real-time TTL
+        await backend.set("key", response(real_time=True).model_dump_json(), ttl=5)
+        cache = ResponseCache(max_entries=8, ttl=3600, real_time_ttl=60, shared_tier=backend)
+        return cache, await cache.get("key")
+
+    cache, hit = asyncio.run(scenario())
+    assert hit is not None
+    _, remaining, ttl = cache.peek("key")
+    assert ttl == 60
+    assert remaining <= 5
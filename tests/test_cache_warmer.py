@@ -0,0 +1,72 @@
+import asyncio
+import time
+
+from services.cache_warmer import CacheWarmer, QueryFrequencyTracker
+
+
+class EmptyCache:
+    def peek(self, key):
+        return None
+
+
+class Orchestrator:
+    def __init__(self, cacheable):
+        self.response_cache = EmptyCache()
+        self.query_frequency = QueryFrequencyTracker(window=60)
+        self.cacheable = cacheable
+        self.refreshed = []
+
+    async def refresh_query(self, query):
+        self.refreshed.append(query)
+        return object()
+
+    def is_cacheable(self, response):
+        return self.cacheable
+
+
+def make_warmer(orchestrator, interval=10.0, max_backoff=15.0):
+    for _ in range(3):
+        orchestrator.query_frequency.record("hot query", "hot query")
+    return CacheWarmer(orchestrator, None, interval=interval, top_n=5, min_count=2,
+                       refresh_ahead=0.25, calls_per_minute=600, max_load=0.5, max_backoff=max_backoff)
+
+
+def test_uncacheable_warm_is_not_retried_until_its_backoff_passes():
+    orchestrator = Orchestrator(cacheable=False)
+    warmer = make_warmer(orchestrator)
+
+    asyncio.run(warmer.run_cycle())
+    asyncio.run(warmer.run_cycle())
+
+    assert orchestrator.refreshed == ["hot query"]
+    stats = warmer.get_stats()
+    assert stats["uncacheable"] == 1
+    assert stats["skipped_backoff"] == 1
+    assert stats["warmed"] == 0
+
+
+def test_backoff_doubles_up_to_the_cap():
+    warmer = make_warmer(Orchestrator(cacheable=False))
+
+    delays = []
+    for _ in range(3):
+        before = time.monotonic()
+        warmer._back_off("hot query")
+        delays.append(round(warmer._backoff["hot query"][1] - before))
+
+    # 10s, then 20s and 40s capped at 15s
+    assert delays == [10, 15, 15]
+    assert warmer._backoff["hot query"][0] == 3
+
+
+def test_successful_warm_clears_the_backoff():
+    orchestrator = Orchestrator(cacheable=False)
+    warmer = make_warmer(orchestrator, interval=0.0)
+
+    asyncio.run(warmer.run_cycle())
+    orchestrator.cacheable = True
+    asyncio.run(warmer.run_cycle())
+
+    assert orchestrator.refreshed == ["hot query"] * 2
+    assert warmer.get_stats()["warmed"] == 1
+    assert warmer.get_stats()["backing_off"] == 0
@@ -0,0 +1,41 @@
+import asyncio
+from types import SimpleNamespace
+
+import httpx
+from groq import InternalServerError, RateLimitError
+
+from services.llm_gateway import LLMGateway
+
+
+def status_error(cls, code):
+    request = httpx.Request("POST", "https://api.groq.test")
+    return cls("boom", response=httpx.Response(code, request=request), body=None)
+
+
+class Completions:
+    def __init__(self, failures):
+        self.failures = list(failures)
+        self.calls = 0
+
+    async def create(self, **kwargs):
+        self.calls += 1
+        if self.failures:
+            raise self.failures.pop(0)
+        return "ok"
+
+
+def test_retries_take_a_token_from_the_rate_limiter():
+    async def scenario():
+        gateway = LLMGateway(max_concurrency=2, requests_per_minute=60, burst=5)
+        gateway.backoff_base = 0.0
+        completions = Completions([status_error(RateLimitError, 429), status_error(InternalServerError, 503)])
+        gateway.client = SimpleNamespace(chat=SimpleNamespace(completions=completions))
+
+        result = await gateway.complete("analysis", messages=[])
+        return result, completions.calls, gateway.rate_limiter.tokens
+
+    result, calls, tokens = asyncio.run(scenario())
+    assert result == "ok"
+    assert calls == 3
+    # One token per attempt, not just the first
+    assert 1.9 < tokens < 2.1
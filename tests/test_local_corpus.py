@@ -0,0 +1,67 @@
+import asyncio
+
+import pytest
+
+from services.local_corpus import LocalCorpus, match_expression
+
+FILLER = [
+    (f"Recipe {i}", f"Boil water, add salt and cook pasta number {i} until al dente, then serve with sauce.")
+    for i in range(30)
+]
+
+
+@pytest.fixture
+def corpus(tmp_path):
+    corpus = LocalCorpus(str(tmp_path / "corpus.db"), max_documents=1000)
+    yield corpus
+    asyncio.run(corpus.close())
+
+
+def add(corpus, documents, **fields):
+    corpus._add([
+        {"url": f"https://example.com/{title.replace(' ', '-')}", "title": title, "content": content,
+         "score": 0.5, **fields}
+        for title, content in documents
+    ])
+
+
+def cover(corpus, term):
+    return asyncio.run(corpus.cover([term], limit=2, min_matches=2, max_age=3600))[1]
+
+
+def test_short_terms_are_never_matched():
+    assert match_expression("what is java", near_distance=10, min_tokens=3) is None
+    assert match_expression("python java", near_distance=10, min_tokens=3) is None
+    assert match_expression("how does java garbage collection work", near_distance=10, min_tokens=3) == \
+        'NEAR("java" "garbage" "collection" "work", 10)'
+
+
+def test_term_is_covered_by_documents_about_it(corpus):
+    add(corpus, FILLER + [
+        ("Install Python on Windows", "To install Python on Windows, download the installer and add it to PATH."),
+        ("Python on Windows", "This guide shows how to install Python 3 on Windows 11 step by step."),
+    ])
+    assert cover(corpus, "install python on windows") == ["install python on windows"]
+
+
+def test_vague_term_is_not_covered_by_related_documents(corpus):
+    add(corpus, FILLER + [
+        ("Python vs Java", "Python and Java are popular languages; Java is statically typed."),
+        ("Java vs Python performance", "Comparing Java with Python for web backends."),
+    ])
+    assert cover(corpus, "what is java") == []
+
+
+def test_words_far_apart_do_not_match(corpus):
+    padding = " ".join(["filler"] * 30)
+    add(corpus, FILLER + [
+        (f"Note {i}", f"install the tools first. {padding} python ships separately. {padding} windows users beware.")
+        for i in range(3)
+    ])
+    assert cover(corpus, "install python on windows") == []
+
+
+def test_rfc_822_published_dates_are_indexed(corpus):
+    add(corpus, [("Feed item", "python release notes")], published_date="Tue, 05 Mar 2024 14:30:00 GMT")
+    published_at = corpus._conn.execute("SELECT published_at FROM documents").fetchone()[0]
+    assert published_at == 1709649000.0
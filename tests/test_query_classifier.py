@@ -0,0 +1,91 @@
+import asyncio
+
+import pytest
+
+from models.schemas import SearchRequest
+from services.groq_service import AnalysisUnavailable
+from services.query_analyzer import QueryAnalyzer
+from services.query_classifier import QueryClassifier
+
+THRESHOLD = 0.85
+
+
+@pytest.fixture
+def classifier():
+    return QueryClassifier()
+
+
+@pytest.mark.parametrize("query", [
+    "is it going to rain today",
+    "score of india vs australia",
+    "who is elon musk",
+    "what is the weather in paris",
+])
+def test_ambiguous_queries_do_not_take_the_fast_path(classifier, query):
+    _, confidence = classifier.classify(query)
+    assert confidence <= THRESHOLD
+
+
+def test_weather_query_is_not_searched_as_news(classifier):
+    analysis, _ = classifier.classify("is it going to rain today")
+    assert analysis.query_type == "current_events"
+    assert analysis.suggested_searches == ["is it going to rain today"]
+    assert "going" not in analysis.key_entities
+
+
+def test_weather_query_keeps_the_place(classifier):
+    analysis, _ = classifier.classify("what is the weather in paris")
+    assert analysis.query_type == "current_events"
+    assert analysis.suggested_searches == ["what is the weather in paris", "paris weather forecast"]
+
+
+def test_live_score_is_not_a_comparison(classifier):
+    analysis, _ = classifier.classify("score of india vs australia")
+    assert analysis.query_type == "current_events"
+    assert analysis.key_entities == ["india", "australia"]
+    assert not any("difference between" in search for search in analysis.suggested_searches)
+
+
+def test_person_query_is_not_a_definition(classifier):
+    analysis, _ = classifier.classify("who is elon musk")
+    assert analysis.key_entities == ["elon musk"]
+    assert analysis.suggested_searches == ["who is elon musk", "elon musk biography"]
+
+
+@pytest.mark.parametrize("query, query_type", [
+    ("python vs java", "comparison"),
+    ("how to install python on windows", "how_to"),
+    ("what is kubernetes", "factual"),
+    ("15% of 200", "calculation"),
+])
+def test_unambiguous_queries_take_the_fast_path(classifier, query, query_type):
+    analysis, confidence = classifier.classify(query)
+    assert analysis.query_type == query_type
+    assert confidence > THRESHOLD
+
+
+class FailingGroq:
+    def __init__(self, fallback):
+        self.fallback = fallback
+        self.calls = 0
+
+    async def analyze_query(self, query):
+        self.calls += 1
+        raise AnalysisUnavailable("upstream down")
+
+    def fallback_analysis(self, query):
+        return self.fallback(query)
+
+
+def test_fallback_analysis_is_not_memoized():
+    analyzer = QueryAnalyzer()
+    groq = FailingGroq(analyzer.groq_service.fallback_analysis)
+    analyzer.groq_service = groq
+    request = SearchRequest(query="who is elon musk")
+
+    first = asyncio.run(analyzer.process_query(request))
+    asyncio.run(analyzer.process_query(request))
+
+    assert first.complexity_score == 5
+    assert groq.calls == 2
+    assert analyzer.cache_hits == 0
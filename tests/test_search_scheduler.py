@@ -0,0 +1,61 @@
+import asyncio
+
+from services.search_scheduler import SearchBudget, SearchScheduler
+
+
+class FakeTavily:
+    def __init__(self):
+        self.fetched = []
+
+    async def fetch_multiple(self, search_terms, max_results_per_search=3, bypass_cache=False):
+        self.fetched.extend(search_terms)
+        return [{"url": f"https://example.com/{term}", "calculated_score": 0.1} for term in search_terms]
+
+    def merge_results(self, all_results):
+        return all_results
+
+
+def budget():
+    return SearchBudget(max_searches=3, parallelism=3, target_results=10, min_score=0.5, deadline=5.0)
+
+
+def test_in_flight_term_skipped_for_the_local_corpus_is_fetched_after_all():
+    async def scenario():
+        tavily = FakeTavily()
+        decided = asyncio.Event()
+
+        async def speculate():
+            # Still deciding when the scheduler starts, then covered under the looser rules
+            await decided.wait()
+            return None
+
+        speculative = asyncio.create_task(speculate())
+        run = asyncio.create_task(SearchScheduler(tavily).run(
+            ["raw query", "other term"], budget(), 3, in_flight={"raw query": speculative}
+        ))
+        await asyncio.sleep(0)
+        decided.set()
+        return tavily, await run
+
+    tavily, (results, issued, timed_out) = asyncio.run(scenario())
+    assert sorted(tavily.fetched) == ["other term", "raw query"]
+    assert issued == ["raw query", "other term"]
+    assert {result["url"] for result in results} == {"https://example.com/raw query", "https://example.com/other term"}
+    assert not timed_out
+
+
+def test_in_flight_results_are_used_without_refetching():
+    async def scenario():
+        tavily = FakeTavily()
+
+        async def speculate():
+            return [{"url": "https://example.com/speculative", "calculated_score": 0.1}]
+
+        speculative = asyncio.create_task(speculate())
+        return tavily, await SearchScheduler(tavily).run(
+            ["raw query"], budget(), 3, in_flight={"raw query": speculative}
+        )
+
+    tavily, (results, issued, _) = asyncio.run(scenario())
+    assert tavily.fetched == []
+    assert [result["url"] for result in results] == ["https://example.com/speculative"]
@@ -0,0 +1,76 @@
+import time
+
+import pytest
+
+from models.schemas import QueryAnalysis, SearchResponse
+from services.semantic_cache import SemanticCache
+
+
+def response(query, real_time=False):
+    return SearchResponse(
+        original_query=query,
+        analysis=QueryAnalysis(
+            query_type="factual",
+            search_intent=f"User wants to know {query}",
+            key_entities=[query],
+            suggested_searches=[query],
+            complexity_score=3,
+            requires_real_time=real_time
+        ),
+        status="search_completed",
+        timestamp="2024-01-01T00:00:00"
+    )
+
+
+def cache(**overrides):
+    options = dict(max_entries=16, threshold=0.9, ttl=3600, real_time_ttl=0.2)
+    options.update(overrides)
+    return SemanticCache(**options)
+
+
+@pytest.mark.parametrize("cached, query", [
+    ("python web frameworks", "web frameworks for python"),
+    ("what is the capital of france", "capital of france"),
+    ("install python on windows", "installing python on windows?"),
+    ("tell me about the best laptops 2024", "best laptop 2024"),
+    ("who won the 2023 cricket world cup", "2023 cricket world cup winner"),
+    ("cheap cars for students", "cheap car for a student"),
+])
+def test_paraphrases_hit(cached, query):
+    semantic_cache = cache()
+    semantic_cache.set(cached, response(cached))
+
+    match = semantic_cache.get(query)
+
+    assert match is not None
+    assert match[0].original_query == cached
+
+
+@pytest.mark.parametrize("cached, query", [
+    ("is coffee good for health", "is coffee bad for health"),
+    ("how to install python on windows", "how to uninstall python on windows"),
+    ("best laptop", "worst laptop"),
+    ("ceo of apple", "first ceo of apple"),
+    ("first ceo of apple", "ceo of apple"),
+    ("who won the 2023 cricket world cup", "who lost the 2023 cricket world cup"),
+    ("who won the 2023 cricket world cup", "who won the 2019 cricket world cup"),
+    ("who won the 2023 cricket world cup", "2022 cricket world cup winner"),
+    ("is python good for beginners", "is python not good for beginners"),
+    ("iphone", "latest iphone"),
+])
+def test_queries_with_different_meaning_miss(cached, query):
+    semantic_cache = cache()
+    semantic_cache.set(cached, response(cached))
+
+    assert semantic_cache.get(query) is None
+
+
+def test_recency_in_the_new_query_applies_the_real_time_ttl():
+    semantic_cache = cache()
+    # Analysed as evergreen, but the wording asks for fresh information
+    semantic_cache.set("latest iphone", response("latest iphone"))
+    semantic_cache.set("iphone models", response("iphone models"))
+    time.sleep(0.25)
+
+    assert semantic_cache.get("what is the latest iphone") is None
+    assert semantic_cache.get("what are the iphone models") is not None
@@ -0,0 +1,70 @@
+import asyncio
+
+import pytest
+
+from services.single_flight import SingleFlight
+
+
+class Work:
+    def __init__(self):
+        self.started = 0
+        self.cancelled = False
+        self.release = asyncio.Event()
+
+    async def __call__(self):
+        self.started += 1
+        try:
+            await self.release.wait()
+        except asyncio.CancelledError:
+            self.cancelled = True
+            raise
+        return "done"
+
+
+def test_concurrent_calls_share_one_run():
+    async def scenario():
+        flights, work = SingleFlight(), Work()
+        callers = [asyncio.create_task(flights.do("key", work)) for _ in range(3)]
+        await asyncio.sleep(0)
+        work.release.set()
+        return await asyncio.gather(*callers), work, flights
+
+    results, work, flights = asyncio.run(scenario())
+    assert results == ["done"] * 3
+    assert work.started == 1
+    assert flights.get_stats()["followers"] == 2
+
+
+def test_work_survives_while_a_waiter_remains():
+    async def scenario():
+        flights, work = SingleFlight(), Work()
+        first = asyncio.create_task(flights.do("key", work))
+        second = asyncio.create_task(flights.do("key", work))
+        await asyncio.sleep(0)
+        first.cancel()
+        await asyncio.sleep(0)
+        work.release.set()
+        return await second, first, work
+
+    result, first, work = asyncio.run(scenario())
+    assert result == "done"
+    assert first.cancelled()
+    assert not work.cancelled
+
+
+def test_work_is_cancelled_with_its_last_waiter():
+    async def scenario():
+        flights, work = SingleFlight(), Work()
+        callers = [asyncio.create_task(flights.do("key", work)) for _ in range(2)]
+        await asyncio.sleep(0)
+        for caller in callers:
+            caller.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await asyncio.gather(*callers)
+        await asyncio.sleep(0)
+        return work, flights
+
+    work, flights = asyncio.run(scenario())
+    assert work.cancelled
+    assert flights.get("key") is None
+    assert flights.get_stats()["abandoned"] == 1
@@ -0,0 +1,40 @@
+import asyncio
+
+from services.tavily_service import TavilyService
+
+
+def service():
+    tavily = TavilyService()
+    tavily.fetched = []
+
+    async def fetch_search(query, max_results):
+        tavily.fetched.append(query)
+        return {"results": [{"url": f"https://example.com/{len(tavily.fetched)}", "title": query, "content": query}]}
+
+    tavily._fetch_search = fetch_search
+    return tavily
+
+
+def test_cached_terms_are_served_without_fetching():
+    tavily = service()
+
+    async def scenario():
+        await tavily.fetch_multiple(["python decorators"])
+        return await tavily.fetch_multiple(["python decorators"])
+
+    results = asyncio.run(scenario())
+    assert tavily.fetched == ["python decorators"]
+    assert results[0]["url"] == "https://example.com/1"
+
+
+def test_bypass_cache_fetches_upstream_and_refreshes_the_cache():
+    tavily = service()
+
+    async def scenario():
+        await tavily.fetch_multiple(["python decorators"])
+        refreshed = await tavily.fetch_multiple(["python decorators"], bypass_cache=True)
+        return refreshed, await tavily.fetch_multiple(["python decorators"])
+
+    refreshed, cached = asyncio.run(scenario())
+    assert tavily.fetched == ["python decorators"] * 2
+    assert refreshed[0]["url"] == cached[0]["url"] == "https://example.com/2"
@@ -0,0 +1,18 @@
+from datetime import datetime, timezone
+
+from services.text_utils import parse_published_date
+
+
+def test_parses_iso_dates():
+    assert parse_published_date("2024-03-05T14:30:00Z") == datetime(2024, 3, 5, 14, 30, tzinfo=timezone.utc)
+    assert parse_published_date("2024-03-05") == datetime(2024, 3, 5, tzinfo=timezone.utc)
+
+
+def test_parses_rfc_822_dates():
+    assert parse_published_date("Tue, 05 Mar 2024 14:30:00 GMT") == datetime(2024, 3, 5, 14, 30, tzinfo=timezone.utc)
+
+
+def test_unparseable_dates_are_none():
+    assert parse_published_date(None) is None
+    assert parse_published_date("") is None
+    assert parse_published_date("last week") is None